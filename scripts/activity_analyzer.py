@@ -0,0 +1,703 @@
+"""
+Activity Log Analyzer
+======================
+Script untuk menganalisis Log/aktivitas.md (tabel per hari:
+Waktu | Aktivitas | ID | Keterangan) menjadi metrik throughput.
+
+Fitur:
+1. Plan dibuat vs di-implement per hari
+2. Lead time "Buat Plan" → "Implement" per PLAN ID (+ plan yang masih terbuka)
+3. Jam tersibuk (jumlah aktivitas per jam)
+4. Streaming parse - file dibaca per baris, section hari dan baris tabel
+   diproses satu per satu
+5. Incremental - state per section hari dan per PLAN ID disimpan di
+   activity_state.json:
+   - jika file hanya bertambah di akhir (digest seluruh isi sebelum offset
+     terakhir tidak berubah), parse dimulai dari byte offset terakhir
+   - jika tidak (mis. hari baru ditulis di atas), hanya section yang digest
+     barisnya berubah yang diproses ulang
+   Lead time hanya dihitung ulang untuk PLAN ID yang tersentuh baris baru
+6. Output JSON/NDJSON seperti analyzer lain (--output-format, --gzip, --profile)
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import io
+import re
+import json
+import hashlib
+import argparse
+from datetime import datetime
+from statistics import mean, median
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Set, Tuple, Optional, Iterator
+
+from report_writer import (
+    NDJSON_FORMAT_VERSION, report_path, write_json, write_ndjson, add_output_arguments, open_output
+)
+from stage_profiler import (
+    StageProfiler, add_profile_arguments, profiler_from_args, print_timings, finish_profiling
+)
+from workspace_fs import open_workspace, workspace_override, add_workspace_arguments
+
+# ============================================================
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPT_DIR)
+CWD = os.getcwd()
+OUTPUT_DIR = SCRIPT_DIR
+
+# Try multiple strategies to find workspace
+WORKSPACE_CANDIDATES = ['Agent-0', 'agent-workspace']
+WORKSPACE_DIR = None
+
+# Strategy 0: Explicit override via --workspace or AGENT_WORKSPACE
+# (benchmarks, CI, synthetic workspaces, workspace archives)
+WORKSPACE_DIR = workspace_override()
+
+# Strategy 1: Look relative to script location
+if not WORKSPACE_DIR:
+    for candidate in WORKSPACE_CANDIDATES:
+        path = os.path.join(BASE_DIR, candidate)
+        if os.path.exists(path):
+            WORKSPACE_DIR = path
+            break
+
+# Strategy 2: Look relative to current working directory
+if not WORKSPACE_DIR:
+    for candidate in WORKSPACE_CANDIDATES:
+        path = os.path.join(CWD, candidate)
+        if os.path.exists(path):
+            WORKSPACE_DIR = path
+            break
+
+# Strategy 3: Check if CWD itself is the workspace (contains Topic folder)
+if not WORKSPACE_DIR:
+    if os.path.exists(os.path.join(CWD, 'Topic')):
+        WORKSPACE_DIR = CWD
+
+# Strategy 4: Check parent of CWD
+if not WORKSPACE_DIR:
+    parent_cwd = os.path.dirname(CWD)
+    for candidate in WORKSPACE_CANDIDATES:
+        path = os.path.join(parent_cwd, candidate)
+        if os.path.exists(path):
+            WORKSPACE_DIR = path
+            break
+
+if not WORKSPACE_DIR:
+    print("⚠️ Workspace folder not found!")
+    print(f"   Looked in: {BASE_DIR}, {CWD}")
+    print(f"   Expected folders: {WORKSPACE_CANDIDATES}")
+    print("   Tip: Make sure 'Agent-0/' or 'agent-workspace/' folder exists")
+    exit(1)
+
+# Folder or archive (.zip / .tar.*) view of the workspace
+WORKSPACE_FS = open_workspace(WORKSPACE_DIR)
+
+ACTIVITY_FILE = os.path.join(WORKSPACE_DIR, "Log", "aktivitas.md")
+STATE_FILE = os.path.join(OUTPUT_DIR, "activity_state.json")
+STATE_VERSION = 2
+
+DAY_PATTERN = re.compile(r'^##\s+(\d{4}-\d{2}-\d{2})\s*$')
+TIME_PATTERN = re.compile(r'^(\d{1,2}):(\d{2})$')
+PLAN_ID_PATTERN = re.compile(r'^PLAN[_-]?(\d+)$', re.IGNORECASE)
+
+CREATE_PLAN = "buat plan"
+IMPLEMENT = "implement"
+
+# Read size while hashing the log prefix
+DIGEST_CHUNK = 1 << 20
+
+# Plans open longer than this are called out in recommendations
+STALE_PLAN_DAYS = 7
+
+BUSIEST_HOURS = 3
+
+# ============================================================
+@dataclass
+class ActivityRow:
+    """Single row of a day table"""
+    date: Optional[str]
+    time: str
+    activity: str
+    id: str
+    note: str
+    line: str   # stripped source line, used for the section digest
+
+
+@dataclass
+class ActivityReport:
+    """Complete activity log report"""
+    timestamp: str
+    total_rows: int
+    total_days: int
+    days: List[Dict]                 # per day: rows, plans created/implemented, activities
+    plans_created: int
+    plans_implemented: int
+    open_plans: List[Dict]
+    lead_times: List[Dict]           # per PLAN ID: created, implemented, minutes
+    lead_time_summary: Dict
+    busiest_hours: List[Dict]
+    hours: Dict[str, int]
+    activities: Dict[str, int]
+    incremental: Dict                # how this run reused the persisted state
+    recommendations: List[str]
+    timings: Optional[Dict] = None
+
+# ============================================================
+def parse_row(line: str, date: Optional[str]) -> Optional[ActivityRow]:
+    """A table row, or None for headers, separators and other lines"""
+    if not line.startswith('|'):
+        return None
+    cells = [c.strip() for c in line.strip().strip('|').split('|')]
+    if len(cells) < 4 or cells[0].lower() == 'waktu' or not cells[0].strip(':- '):
+        return None
+    return ActivityRow(date, cells[0], cells[1], cells[2], ' | '.join(cells[3:]), line)
+
+
+def iter_log(stream: io.BufferedIOBase, date: Optional[str] = None) -> Iterator[Tuple[str, object, int]]:
+    """
+    Stream (kind, value, end_offset) events from a binary stream positioned
+    at a line start: ('day', date) for section headers, ('row', ActivityRow).
+    `date` is the day section the stream starts in.
+    """
+    offset = stream.tell()
+    for raw in stream:
+        offset += len(raw)
+        line = raw.decode('utf-8', errors='replace').strip()
+        match = DAY_PATTERN.match(line)
+        if match:
+            date = match.group(1)
+            yield 'day', date, offset
+            continue
+        row = parse_row(line, date)
+        if row:
+            yield 'row', row, offset
+
+
+def plan_event(row: ActivityRow) -> Optional[Tuple[str, str]]:
+    """(PLAN ID, 'created' | 'implemented') for plan lifecycle rows"""
+    match = PLAN_ID_PATTERN.match(row.id)
+    if not match or not row.date or not TIME_PATTERN.match(row.time):
+        return None
+    activity = row.activity.lower()
+    if activity == CREATE_PLAN:
+        kind = 'created'
+    elif activity == IMPLEMENT:
+        kind = 'implemented'
+    else:
+        return None
+    return f"PLAN_{match.group(1)}", kind
+
+
+def timestamp_of(row: ActivityRow) -> str:
+    hour, minute = TIME_PATTERN.match(row.time).groups()
+    return f"{row.date} {int(hour):02d}:{minute}"
+
+
+def minutes_between(start: str, end: str) -> float:
+    return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds() / 60
+
+# ============================================================
+# Persisted state: one record per day section (its contribution to every
+# metric) and one per PLAN ID. A section's digest chains its row lines, so
+# it can be extended row by row and compared without keeping the rows.
+# ============================================================
+class ActivityState:
+
+    def __init__(self, data: Optional[Dict] = None):
+        data = data or {}
+        self.cursor: Dict = data.get("cursor", {})
+        self.sections: Dict[str, Dict] = data.get("sections", {})
+        self.plans: Dict[str, Dict] = data.get("plans", {})
+        self.touched: Set[str] = set()
+        self.rows_processed = 0
+
+    def to_dict(self, workspace: str) -> Dict:
+        return {
+            "version": STATE_VERSION,
+            "workspace": workspace,
+            "cursor": self.cursor,
+            "sections": self.sections,
+            "plans": self.plans,
+        }
+
+    # --------------------------------------------------------
+    def new_section(self, key: str, date: Optional[str]) -> Dict:
+        section = {
+            "date": date, "digest": "", "rows": 0, "created": 0, "implemented": 0,
+            "hours": {}, "activities": {}, "plan_events": [], "latest": None,
+        }
+        self.sections[key] = section
+        return section
+
+    def add_row(self, section: Dict, row: ActivityRow):
+        section["digest"] = chain_digest(section["digest"], row.line)
+        section["rows"] += 1
+        section["activities"][row.activity] = section["activities"].get(row.activity, 0) + 1
+        time_match = TIME_PATTERN.match(row.time)
+        if time_match:
+            hour = f"{int(time_match.group(1)):02d}"
+            section["hours"][hour] = section["hours"].get(hour, 0) + 1
+            if row.date:
+                stamp = timestamp_of(row)
+                if section["latest"] is None or stamp > section["latest"]:
+                    section["latest"] = stamp
+
+        event = plan_event(row)
+        if event:
+            plan_id, kind = event
+            stamp = timestamp_of(row)
+            section[kind] += 1
+            section["plan_events"].append([plan_id, kind, stamp])
+            self.plans.setdefault(plan_id, {"created": [], "implemented": []})[kind].append(stamp)
+            self.touched.add(plan_id)
+        self.rows_processed += 1
+
+    def remove_section(self, key: str):
+        """Retract a section's contribution (it was edited or removed)"""
+        section = self.sections.pop(key)
+        for plan_id, kind, stamp in section["plan_events"]:
+            plan = self.plans.get(plan_id)
+            if plan and stamp in plan[kind]:
+                plan[kind].remove(stamp)
+                self.touched.add(plan_id)
+
+    def update_lead_times(self):
+        """Recompute lead times of the PLAN IDs touched by this run only"""
+        for plan_id in self.touched:
+            plan = self.plans.get(plan_id)
+            if plan is None:
+                continue
+            if not plan["created"] and not plan["implemented"]:
+                del self.plans[plan_id]
+                continue
+            created = min(plan["created"]) if plan["created"] else None
+            done = [s for s in plan["implemented"] if created is None or s >= created]
+            implemented = min(done) if done else None
+            plan["created_at"] = created
+            plan["implemented_at"] = implemented
+            plan["lead_minutes"] = minutes_between(created, implemented) if created and implemented else None
+        self.touched.clear()
+
+
+def chain_digest(previous: str, line: str) -> str:
+    return hashlib.sha1(f"{previous}\n{line}".encode('utf-8')).hexdigest()
+
+
+def load_state(path: str, workspace: str) -> ActivityState:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return ActivityState()
+    if data.get("version") != STATE_VERSION or data.get("workspace") != workspace:
+        return ActivityState()
+    return ActivityState(data)
+
+
+def save_state(state: ActivityState, path: str, workspace: str):
+    # json.dumps runs entirely in the C encoder; json.dump writes chunk by chunk
+    encoded = json.dumps(state.to_dict(workspace), separators=(',', ':'), ensure_ascii=False)
+    with open_output(path, compress=False) as f:
+        f.write(encoded)
+
+# ============================================================
+def open_log(path: str) -> io.BufferedIOBase:
+    """Binary stream over the activity log (folder workspace or archive)"""
+    if WORKSPACE_FS.read_only:
+        return io.BytesIO(WORKSPACE_FS.read_text(path).encode('utf-8'))
+    return open(path, 'rb')
+
+
+def hash_range(stream: io.BufferedIOBase, start: int, end: int, digest=None):
+    """sha1 of stream[start:end], continuing `digest` when given"""
+    digest = digest or hashlib.sha1()
+    stream.seek(start)
+    while start < end:
+        chunk = stream.read(min(DIGEST_CHUNK, end - start))
+        if not chunk:
+            break
+        digest.update(chunk)
+        start += len(chunk)
+    return digest
+
+
+def section_key(date: Optional[str], ordinal: int) -> str:
+    return f"{date or 'undated'}#{ordinal}"
+
+
+def stream_appended(stream: io.BufferedIOBase, state: ActivityState) -> int:
+    """
+    Fast path: the log only grew at the end. Parse from the stored offset,
+    continuing the section the previous run stopped in.
+    Returns: bytes read
+    """
+    offset = state.cursor["offset"]
+    key = state.cursor.get("section")
+    section = state.sections.get(key) if key else None
+    ordinals = Counter(s["date"] for s in state.sections.values())
+
+    stream.seek(offset)
+    for kind, value, end in iter_log(stream, section["date"] if section else None):
+        if kind == 'day':
+            key = section_key(value, ordinals[value])
+            ordinals[value] += 1
+            section = state.new_section(key, value)
+        else:
+            if section is None:
+                key = section_key(None, ordinals[None])
+                ordinals[None] += 1
+                section = state.new_section(key, None)
+            state.add_row(section, value)
+        offset = end
+    state.cursor["section"] = key
+    return offset - state.cursor["offset"]
+
+
+def stream_sections(stream: io.BufferedIOBase, state: ActivityState) -> Tuple[int, int, str]:
+    """
+    Slow path: stream the whole log, one section at a time. Sections whose
+    row digest matches the stored one are skipped; changed or new sections
+    replace their stored contribution; vanished sections are retracted.
+    Returns: (offset after the last row, sections reprocessed, last section key)
+    """
+    ordinals = Counter()
+    seen = set()
+    reprocessed = 0
+    buffered: List[ActivityRow] = []
+    key = None
+    date = None
+    digest = ""
+
+    def flush():
+        nonlocal reprocessed
+        if key is None:
+            return
+        seen.add(key)
+        stored = state.sections.get(key)
+        if stored and stored["digest"] == digest:
+            return
+        if stored:
+            state.remove_section(key)
+        section = state.new_section(key, date)
+        for row in buffered:
+            state.add_row(section, row)
+        reprocessed += 1
+
+    stream.seek(0)
+    offset = 0
+    for kind, value, end in iter_log(stream):
+        if kind == 'day' or key is None:
+            flush()
+            date = value if kind == 'day' else None
+            key = section_key(date, ordinals[date])
+            ordinals[date] += 1
+            buffered, digest = [], ""
+        if kind == 'row':
+            buffered.append(value)
+            digest = chain_digest(digest, value.line)
+        offset = end
+    flush()
+
+    for stale in [k for k in state.sections if k not in seen]:
+        state.remove_section(stale)
+    return offset, reprocessed, key
+
+
+def update_state(state: ActivityState, log_path: str) -> Dict:
+    """
+    Bring `state` up to date with the log, reading as little as possible.
+    Returns: description of the incremental work done
+    """
+    with open_log(log_path) as stream:
+        stream.seek(0, io.SEEK_END)
+        size = stream.tell()
+        cursor = state.cursor
+        # The whole prefix must be unchanged for the append-only fast path:
+        # an edit anywhere above the stored offset changes its digest
+        prefix = None
+        if cursor.get("offset") is not None and size >= cursor["offset"]:
+            prefix = hash_range(stream, 0, cursor["offset"])
+        appended = prefix is not None and prefix.hexdigest() == cursor.get("prefix_digest")
+
+        if appended:
+            bytes_parsed = stream_appended(stream, state)
+            info = {"mode": "append", "bytes_read": size, "bytes_parsed": bytes_parsed}
+            last_key = state.cursor["section"]
+            digest = hash_range(stream, cursor["offset"], size, prefix)
+        else:
+            _, reprocessed, last_key = stream_sections(stream, state)
+            info = {"mode": "sections" if cursor else "full", "bytes_read": size, "bytes_parsed": size,
+                    "sections_reprocessed": reprocessed}
+            digest = hash_range(stream, 0, size)
+
+        state.cursor = {"offset": size, "prefix_digest": digest.hexdigest(), "section": last_key}
+
+    info["rows_processed"] = state.rows_processed
+    info["plans_updated"] = len(state.touched)
+    state.update_lead_times()
+    return info
+
+# ============================================================
+def ranked(counts: Counter, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+    """Most common first, ties by name: the order must not depend on how the state was built"""
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def build_days(sections: Dict[str, Dict]) -> List[Dict]:
+    days: Dict[str, Dict] = {}
+    for section in sections.values():
+        date = section["date"] or "undated"
+        day = days.setdefault(date, {"date": date, "rows": 0, "plans_created": 0,
+                                     "plans_implemented": 0, "activities": Counter()})
+        day["rows"] += section["rows"]
+        day["plans_created"] += section["created"]
+        day["plans_implemented"] += section["implemented"]
+        day["activities"].update(section["activities"])
+    return [
+        {**day, "activities": dict(ranked(day["activities"]))}
+        for day in sorted(days.values(), key=lambda d: d["date"])
+    ]
+
+
+def summarize_lead_times(minutes: List[float]) -> Dict:
+    if not minutes:
+        return {"count": 0}
+    ordered = sorted(minutes)
+    return {
+        "count": len(ordered),
+        "median_minutes": round(median(ordered), 1),
+        "mean_minutes": round(mean(ordered), 1),
+        "p90_minutes": round(ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))], 1),
+        "max_minutes": round(ordered[-1], 1),
+    }
+
+
+def generate_recommendations(open_plans: List[Dict], unplanned: List[str], summary: Dict) -> List[str]:
+    recommendations = []
+    stale = [p for p in open_plans if p["age_days"] is not None and p["age_days"] >= STALE_PLAN_DAYS]
+    if stale:
+        recommendations.append(
+            f"⏳ {len(stale)} plan(s) open for {STALE_PLAN_DAYS}+ days: "
+            + ", ".join(p["id"] for p in stale[:5]) + ("..." if len(stale) > 5 else "")
+        )
+    elif open_plans:
+        recommendations.append(f"📋 {len(open_plans)} plan(s) created but not implemented yet")
+    if unplanned:
+        recommendations.append(
+            f"📝 {len(unplanned)} plan(s) implemented without a 'Buat Plan' entry: "
+            + ", ".join(unplanned[:5]) + ("..." if len(unplanned) > 5 else "")
+        )
+    if summary.get("count"):
+        recommendations.append(f"⏱️ Median plan lead time: {summary['median_minutes']:.0f} minutes")
+    if not recommendations:
+        recommendations.append("✅ No plan activity to report")
+    return recommendations
+
+
+def analyze_activity(
+    profiler: Optional[StageProfiler] = None,
+    state_path: str = STATE_FILE,
+    rebuild: bool = False
+) -> Optional[ActivityReport]:
+    """
+    Run the activity log analysis, reusing the persisted state.
+    Pass an enabled StageProfiler to fill the report's `timings` section.
+    """
+    profiler = profiler or StageProfiler()
+
+    print("\n" + "="*60)
+    print("📈 ACTIVITY LOG ANALYZER")
+    print("="*60)
+
+    if not WORKSPACE_FS.exists(ACTIVITY_FILE):
+        print(f"   ⚠️ File not found: {ACTIVITY_FILE}")
+        return None
+
+    profiler.start()
+    try:
+        print("\n1️⃣ Loading state...")
+        with profiler.stage("load_state"):
+            state = ActivityState() if rebuild else load_state(state_path, WORKSPACE_DIR)
+        print(f"   {len(state.sections)} day sections, {len(state.plans)} plans known")
+
+        print("\n2️⃣ Streaming activity log...")
+        with profiler.stage("stream"):
+            incremental = update_state(state, ACTIVITY_FILE)
+        print(f"   Mode: {incremental['mode']}, {incremental['rows_processed']} new/changed rows, "
+              f"{incremental['bytes_parsed']} of {incremental['bytes_read']} bytes parsed")
+
+        print("\n3️⃣ Aggregating metrics...")
+        with profiler.stage("aggregate"):
+            days = build_days(state.sections)
+            hours = Counter()
+            latest = None
+            for section in state.sections.values():
+                hours.update(section["hours"])
+                if section["latest"] and (latest is None or section["latest"] > latest):
+                    latest = section["latest"]
+
+            lead_times = []
+            open_plans = []
+            unplanned = []
+            for plan_id in sorted(state.plans, key=lambda p: int(p.split('_')[1])):
+                plan = state.plans[plan_id]
+                if plan["created_at"] and plan["implemented_at"]:
+                    lead_times.append({
+                        "id": plan_id,
+                        "created": plan["created_at"],
+                        "implemented": plan["implemented_at"],
+                        "minutes": plan["lead_minutes"],
+                    })
+                elif plan["created_at"]:
+                    age = minutes_between(plan["created_at"], latest) / 1440 if latest else None
+                    open_plans.append({"id": plan_id, "created": plan["created_at"],
+                                       "age_days": round(age, 1) if age is not None else None})
+                else:
+                    unplanned.append(plan_id)
+            summary = summarize_lead_times([p["minutes"] for p in lead_times])
+
+        if incremental["rows_processed"] or incremental["mode"] != "append" or not os.path.exists(state_path):
+            with profiler.stage("save_state"):
+                save_state(state, state_path, WORKSPACE_DIR)
+    finally:
+        profiler.stop()
+
+    activities = Counter()
+    for day in days:
+        activities.update(day["activities"])
+
+    return ActivityReport(
+        timestamp=datetime.now().isoformat(),
+        total_rows=sum(d["rows"] for d in days),
+        total_days=len(days),
+        days=days,
+        plans_created=sum(d["plans_created"] for d in days),
+        plans_implemented=sum(d["plans_implemented"] for d in days),
+        open_plans=open_plans,
+        lead_times=lead_times,
+        lead_time_summary=summary,
+        busiest_hours=[{"hour": h, "rows": n} for h, n in ranked(hours, BUSIEST_HOURS)],
+        hours=dict(sorted(hours.items())),
+        activities=dict(ranked(activities)),
+        incremental=incremental,
+        recommendations=generate_recommendations(open_plans, unplanned, summary),
+        timings=profiler.timings()
+    )
+
+
+def print_report(report: ActivityReport):
+    """
+    Print formatted report to console
+    """
+    print("\n" + "="*60)
+    print("📈 ACTIVITY REPORT")
+    print("="*60)
+
+    print(f"\n📊 Statistics:")
+    print(f"   • Rows: {report.total_rows} over {report.total_days} day(s)")
+    print(f"   • Plans created: {report.plans_created}")
+    print(f"   • Plans implemented: {report.plans_implemented}")
+    print(f"   • Open plans: {len(report.open_plans)}")
+
+    if report.days:
+        print(f"\n📅 Per day (created / implemented / rows):")
+        for day in report.days[-10:]:
+            print(f"   • {day['date']}: {day['plans_created']:>3} / {day['plans_implemented']:>3} / {day['rows']:>4}")
+        if len(report.days) > 10:
+            print(f"   ... and {len(report.days) - 10} earlier day(s)")
+
+    summary = report.lead_time_summary
+    if summary.get("count"):
+        print(f"\n⏱️ Plan lead time ({summary['count']} plans):")
+        print(f"   • median {summary['median_minutes']}m, mean {summary['mean_minutes']}m, "
+              f"p90 {summary['p90_minutes']}m, max {summary['max_minutes']}m")
+
+    if report.busiest_hours:
+        print(f"\n🔥 Busiest hours:")
+        for item in report.busiest_hours:
+            print(f"   • {item['hour']}:00 - {item['rows']} activities")
+
+    print(f"\n💡 Recommendations:")
+    for rec in report.recommendations:
+        print(f"   {rec}")
+
+    print_timings(report.timings)
+
+    print("\n" + "="*60)
+
+
+def iter_report_records(report: ActivityReport):
+    """
+    Yield the report as flat NDJSON records: meta, one record per
+    day / lead time / open plan / recommendation, then summary.
+    """
+    yield {
+        "type": "meta",
+        "report": "activity_analysis",
+        "format_version": NDJSON_FORMAT_VERSION,
+        "timestamp": report.timestamp,
+        "incremental": report.incremental,
+    }
+    for day in report.days:
+        yield {"type": "day", **day}
+    for item in report.lead_times:
+        yield {"type": "lead_time", **item}
+    for item in report.open_plans:
+        yield {"type": "open_plan", **item}
+    for rec in report.recommendations:
+        yield {"type": "recommendation", "text": rec}
+    if report.timings:
+        yield {"type": "timings", **report.timings}
+    yield {
+        "type": "summary",
+        "total_rows": report.total_rows,
+        "total_days": report.total_days,
+        "plans_created": report.plans_created,
+        "plans_implemented": report.plans_implemented,
+        "lead_time": report.lead_time_summary,
+        "busiest_hours": report.busiest_hours,
+        "hours": report.hours,
+        "activities": report.activities,
+    }
+
+
+def save_report(
+    report: ActivityReport,
+    output_format: str = 'json',
+    compress: bool = False,
+    compact: bool = False
+):
+    """Save report to JSON (or NDJSON) file"""
+    output_path = report_path(OUTPUT_DIR, "activity_report", output_format, compress)
+
+    if output_format == 'ndjson':
+        write_ndjson(output_path, iter_report_records(report), compress)
+    else:
+        write_json(output_path, asdict(report), compress, compact)
+
+    print(f"\n💾 Report saved to: {output_path}")
+
+
+# ============================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze plan throughput in Log/aktivitas.md")
+    add_profile_arguments(parser)
+    add_output_arguments(parser)
+    add_workspace_arguments(parser)
+    parser.add_argument('--state', default=STATE_FILE, metavar='PATH',
+                        help=f"Incremental state file (default: {os.path.basename(STATE_FILE)})")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="Ignore the stored state and parse the whole log")
+    args = parser.parse_args()
+
+    profiler = profiler_from_args(args)
+    report = analyze_activity(profiler, args.state, args.rebuild)
+    if report:
+        print_report(report)
+        save_report(report, args.output_format, args.gzip, args.compact)
+        finish_profiling(profiler, args)
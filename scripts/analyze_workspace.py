@@ -3,12 +3,26 @@ Agent-0 Workspace Analyzer
 ==========================
 Scan dan index semua file markdown di workspace Agent-0.
 
-Jalankan: python analyze_workspace.py
-Output: workspace_index.json
+Jalankan: python analyze_workspace.py [--catalog [PATH]] [--no-search-index] [--no-snapshot]
+                                     [--io-concurrency N]
+Output: workspace_index.json + workspace_search.idx (BM25, lihat search_index.py)
+        + workspace_snapshot.bin (snapshot biner, lihat workspace_snapshot.py)
+        (+ katalog SQLite dengan --catalog, lihat workspace_catalog.py)
+
+Judul dan ringkasan dibaca dari snapshot; hanya file yang mtime/size-nya
+berubah sejak scan terakhir yang di-parse ulang. --io-concurrency N
+meng-overlap listing folder dan pembacaan file (network mount / FUSE,
+lihat async_scan.py).
 """
 import os
 import json
 import re
+import argparse
+
+from async_scan import add_io_arguments, scanner_from_args
+from search_index import DEFAULT_INDEX, update_index, describe_update
+from workspace_catalog import WorkspaceCatalog, add_catalog_arguments, print_catalog_stats
+from workspace_snapshot import refresh_snapshot, add_snapshot_arguments
 
 # ============================================================
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -19,12 +33,17 @@ CWD = os.getcwd()
 WORKSPACE_CANDIDATES = ['Agent-0', 'agent-workspace']
 WORKSPACE_DIR = None
 
+# Strategy 0: Explicit override (benchmarks, CI, synthetic workspaces)
+if os.environ.get('AGENT_WORKSPACE'):
+    WORKSPACE_DIR = os.path.abspath(os.environ['AGENT_WORKSPACE'])
+
 # Strategy 1: Look relative to script location
-for candidate in WORKSPACE_CANDIDATES:
-    path = os.path.join(BASE_DIR, candidate)
-    if os.path.exists(path):
-        WORKSPACE_DIR = path
-        break
+if not WORKSPACE_DIR:
+    for candidate in WORKSPACE_CANDIDATES:
+        path = os.path.join(BASE_DIR, candidate)
+        if os.path.exists(path):
+            WORKSPACE_DIR = path
+            break
 
 # Strategy 2: Look relative to current working directory
 if not WORKSPACE_DIR:
@@ -56,66 +75,142 @@ if not WORKSPACE_DIR:
     exit(1)
 
 # ============================================================
+def extract_info_from_lines(lines, title):
+    """Judul (H1 pertama) dan ringkasan singkat dari baris-baris file Markdown."""
+    summary = ""
+    for i, line in enumerate(lines):
+        if line.startswith('# '):
+            title = line.replace('# ', '').strip()
+            # Cari baris non-kosong berikutnya sebagai summary
+            for next_line in lines[i+1:]:
+                clean_line = next_line.strip()
+                if clean_line and not clean_line.startswith('#'):
+                    summary = clean_line[:150] + "..." if len(clean_line) > 150 else clean_line
+                    break
+            break
+    return title, summary
+
+
 def extract_info(file_path):
     """Mengekstrak judul dan ringkasan singkat dari file Markdown."""
     title = os.path.basename(file_path)
-    summary = ""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            for i, line in enumerate(lines):
-                if line.startswith('# '):
-                    title = line.replace('# ', '').strip()
-                    # Cari baris non-kosong berikutnya sebagai summary
-                    for next_line in lines[i+1:]:
-                        clean_line = next_line.strip()
-                        if clean_line and not clean_line.startswith('#'):
-                            summary = clean_line[:150] + "..." if len(clean_line) > 150 else clean_line
-                            break
-                    break
+            return extract_info_from_lines(f.readlines(), title)
     except Exception:
-        pass
+        return title, ""
+
+
+def catalog_document(catalog, folder, filename, full_path):
+    """Baca file sekali: judul/ringkasan untuk index + upsert ke katalog."""
+    try:
+        with open(full_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception:
+        return filename, ""
+    title, summary = extract_info_from_lines(content.splitlines(True), filename)
+    catalog.upsert_document(f"{folder}/{filename}", content, title=title, summary=summary)
     return title, summary
 
 
-def analyze_workspace(workspace_path):
+def snapshot_info(snapshot, folder, filename, full_path):
+    """Judul/ringkasan dari snapshot; file yang tidak ada di snapshot dibaca langsung."""
+    i = snapshot.lookup(f"{folder}/{filename}")
+    if i < 0:
+        return extract_info(full_path)
+    title = snapshot.title(i)
+    if title is None:
+        return filename, snapshot.summary(i)
+    # Same expression as extract_info_from_lines() on the original H1 line
+    return ('# ' + title).replace('# ', '').strip(), snapshot.summary(i)
+
+
+def analyze_workspace(workspace_path, catalog=None, snapshot=None, scanner=None):
     structure = {}
     target_dirs = ['Topic', 'Find', 'Plan', 'Knowledge', 'Research']
+    # Folder listings and file reads overlap through the scanner (not with
+    # --catalog: its SQLite connection stays on this thread)
+    run = scanner.map if scanner and not catalog else map
 
     print(f"\n📂 Scanning: {workspace_path}\n" + "="*50)
 
-    for folder in target_dirs:
+    def listing(folder):
         folder_path = os.path.join(workspace_path, folder)
-        if os.path.exists(folder_path):
-            files_info = []
-            for filename in os.listdir(folder_path):
-                if filename.endswith('.md'):
-                    full_path = os.path.join(folder_path, filename)
-                    title, summary = extract_info(full_path)
-                    files_info.append({
-                        "file": filename,
-                        "title": title,
-                        "summary": summary
-                    })
-            structure[folder] = {
-                "count": len(files_info),
-                "items": files_info
-            }
-            print(f"  ✅ {folder}: {len(files_info)} files")
-        else:
+        return os.listdir(folder_path) if os.path.exists(folder_path) else None
+
+    for folder, filenames in zip(target_dirs, run(listing, target_dirs)):
+        if filenames is None:
             print(f"  ⏭️ {folder}: not found")
+            continue
+
+        def info(filename):
+            full_path = os.path.join(workspace_path, folder, filename)
+            if catalog:
+                return catalog_document(catalog, folder, filename, full_path)
+            if snapshot:
+                return snapshot_info(snapshot, folder, filename, full_path)
+            return extract_info(full_path)
+
+        files_info = []
+        markdown = [f for f in filenames if f.endswith('.md')]
+        for filename, (title, summary) in zip(markdown, run(info, markdown)):
+            files_info.append({
+                "file": filename,
+                "title": title,
+                "summary": summary
+            })
+        structure[folder] = {
+            "count": len(files_info),
+            "items": files_info
+        }
+        if catalog:
+            catalog.prune([f"{folder}/{f}" for f in markdown], [folder])
+        print(f"  ✅ {folder}: {len(files_info)} files")
 
     return structure
 
 
 if __name__ == "__main__":
-    results = analyze_workspace(WORKSPACE_DIR)
+    parser = argparse.ArgumentParser(description="Scan and index the Agent-0 workspace")
+    add_catalog_arguments(parser)
+    parser.add_argument('--no-search-index', action='store_true',
+                        help="Skip updating the full-text search index")
+    add_snapshot_arguments(parser)
+    add_io_arguments(parser)
+    args = parser.parse_args()
+    if args.io_concurrency < 1:
+        parser.error("--io-concurrency must be at least 1")
+    scanner = scanner_from_args(args)
+
+    snapshot = None
+    if not args.no_snapshot:
+        snapshot, parsed, removed = refresh_snapshot(WORKSPACE_DIR, args.snapshot, scanner)
+        print(f"📦 Snapshot: {parsed} parsed, {removed} removed, {len(snapshot)} documents → {args.snapshot}")
+
+    if args.catalog:
+        catalog = WorkspaceCatalog(args.catalog)
+        try:
+            with catalog.transaction(WORKSPACE_DIR):
+                results = analyze_workspace(WORKSPACE_DIR, catalog)
+        finally:
+            catalog.close()
+    else:
+        results = analyze_workspace(WORKSPACE_DIR, snapshot=snapshot, scanner=scanner)
+    if snapshot:
+        snapshot.close()
+    if scanner:
+        scanner.close()
 
     output_path = os.path.join(SCRIPT_DIR, "workspace_index.json")
     with open(output_path, "w", encoding='utf-8') as f:
         json.dump(results, f, indent=4, ensure_ascii=False)
 
     print(f"\n💾 Index saved to: {output_path}")
+    if not args.no_search_index:
+        search = update_index(WORKSPACE_DIR, DEFAULT_INDEX)
+        print(f"🔎 Search index: {describe_update(search)} → {DEFAULT_INDEX}")
+    if args.catalog:
+        print_catalog_stats(catalog)
 
     # Enhanced output: Show title for each file
     print("\n" + "="*60)
@@ -0,0 +1,145 @@
+"""
+Async Scan
+===========
+Pipeline I/O asyncio dengan concurrency terbatas, untuk workspace di network
+mount / FUSE di mana setiap listdir / stat / open memakan beberapa milidetik.
+
+Dipakai oleh document_health_analyzer.py (get_all_md_files + baca dokumen),
+auto_index_updater.py (get_files_in_folder), analyze_workspace.py (listing
+folder + extract_info) dan workspace_snapshot.py (refresh) lewat
+--io-concurrency N.
+
+Fitur:
+1. Event loop asyncio di thread background; panggilan filesystem yang blocking
+   dijalankan di ThreadPoolExecutor dengan ukuran = concurrency, dan semaphore
+   membatasi jumlah panggilan yang sedang berjalan
+2. AsyncScanner.map() - hasil dikembalikan berurutan sesuai input begitu
+   tersedia, jadi analyzer bisa langsung memproses dokumen pertama sementara
+   dokumen berikutnya masih dibaca
+3. Backpressure - paling banyak `window` item yang sudah dimulai tapi belum
+   diambil consumer; input baru hanya diambil saat consumer mengambil hasil
+4. Pipeline bisa dirangkai: output map() listing folder menjadi input map()
+   pembacaan file, jadi listing folder berikutnya overlap dengan pembacaan
+5. --io-concurrency 1 (default) = jalur serial lama, tanpa thread tambahan
+
+Lihat latency_benchmark.py untuk pengukuran dengan filesystem tiruan ber-latency.
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+# ============================================================
+DEFAULT_IO_CONCURRENCY = 1         # serial; 16-32 suits network mounts
+WINDOW_PER_WORKER = 4              # read-ahead per worker before backpressure kicks in
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class AsyncScanner:
+    """
+    Bounded-concurrency runner for blocking filesystem calls.
+    One instance is shared by every stage of a tool, so the limit holds
+    across nested or concurrent map() calls.
+    """
+
+    def __init__(self, concurrency: int, window: Optional[int] = None):
+        self.concurrency = concurrency
+        self.window = window or concurrency * WINDOW_PER_WORKER
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='scan'))
+        self.thread = threading.Thread(target=self.loop.run_forever, name='scan-loop', daemon=True)
+        self.thread.start()
+        self.limit = asyncio.run_coroutine_threadsafe(self._semaphore(), self.loop).result()
+
+    async def _semaphore(self) -> asyncio.Semaphore:
+        # Created on the loop thread so it belongs to that loop
+        return asyncio.Semaphore(self.concurrency)
+
+    async def _run(self, fn: Callable[[T], R], item: T) -> R:
+        async with self.limit:
+            return await self.loop.run_in_executor(None, fn, item)
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        """
+        fn(item) for every item, run concurrently, yielded in input order.
+        `items` is consumed lazily from the caller's thread, so it may be
+        another map() (pipeline stages). Exceptions surface at their position.
+        """
+        pending = deque()
+        source = iter(items)
+
+        def submit() -> bool:
+            for item in source:
+                pending.append(asyncio.run_coroutine_threadsafe(self._run(fn, item), self.loop))
+                return True
+            return False
+
+        try:
+            while len(pending) < self.window and submit():
+                pass
+            while pending:
+                result = pending.popleft().result()
+                submit()
+                yield result
+        finally:
+            # Consumer stopped early: drop work that has not started yet
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        async def shutdown():
+            await self.loop.shutdown_default_executor()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ============================================================
+def list_markdown(scanner: AsyncScanner, fs, workspace: str, folders: List[str]) -> Dict[str, str]:
+    """
+    Concurrent version of the analyzers' folder loop: every folder is listed
+    at once (missing folders are skipped).
+    Returns: {relative_path: absolute_path} in folder order, then listing order
+    """
+    def listing(folder: str) -> Tuple[str, List[str]]:
+        try:
+            return folder, fs.listdir(os.path.join(workspace, folder))
+        except (FileNotFoundError, NotADirectoryError):
+            return folder, []
+
+    files = {}
+    for folder, names in scanner.map(listing, folders):
+        for filename in names:
+            if filename.endswith('.md'):
+                files[f"{folder}/{filename}"] = os.path.join(workspace, folder, filename)
+    return files
+
+
+def add_io_arguments(parser):
+    """Register --io-concurrency on a tool's argument parser"""
+    parser.add_argument('--io-concurrency', type=int, default=DEFAULT_IO_CONCURRENCY, metavar='N',
+                        help="Overlap up to N directory listings / file reads (for network or FUSE "
+                             f"mounts; default: {DEFAULT_IO_CONCURRENCY} = serial)")
+
+
+def scanner_from_args(args) -> Optional[AsyncScanner]:
+    """AsyncScanner for --io-concurrency above 1, else None (serial)"""
+    if args.io_concurrency < 1:
+        raise ValueError("--io-concurrency must be at least 1")
+    return AsyncScanner(args.io_concurrency) if args.io_concurrency > 1 else None
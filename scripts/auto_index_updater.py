@@ -8,6 +8,20 @@ Fitur:
 2. Generate/update index.md dengan daftar file yang ada
 3. Preserve existing content jika ada
 4. Report perubahan yang dilakukan
+5. Skip write jika isi (tanpa baris timestamp) tidak berubah; semua write
+   dilakukan atomic (temp file + rename) dalam satu batch
+6. Knowledge domain bertingkat: tree di-walk sekali, index leaf dibuat paralel
+   (thread pool), index parent dibangun bottom-up dari agregat child
+7. Sharding (--shard-by prefix|range|date) - index folder besar dipecah jadi
+   halaman di `_index/` + root index kecil + manifest.json; hanya shard yang
+   file set-nya berubah yang dibaca ulang dan ditulis
+8. Job lock (--lock wait|dirty|off) - Run bersamaan dari beberapa agent digabung
+9. Changed files (--staged / --changed-since REV) - Untuk pre-commit hook: hanya
+   index.md folder yang berisi file dari `git diff --name-only` yang dibangun ulang
+10. Snapshot (--snapshot / --no-snapshot) - Judul dan ringkasan file yang tidak
+    berubah (mtime/size) dibaca dari workspace_snapshot.bin tanpa membuka file
+11. I/O concurrency (--io-concurrency N) - Untuk network mount / FUSE: judul dan
+    ringkasan file dibaca overlap lewat async_scan.py
 
 Author: Created via Antigravity AI
 Date: 2024-12-22
@@ -15,8 +29,19 @@ Date: 2024-12-22
 
 import os
 import re
+import json
+import argparse
+import hashlib
+import subprocess
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Set, Tuple, Optional
+
+from async_scan import AsyncScanner, add_io_arguments, scanner_from_args
+from git_scope import add_scope_arguments, changed_paths, scope_base
+from job_lock import CoalescingJob, add_lock_arguments, describe_outcome, job_name_for
+from workspace_snapshot import WorkspaceSnapshot, add_snapshot_arguments, snapshot_from_args
 
 # ============================================================
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -27,12 +52,17 @@ CWD = os.getcwd()
 WORKSPACE_CANDIDATES = ['Agent-0', 'agent-workspace']
 WORKSPACE_DIR = None
 
+# Strategy 0: Explicit override (benchmarks, CI, synthetic workspaces)
+if os.environ.get('AGENT_WORKSPACE'):
+    WORKSPACE_DIR = os.path.abspath(os.environ['AGENT_WORKSPACE'])
+
 # Strategy 1: Look relative to script location
-for candidate in WORKSPACE_CANDIDATES:
-    path = os.path.join(BASE_DIR, candidate)
-    if os.path.exists(path):
-        WORKSPACE_DIR = path
-        break
+if not WORKSPACE_DIR:
+    for candidate in WORKSPACE_CANDIDATES:
+        path = os.path.join(BASE_DIR, candidate)
+        if os.path.exists(path):
+            WORKSPACE_DIR = path
+            break
 
 # Strategy 2: Look relative to current working directory
 if not WORKSPACE_DIR:
@@ -69,6 +99,42 @@ TARGET_FOLDERS = ['Topic', 'Find', 'Plan', 'Research']
 # Knowledge has subdirectories, handle separately
 KNOWLEDGE_DIR = os.path.join(WORKSPACE_DIR, 'Knowledge')
 
+# Generated line that changes on every run; ignored when comparing content
+TIMESTAMP_PREFIX = "> Auto-generated:"
+
+# Threads used to read titles/summaries of Knowledge domain folders
+INDEX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Sharded indexes: pages + manifest live in <folder>/_index/
+# ('_' prefix keeps them out of every file listing)
+SHARD_DIR = '_index'
+SHARD_MANIFEST = 'manifest.json'
+SHARD_MODES = ['prefix', 'range', 'date']
+SHARD_SIZE = 100          # IDs per page for --shard-by range
+SHARD_THRESHOLD = 200     # folders with fewer files keep a single index.md
+
+# Queued index writes: path -> new content (None = delete the file)
+PendingWrites = Dict[str, Optional[str]]
+
+# Binary workspace snapshot (see workspace_snapshot.py); set from the command line
+SNAPSHOT: Optional[WorkspaceSnapshot] = None
+
+# Bounded-concurrency reader (see async_scan.py); set from --io-concurrency
+SCANNER: Optional[AsyncScanner] = None
+
+# ============================================================
+@dataclass
+class DomainNode:
+    """One Knowledge domain folder (at any depth)"""
+    rel_path: str                 # relative to KNOWLEDGE_DIR, e.g. "general/typescript"
+    abs_path: str
+    filenames: List[str]          # indexable markdown files directly in this folder
+    own_latest: float             # newest mtime among filenames
+    children: List['DomainNode'] = field(default_factory=list)
+    files: List[Dict] = field(default_factory=list)
+    total_count: int = 0          # files in this folder and all subdomains
+    latest_mtime: float = 0.0     # newest mtime in this folder and all subdomains
+
 # ============================================================
 def extract_title(file_path: str) -> str:
     """Extract H1 title from markdown file"""
@@ -104,30 +170,49 @@ def extract_summary(file_path: str) -> str:
     return ""
 
 
-def get_files_in_folder(folder_path: str) -> List[Dict]:
-    """Get all markdown files in a folder with metadata"""
+def read_title_summary(file_path: str) -> Tuple[str, str]:
+    """Title and summary of a file, from the snapshot when it is still fresh"""
+    if SNAPSHOT:
+        rel_path = os.path.relpath(file_path, WORKSPACE_DIR).replace(os.sep, '/')
+        i = SNAPSHOT.fresh(rel_path, file_path)
+        if i >= 0:
+            title = SNAPSHOT.title(i)
+            title = title.strip() if title is not None else os.path.basename(file_path).replace('.md', '')
+            return title, SNAPSHOT.index_summary(i)
+    return extract_title(file_path), extract_summary(file_path)
+
+
+def is_indexable(filename: str) -> bool:
+    """Skip index files and files starting with underscore"""
+    return filename.endswith('.md') and filename.lower() != 'index.md' and not filename.startswith('_')
+
+
+def get_files_in_folder(folder_path: str, filenames: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Get all markdown files in a folder with metadata.
+    Pass `filenames` when the folder was already listed to skip os.listdir.
+    """
     files = []
-    if not os.path.exists(folder_path):
-        return files
-
-    for filename in sorted(os.listdir(folder_path)):
-        # Skip index files and files starting with underscore
-        if filename.endswith('.md') and filename.lower() != 'index.md' and not filename.startswith('_'):
-            file_path = os.path.join(folder_path, filename)
-            title = extract_title(file_path)
-            summary = extract_summary(file_path)
-
-            files.append({
-                'filename': filename,
-                'title': title,
-                'summary': summary
-            })
+    if filenames is None:
+        if not os.path.exists(folder_path):
+            return files
+        filenames = os.listdir(folder_path)
+
+    indexable = [f for f in sorted(filenames) if is_indexable(f)]
+    paths = [os.path.join(folder_path, f) for f in indexable]
+    run = SCANNER.map if SCANNER else map
+    for filename, (title, summary) in zip(indexable, run(read_title_summary, paths)):
+        files.append({
+            'filename': filename,
+            'title': title,
+            'summary': summary
+        })
 
     return files
 
 
-def generate_index_content(folder_name: str, files: List[Dict]) -> str:
-    """Generate index.md content for a folder"""
+def generate_index_content(folder_name: str, files: List[Dict], subdomains: Optional[List[DomainNode]] = None) -> str:
+    """Generate index.md content for a folder (with a subdomain table for nested Knowledge)"""
 
     # Emoji mapping
     emoji_map = {
@@ -140,7 +225,7 @@ def generate_index_content(folder_name: str, files: List[Dict]) -> str:
     emoji = emoji_map.get(folder_name, '📁')
 
     content = f"# {emoji} {folder_name} Index\n\n"
-    content += f"> Auto-generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
+    content += f"{TIMESTAMP_PREFIX} {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
     content += "---\n\n"
     content += f"## Daftar {folder_name} ({len(files)} items)\n\n"
 
@@ -155,57 +240,345 @@ def generate_index_content(folder_name: str, files: List[Dict]) -> str:
             summary = f['summary'].replace('|', '\\|')
             content += f"| `{f['filename']}` | {f['title']} | {summary} |\n"
 
+    if subdomains:
+        content += f"\n## Subdomains ({len(subdomains)} total)\n\n"
+        content += "| Domain | Files | Updated | Link |\n"
+        content += "|--------|-------|---------|------|\n"
+        for child in subdomains:
+            name = os.path.basename(child.rel_path)
+            content += f"| {name} | {child.total_count} | {format_mtime(child.latest_mtime)} | [`{name}/index.md`]({name}/index.md) |\n"
+
     content += "\n---\n"
     content += f"\n_Updated by auto_index_updater.py_\n"
 
     return content
 
 
-def update_folder_index(folder_path: str, folder_name: str) -> Tuple[bool, int, str]:
+def content_fingerprint(content: str) -> str:
+    """Hash index content, ignoring the auto-generated timestamp line"""
+    lines = [line for line in content.splitlines() if not line.startswith(TIMESTAMP_PREFIX)]
+    return hashlib.sha256("\n".join(lines).encode('utf-8')).hexdigest()
+
+
+def read_existing(index_path: str) -> Optional[str]:
+    """Read an existing index, or None if it does not exist"""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def stage_index_write(index_path: str, new_content: str, pending: PendingWrites) -> Tuple[bool, Optional[str]]:
+    """
+    Queue new_content for index_path if it really differs from what is on disk.
+    Returns: (changed, old_content)
+    """
+    old_content = read_existing(index_path)
+    if old_content is not None and content_fingerprint(old_content) == content_fingerprint(new_content):
+        return False, old_content
+
+    pending[index_path] = new_content
+    return True, old_content
+
+
+def commit_index_writes(pending: PendingWrites) -> int:
+    """
+    Write all queued indexes atomically.
+    Every temp file is written first, then all are renamed into place,
+    so a failure never leaves a half-written index.md behind. Queued
+    deletions (content None) run last.
+    Returns: number of files written or deleted
+    """
+    temp_paths = {}
+    try:
+        for index_path, content in sorted(pending.items()):
+            if content is None:
+                continue
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            temp_path = f"{index_path}.tmp-{os.getpid()}"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            temp_paths[index_path] = temp_path
+
+        for index_path, temp_path in temp_paths.items():
+            os.replace(temp_path, index_path)
+
+        for index_path, content in sorted(pending.items()):
+            if content is None and os.path.exists(index_path):
+                os.remove(index_path)
+                shard_dir = os.path.dirname(index_path)
+                if os.path.basename(shard_dir) == SHARD_DIR and not os.listdir(shard_dir):
+                    os.rmdir(shard_dir)
+    except BaseException:
+        for temp_path in temp_paths.values():
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
+
+    written = len(pending)
+    pending.clear()
+    return written
+
+
+def describe_change(old_content: Optional[str], files: List[Dict]) -> str:
+    """Summarize how a changed index differs from the previous one"""
+    if old_content is None:
+        return "Created new index"
+
+    old_files = set(re.findall(r'`([^`]+\.md)`', old_content))
+    new_files = set(f['filename'] for f in files)
+
+    added = new_files - old_files
+    removed = old_files - new_files
+    msg_parts = []
+    if added:
+        msg_parts.append(f"+{len(added)} added")
+    if removed:
+        msg_parts.append(f"-{len(removed)} removed")
+    return ", ".join(msg_parts) if msg_parts else "Updated titles/summaries"
+
+
+def shard_key(filename: str, mtime: float, shard_by: str, shard_size: int = SHARD_SIZE) -> str:
+    """
+    Page a file belongs to:
+    - prefix: leading letters of the filename (PLAN, TOPIC, ...)
+    - range:  first number in the filename, bucketed by shard_size (000-099)
+    - date:   modification month (2025-01)
+    """
+    if shard_by == 'prefix':
+        match = re.match(r'[A-Za-z]+', filename)
+        return match.group(0).upper() if match else "other"
+    if shard_by == 'range':
+        match = re.search(r'(\d+)', filename)
+        if not match:
+            return "other"
+        low = int(match.group(1)) // shard_size * shard_size
+        return f"{low:03d}-{low + shard_size - 1:03d}"
+    return datetime.fromtimestamp(mtime).strftime('%Y-%m')
+
+
+def load_shard_manifest(folder_path: str) -> Optional[Dict]:
+    manifest_path = os.path.join(folder_path, SHARD_DIR, SHARD_MANIFEST)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def stage_shard_cleanup(folder_path: str, manifest: Optional[Dict], pending: PendingWrites, keep=()):
+    """Queue deletion of shard pages not in `keep` (and the manifest if nothing is kept)"""
+    if not manifest:
+        return
+    for key, shard in manifest.get('shards', {}).items():
+        if key not in keep:
+            pending[os.path.join(folder_path, shard['page'])] = None
+    if not keep:
+        pending[os.path.join(folder_path, SHARD_DIR, SHARD_MANIFEST)] = None
+
+
+def generate_shard_root_content(folder_name: str, shards: Dict[str, Dict]) -> str:
+    """Generate the small root index.md that links to every shard page"""
+    emoji_map = {
+        'Topic': '📚',
+        'Plan': '🏗️',
+        'Find': '🔍',
+        'Research': '🔬',
+        'Knowledge': '📖'
+    }
+    emoji = emoji_map.get(folder_name, '📁')
+    total = sum(len(shard['files']) for shard in shards.values())
+
+    content = f"# {emoji} {folder_name} Index\n\n"
+    content += f"{TIMESTAMP_PREFIX} {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
+    content += "---\n\n"
+    content += f"## Daftar {folder_name} ({total} items, {len(shards)} pages)\n\n"
+    content += "| Page | Files | Link |\n"
+    content += "|------|-------|------|\n"
+    for key, shard in sorted(shards.items()):
+        content += f"| {key} | {len(shard['files'])} | [`{shard['page']}`]({shard['page']}) |\n"
+
+    content += "\n---\n"
+    content += f"\n_Updated by auto_index_updater.py_\n"
+
+    return content
+
+
+def update_sharded_folder_index(
+    folder_path: str,
+    folder_name: str,
+    entries: Dict[str, float],
+    pending: PendingWrites,
+    shard_by: str,
+    shard_size: int = SHARD_SIZE
+) -> Tuple[bool, int, str]:
+    """
+    Update a sharded index: _index/<key>.md pages, _index/manifest.json and a root index.md.
+    `entries` maps indexable filename -> mtime. A page is only re-read and
+    re-rendered when its (filename, mtime) set differs from the manifest.
+    Returns: (changed, file_count, message)
+    """
+    manifest = load_shard_manifest(folder_path)
+    same_layout = (
+        manifest is not None and
+        manifest.get('shard_by') == shard_by and
+        manifest.get('shard_size') == shard_size
+    )
+    old_shards = manifest.get('shards', {}) if same_layout else {}
+
+    shards: Dict[str, Dict] = {}
+    for filename, mtime in sorted(entries.items()):
+        key = shard_key(filename, mtime, shard_by, shard_size)
+        shard = shards.setdefault(key, {"page": f"{SHARD_DIR}/{key}.md", "files": {}})
+        shard['files'][filename] = mtime
+
+    queued_before = len(pending)
+    pages_changed = 0
+    for key, shard in sorted(shards.items()):
+        page_path = os.path.join(folder_path, shard['page'])
+        if old_shards.get(key, {}).get('files') == shard['files'] and os.path.exists(page_path):
+            continue
+        files = get_files_in_folder(folder_path, list(shard['files']))
+        changed, _ = stage_index_write(page_path, generate_index_content(f"{folder_name} {key}", files), pending)
+        pages_changed += int(changed)
+
+    # Pages whose shard disappeared, or every page of an older layout
+    stage_shard_cleanup(folder_path, manifest, pending, keep=set(shards) if same_layout else ())
+
+    stage_index_write(os.path.join(folder_path, 'index.md'), generate_shard_root_content(folder_name, shards), pending)
+
+    new_manifest = {"version": 1, "shard_by": shard_by, "shard_size": shard_size, "shards": shards}
+    if new_manifest != manifest:
+        pending[os.path.join(folder_path, SHARD_DIR, SHARD_MANIFEST)] = json.dumps(new_manifest, indent=1, sort_keys=True)
+
+    if len(pending) == queued_before:
+        return False, len(entries), "No changes needed"
+    return True, len(entries), f"{pages_changed}/{len(shards)} pages changed"
+
+
+def update_folder_index(
+    folder_path: str,
+    folder_name: str,
+    pending: Optional[PendingWrites] = None,
+    shard_by: Optional[str] = None,
+    shard_size: int = SHARD_SIZE,
+    shard_threshold: int = SHARD_THRESHOLD
+) -> Tuple[bool, int, str]:
     """
     Update index.md for a folder.
+    With `shard_by` set, folders holding at least `shard_threshold` files
+    get a sharded index (see update_sharded_folder_index).
+    When `pending` is given the write is queued for commit_index_writes(),
+    otherwise it is written immediately.
     Returns: (changed, file_count, message)
     """
     index_path = os.path.join(folder_path, 'index.md')
-    files = get_files_in_folder(folder_path)
+    batch = pending if pending is not None else {}
+
+    if shard_by:
+        entries = {}
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                if entry.is_file() and is_indexable(entry.name):
+                    entries[entry.name] = entry.stat().st_mtime
+        if len(entries) >= shard_threshold:
+            result = update_sharded_folder_index(folder_path, folder_name, entries, batch, shard_by, shard_size)
+            if pending is None:
+                commit_index_writes(batch)
+            return result
+        files = get_files_in_folder(folder_path, list(entries))
+    else:
+        files = get_files_in_folder(folder_path)
+
+    # Back to a single index: drop pages left over from sharding
+    queued_before = len(batch)
+    stage_shard_cleanup(folder_path, load_shard_manifest(folder_path), batch)
+    cleaned = len(batch) > queued_before
 
     new_content = generate_index_content(folder_name, files)
 
-    # Check if index exists and compare
-    if os.path.exists(index_path):
-        with open(index_path, 'r', encoding='utf-8') as f:
-            old_content = f.read()
-
-        # Extract just the file list section to compare (ignore timestamp)
-        old_files = set(re.findall(r'`([^`]+\.md)`', old_content))
-        new_files = set(f['filename'] for f in files)
-
-        if old_files == new_files:
-            return False, len(files), "No changes needed"
-
-        # Files changed
-        added = new_files - old_files
-        removed = old_files - new_files
-        msg_parts = []
-        if added:
-            msg_parts.append(f"+{len(added)} added")
-        if removed:
-            msg_parts.append(f"-{len(removed)} removed")
-        message = ", ".join(msg_parts)
-    else:
-        message = "Created new index"
+    changed, old_content = stage_index_write(index_path, new_content, batch)
+    if not changed and not cleaned:
+        return False, len(files), "No changes needed"
+
+    message = describe_change(old_content, files) if changed else "Removed shard pages"
 
-    # Write new content
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    if pending is None:
+        commit_index_writes(batch)
 
     return True, len(files), message
 
 
-def update_knowledge_indexes() -> List[Tuple[str, bool, int, str]]:
+def format_mtime(mtime: float) -> str:
+    return datetime.fromtimestamp(mtime).strftime('%Y-%m-%d') if mtime else "-"
+
+
+def walk_knowledge_tree(root: str) -> List[DomainNode]:
     """
-    Update indexes for Knowledge subdirectories.
-    Knowledge has domain subfolders, each needs its own index.
+    List the Knowledge hierarchy once with os.scandir.
+    Returns: every domain node in pre-order (parents before children),
+    siblings sorted by name so the result is deterministic.
+    """
+    nodes: List[DomainNode] = []
+
+    def scan(abs_path: str, rel_path: str) -> DomainNode:
+        filenames = []
+        own_latest = 0.0
+        subdirs = []
+        with os.scandir(abs_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                elif is_indexable(entry.name):
+                    filenames.append(entry.name)
+                    own_latest = max(own_latest, entry.stat().st_mtime)
+        node = DomainNode(rel_path, abs_path, sorted(filenames), own_latest)
+        nodes.append(node)
+        for name in sorted(subdirs):
+            node.children.append(scan(os.path.join(abs_path, name), f"{rel_path}/{name}"))
+        return node
+
+    with os.scandir(root) as entries:
+        top_level = sorted(e.name for e in entries if e.is_dir())
+    for name in top_level:
+        scan(os.path.join(root, name), name)
+
+    return nodes
+
+
+def generate_master_index_content(domains: List[DomainNode]) -> str:
+    """Generate Knowledge master index.md content from top-level domain aggregates"""
+    master_content = "# 📖 Knowledge Base Index\n\n"
+    master_content += f"{TIMESTAMP_PREFIX} {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
+    master_content += "---\n\n"
+    master_content += f"## Domains ({len(domains)} total)\n\n"
+    master_content += "| Domain | Files | Updated | Link |\n"
+    master_content += "|--------|-------|---------|------|\n"
+
+    for d in domains:
+        master_content += f"| {d.rel_path} | {d.total_count} | {format_mtime(d.latest_mtime)} | [`{d.rel_path}/index.md`]({d.rel_path}/index.md) |\n"
+
+    master_content += "\n---\n"
+    master_content += "\n_Updated by auto_index_updater.py_\n"
+
+    return master_content
+
+
+def update_knowledge_indexes(
+    pending: Optional[PendingWrites] = None,
+    only: Optional[Set[str]] = None
+) -> List[Tuple[str, bool, int, str]]:
+    """
+    Update indexes for the (possibly nested) Knowledge domain hierarchy.
+    Every domain folder at any depth gets its own index; titles and
+    summaries are read in a thread pool, parent counts and latest-update
+    dates are aggregated bottom-up from children.
+    `only` limits the rewrite to those domain folders (relative to
+    Knowledge/) and their ancestors, whose subdomain tables show the
+    changed counts; the tree walk itself never opens a file.
     Returns: [(domain_name, changed, file_count, message), ...]
     """
     results = []
@@ -213,60 +586,85 @@ def update_knowledge_indexes() -> List[Tuple[str, bool, int, str]]:
     if not os.path.exists(KNOWLEDGE_DIR):
         return results
 
-    # Update master index
-    master_index_path = os.path.join(KNOWLEDGE_DIR, 'index.md')
-    domains = []
-
-    for item in sorted(os.listdir(KNOWLEDGE_DIR)):
-        item_path = os.path.join(KNOWLEDGE_DIR, item)
-        if os.path.isdir(item_path):
-            # This is a domain folder
-            domain_name = item
-            changed, count, msg = update_folder_index(item_path, f"Knowledge/{domain_name}")
-            results.append((f"Knowledge/{domain_name}", changed, count, msg))
-            domains.append({
-                'name': domain_name,
-                'path': item,
-                'count': count
-            })
+    batch = pending if pending is not None else {}
+
+    nodes = walk_knowledge_tree(KNOWLEDGE_DIR)
+    if only is None:
+        targets = nodes
+    else:
+        targets = [
+            n for n in nodes
+            if any(folder == n.rel_path or folder.startswith(n.rel_path + '/') for folder in only)
+        ]
+
+    # Leaf work (file reads) in parallel; map() keeps input order
+    with ThreadPoolExecutor(max_workers=INDEX_WORKERS) as pool:
+        for node, files in zip(targets, pool.map(lambda n: get_files_in_folder(n.abs_path, n.filenames), targets)):
+            node.files = files
+
+    # Bottom-up aggregation: reversed pre-order visits children first
+    for node in reversed(nodes):
+        node.total_count = len(node.filenames) + sum(c.total_count for c in node.children)
+        node.latest_mtime = max([node.own_latest] + [c.latest_mtime for c in node.children])
+
+    for node in sorted(targets, key=lambda n: n.rel_path):
+        index_path = os.path.join(node.abs_path, 'index.md')
+        new_content = generate_index_content(f"Knowledge/{node.rel_path}", node.files, node.children)
+        changed, old_content = stage_index_write(index_path, new_content, batch)
+        message = describe_change(old_content, node.files) if changed else "No changes needed"
+        results.append((f"Knowledge/{node.rel_path}", changed, len(node.files), message))
 
     # Generate master index
+    domains = [n for n in nodes if '/' not in n.rel_path]
     if domains:
-        master_content = "# 📖 Knowledge Base Index\n\n"
-        master_content += f"> Auto-generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
-        master_content += "---\n\n"
-        master_content += f"## Domains ({len(domains)} total)\n\n"
-        master_content += "| Domain | Files | Link |\n"
-        master_content += "|--------|-------|------|\n"
-
-        for d in domains:
-            master_content += f"| {d['name']} | {d['count']} | [`{d['path']}/index.md`]({d['path']}/index.md) |\n"
+        master_index_path = os.path.join(KNOWLEDGE_DIR, 'index.md')
+        master_content = generate_master_index_content(domains)
+        changed, _ = stage_index_write(master_index_path, master_content, batch)
+        message = "Updated master index" if changed else "No changes needed"
+        results.append(("Knowledge (Master)", changed, len(domains), message))
 
-        master_content += "\n---\n"
-        master_content += "\n_Updated by auto_index_updater.py_\n"
-
-        with open(master_index_path, 'w', encoding='utf-8') as f:
-            f.write(master_content)
-
-        results.append(("Knowledge (Master)", True, len(domains), "Updated master index"))
+    if pending is None:
+        commit_index_writes(batch)
 
     return results
 
 # ============================================================
-def update_all_indexes():
-    """Update all indexes in workspace"""
+def update_all_indexes(
+    shard_by: Optional[str] = None,
+    shard_size: int = SHARD_SIZE,
+    shard_threshold: int = SHARD_THRESHOLD,
+    changed: Optional[Set[str]] = None
+):
+    """
+    Update all indexes in workspace.
+    With `changed` (workspace-relative paths from git), only the indexes
+    of the folders holding those paths are rebuilt.
+    """
     print("\n" + "="*60)
     print("📋 AUTO INDEX UPDATER")
     print("="*60)
 
     all_results = []
+    pending: PendingWrites = {}
+
+    folders = TARGET_FOLDERS
+    knowledge_only = None
+    if changed is not None:
+        folders = [f for f in TARGET_FOLDERS if any(p.startswith(f"{f}/") for p in changed)]
+        knowledge_only = {
+            os.path.dirname(p[len('Knowledge/'):]) for p in changed if p.startswith('Knowledge/')
+        }
+        print(f"\n🎯 {len(changed)} changed file(s) - updating: "
+              f"{', '.join(folders + (['Knowledge'] if knowledge_only else [])) or 'nothing'}")
 
     # Update standard folders
     print("\n1️⃣ Updating standard folder indexes...")
-    for folder in TARGET_FOLDERS:
+    for folder in folders:
         folder_path = os.path.join(WORKSPACE_DIR, folder)
         if os.path.exists(folder_path):
-            changed, count, msg = update_folder_index(folder_path, folder)
+            changed, count, msg = update_folder_index(
+                folder_path, folder, pending, shard_by, shard_size, shard_threshold
+            )
             all_results.append((folder, changed, count, msg))
             status = "✅" if changed else "⏭️"
             print(f"   {status} {folder}: {count} files - {msg}")
@@ -275,12 +673,17 @@ def update_all_indexes():
 
     # Update Knowledge (special handling)
     print("\n2️⃣ Updating Knowledge indexes...")
-    knowledge_results = update_knowledge_indexes()
+    knowledge_results = update_knowledge_indexes(pending, knowledge_only) if knowledge_only != set() else []
     for domain, changed, count, msg in knowledge_results:
         status = "✅" if changed else "⏭️"
         print(f"   {status} {domain}: {count} files - {msg}")
     all_results.extend(knowledge_results)
 
+    # Write every changed index in one atomic batch
+    print("\n3️⃣ Writing changed indexes...")
+    written = commit_index_writes(pending)
+    print(f"   💾 {written} file(s) written")
+
     # Summary
     print("\n" + "="*60)
     print("📊 SUMMARY")
@@ -300,4 +703,40 @@ def update_all_indexes():
 
 
 if __name__ == "__main__":
-    update_all_indexes()
+    parser = argparse.ArgumentParser(description="Update index.md files of the Agent-0 workspace")
+    parser.add_argument('--shard-by', choices=SHARD_MODES,
+                        help="Split large folder indexes into pages under _index/")
+    parser.add_argument('--shard-size', type=int, default=SHARD_SIZE,
+                        help=f"IDs per page for --shard-by range (default: {SHARD_SIZE})")
+    parser.add_argument('--shard-threshold', type=int, default=SHARD_THRESHOLD,
+                        help=f"Only shard folders with at least this many files (default: {SHARD_THRESHOLD})")
+    add_lock_arguments(parser)
+    add_scope_arguments(parser)
+    add_snapshot_arguments(parser)
+    add_io_arguments(parser)
+    args = parser.parse_args()
+    if args.io_concurrency < 1:
+        parser.error("--io-concurrency must be at least 1")
+    SNAPSHOT = snapshot_from_args(args, WORKSPACE_DIR)
+    SCANNER = scanner_from_args(args)
+
+    changed = None
+    if scope_base(args):
+        try:
+            changed = changed_paths(WORKSPACE_DIR, args.staged, args.changed_since)
+        except subprocess.CalledProcessError as e:
+            parser.error(f"git diff failed: {e.stderr.decode('utf-8', 'replace').strip()}")
+
+    # Concurrent updaters share one scan instead of racing on index.md
+    job = CoalescingJob(job_name_for("auto_index_updater", args, *sorted(changed or [])), WORKSPACE_DIR)
+    outcome, _ = job.run(
+        lambda: update_all_indexes(args.shard_by, args.shard_size, args.shard_threshold, changed),
+        args.lock
+    )
+    if SNAPSHOT:
+        SNAPSHOT.close()
+    if SCANNER:
+        SCANNER.close()
+    message = describe_outcome(outcome)
+    if message:
+        print(f"\n{message}")
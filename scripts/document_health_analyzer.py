@@ -3,12 +3,59 @@ Document Health Analyzer
 =========================
 Script untuk memeriksa kesehatan dokumen di Agent-0 workspace.
 
+File ini berisi rule engine, analisis penuh, fast mode dan CLI; mode lain
+ada di modul sendiri (health_approximate.py, health_changed.py,
+health_budget.py, health_history.py) dan memakai rule engine dari sini.
+
 Fitur:
 1. Broken Link Detection - Cari links ke file yang tidak ada
 2. Orphan File Detection - File yang tidak direferensikan di mana pun
 3. Index Validation - Periksa apakah semua file terdaftar di index
 4. Cross-Reference Map - Peta hubungan antar dokumen
 5. Health Score - Skor kesehatan keseluruhan
+6. Profiling (--profile) - Timing per stage + file paling lambat di-parse
+7. Output NDJSON/gzip (--output-format ndjson --gzip) - Record per finding ditulis
+   streaming dari HealthReport yang sudah jadi (hanya serialisasi yang streaming)
+8. Job lock (--lock wait|dirty|off) - Run bersamaan dari beberapa agent digabung
+9. Rule engine - Semua check adalah HealthRule (callback per dokumen / per link)
+   yang dijalankan dalam satu traversal; rule tambahan via --rule NAME
+   (plan_sections, stale_documents, todo_markers)
+10. Near-Duplicate Detection - MinHash + LSH banding untuk dokumen yang hampir sama
+    (opt-in: --rule near_duplicates)
+11. Fast mode (--fast) - Health gate dari metadata direktori saja (os.scandir/stat):
+    index.md, file kosong/stub, file stale, ukuran outlier; check berbasis link dilewati.
+    Skor-nya dilaporkan sebagai `metadata_score` (bobot sendiri, FAST_WEIGHTS),
+    bukan `health_score`, karena tidak sebanding dengan hasil run penuh
+12. Link Fix Suggestions - Saran target untuk broken link (trigram index atas nama file
+    dan judul dokumen), opt-in lewat --suggestions; --fix menulis ulang link yang
+    sarannya tidak ambigu
+13. Code References (--rule code_references) - Referensi ke source file orbit-cli/
+    (`src/ui/gradients.ts`) divalidasi terhadap path index yang dibangun sekali per run
+14. Workspace archive (--workspace path/ke/workspace.zip|.tar.gz) - Dibaca langsung
+    dari arsip tanpa ekstraksi (lihat workspace_fs.py)
+15. History (--history N) - Health score + jumlah failure untuk N commit terakhir
+    yang menyentuh workspace, dibaca dari git tanpa checkout (time series;
+    lihat health_history.py)
+16. Approximate (--approximate) - Estimasi health score dari sampel acak per folder
+    (stratified) yang terus diperbesar sampai presisi / time budget tercapai; hasil
+    berupa estimasi ± error (confidence interval; lihat health_approximate.py)
+17. Catalog (--catalog) - Dokumen, heading dan link di-upsert ke katalog SQLite
+    (lihat workspace_catalog.py) untuk query ber-index
+18. Bytes-level link scan - extract_links() me-memory-map file dan menjalankan pola
+    link versi bytes; hanya span yang match yang di-decode (lihat mmap_scan.py)
+19. Changed files (--staged / --changed-since REV) - Untuk pre-commit hook: hanya
+    file dari `git diff --name-only`, target link-nya dan file yang me-link ke
+    sana (backlink index tersimpan, lihat git_scope.py) yang dianalisis
+    (lihat health_changed.py)
+20. Time budget (--budget-ms MS) - Dokumen diproses berurutan (baru diubah dulu,
+    lalu index, lalu sisanya) sampai waktu habis; hasil per dokumen disimpan di
+    checkpoint sehingga run berikutnya melanjutkan (report ditandai partial + coverage;
+    lihat health_budget.py)
+21. Snapshot (--snapshot / --no-snapshot) - Link dokumen yang tidak berubah (mtime/size)
+    diambil dari workspace_snapshot.bin (lihat workspace_snapshot.py), bukan di-parse ulang
+22. Concurrent I/O (--io-concurrency N) - Listing folder dan pembacaan dokumen di-overlap
+    lewat pipeline asyncio dengan batas concurrency (lihat async_scan.py), untuk
+    workspace di network mount / FUSE; rule tetap menerima dokumen dengan urutan yang sama
 
 Author: Created via Antigravity AI
 Date: 2024-12-22
@@ -16,11 +63,33 @@ Date: 2024-12-22
 
 import os
 import re
+import sys
 import json
+import time
+import zlib
+import argparse
+import subprocess
+from contextlib import nullcontext
 from datetime import datetime
+from urllib.parse import unquote
 from collections import defaultdict
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Set, Tuple
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Set, Tuple, Optional, Callable, Iterable
+
+from async_scan import AsyncScanner, add_io_arguments, list_markdown, scanner_from_args
+from fuzzy_index import build_index
+from git_scope import changed_paths, scope_base
+from job_lock import CoalescingJob, add_lock_arguments, describe_outcome, job_name_for
+from markdown_links import extract_links_from_content
+from report_writer import (
+    NDJSON_FORMAT_VERSION, report_path, write_json, write_ndjson, add_output_arguments
+)
+from stage_profiler import (
+    StageProfiler, add_profile_arguments, profiler_from_args, print_timings, finish_profiling
+)
+from workspace_catalog import WorkspaceCatalog, add_catalog_arguments, print_catalog_stats
+from workspace_snapshot import WorkspaceSnapshot, add_snapshot_arguments, snapshot_from_args
+from workspace_fs import open_workspace, workspace_override, add_workspace_arguments
 
 # ============================================================
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -32,12 +101,17 @@ OUTPUT_DIR = SCRIPT_DIR
 WORKSPACE_CANDIDATES = ['Agent-0', 'agent-workspace']
 WORKSPACE_DIR = None
 
+# Strategy 0: Explicit override via --workspace or AGENT_WORKSPACE
+# (benchmarks, CI, synthetic workspaces, workspace archives)
+WORKSPACE_DIR = workspace_override()
+
 # Strategy 1: Look relative to script location
-for candidate in WORKSPACE_CANDIDATES:
-    path = os.path.join(BASE_DIR, candidate)
-    if os.path.exists(path):
-        WORKSPACE_DIR = path
-        break
+if not WORKSPACE_DIR:
+    for candidate in WORKSPACE_CANDIDATES:
+        path = os.path.join(BASE_DIR, candidate)
+        if os.path.exists(path):
+            WORKSPACE_DIR = path
+            break
 
 # Strategy 2: Look relative to current working directory
 if not WORKSPACE_DIR:
@@ -68,6 +142,9 @@ if not WORKSPACE_DIR:
     print("   Tip: Make sure 'Agent-0/' or 'agent-workspace/' folder exists")
     exit(1)
 
+# Folder or archive (.zip / .tar.*) view of the workspace
+WORKSPACE_FS = open_workspace(WORKSPACE_DIR)
+
 # Folders to analyze
 TARGET_FOLDERS = ['Topic', 'Find', 'Plan', 'Knowledge', 'Research', 'Log', 'Prototype']
 
@@ -89,6 +166,16 @@ IGNORE_LINK_PATTERNS = [
     r'^\.\.\/',              # parent directory refs (cross-workspace)
 ]
 
+# Broken-link fix suggestions
+SUGGESTION_LIMIT = 3               # top-k suggested targets per broken link (--suggestions, --fix)
+SUGGESTION_MAX_DISTANCE = 2        # upper bound on the edit-distance search radius
+FIX_MAX_DISTANCE = 2               # --fix only applies suggestions this close
+TITLE_PATTERN = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+INDEX_NAME_PATTERN = re.compile(r'[^\s`|()\[\]/]+\.md')
+
+# Sharded indexes written by auto_index_updater.py --shard-by
+SHARD_MANIFEST = os.path.join('_index', 'manifest.json')
+
 # ============================================================
 @dataclass
 class HealthReport:
@@ -99,21 +186,35 @@ class HealthReport:
     orphan_files: List[str]
     missing_from_index: List[Dict]
     cross_references: Dict[str, List[str]]
-    health_score: float
+    health_score: Optional[float]                           # None for --fast (see metadata_score)
     summary: Dict[str, int]
     recommendations: List[str]
+    timings: Optional[Dict] = None
+    near_duplicates: List[Dict] = field(default_factory=list)
+    rule_findings: Dict[str, List] = field(default_factory=dict)
+    mode: str = "full"                                      # "fast" / "approximate" / "changed" / "budgeted"
+    skipped_checks: List[str] = field(default_factory=list)  # checks not run in this mode
+    link_fixes: List[Dict] = field(default_factory=list)     # rewrites applied by --fix
+    estimates: Optional[Dict] = None                        # confidence intervals (--approximate)
+    scope: Optional[Dict] = None                            # base revision + documents (--staged / --changed-since)
+    partial: bool = False                                   # budget ran out before every document was covered
+    coverage: Optional[Dict] = None                         # documents covered so far (--budget-ms)
+    metadata_score: Optional[float] = None                  # --fast score, not comparable with health_score
 
 # ============================================================
-def get_all_md_files(workspace_path: str) -> Dict[str, str]:
+def get_all_md_files(workspace_path: str, scanner: Optional[AsyncScanner] = None) -> Dict[str, str]:
     """
     Get all markdown files in workspace.
+    With a `scanner` every folder is listed concurrently (see async_scan.py).
     Returns: {relative_path: absolute_path}
     """
+    if scanner:
+        return list_markdown(scanner, WORKSPACE_FS, workspace_path, TARGET_FOLDERS)
     files = {}
     for folder in TARGET_FOLDERS:
         folder_path = os.path.join(workspace_path, folder)
-        if os.path.exists(folder_path):
-            for filename in os.listdir(folder_path):
+        if WORKSPACE_FS.exists(folder_path):
+            for filename in WORKSPACE_FS.listdir(folder_path):
                 if filename.endswith('.md'):
                     rel_path = f"{folder}/{filename}"
                     abs_path = os.path.join(folder_path, filename)
@@ -121,41 +222,28 @@ def get_all_md_files(workspace_path: str) -> Dict[str, str]:
     return files
 
 
+def read_document(file_path: str) -> str:
+    """Read a markdown file as text ('' if it cannot be read)"""
+    try:
+        return WORKSPACE_FS.read_text(file_path)
+    except Exception as e:
+        print(f"  ⚠️ Error reading {file_path}: {e}")
+        return ""
+
+
 def extract_links(file_path: str) -> List[Tuple[str, str]]:
     """
     Extract all links/references from a markdown file.
+    Files in a workspace folder are memory-mapped and scanned as bytes;
+    archive members and non-UTF-8 files take the text path.
     Returns: [(link_text, link_target), ...]
     """
-    links = []
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Pattern 1: Markdown links [text](path)
-        for match in re.finditer(r'\[([^\]]+)\]\(([^)]+)\)', content):
-            text, target = match.groups()
-            if not target.startswith(('http://', 'https://', '#')):
-                links.append((text, target))
-
-        # Pattern 2: Backtick references
-        for pattern in [
-            r'(?:File|Related|See|Ref):\s*`([^`]+\.md)`',
-            r'- (?:File|Related):\s*`([^`]+\.md)`',
-            r'(?:→|->)\s*`([^`]+\.md)`',
-        ]:
-            for match in re.finditer(pattern, content, re.IGNORECASE):
-                target = match.group(1)
-                links.append((target, target))
-
-        # Pattern 3: Direct file references in lists
-        for match in re.finditer(r'^\s*-\s+`([^`]+\.md)`', content, re.MULTILINE):
-            target = match.group(1)
-            links.append((target, target))
-
+        with WORKSPACE_FS.map_text(file_path) as content:
+            return extract_links_from_content(content)
     except Exception as e:
         print(f"  ⚠️ Error reading {file_path}: {e}")
-
-    return links
+        return []
 
 
 def normalize_path(base_folder: str, link_target: str) -> str:
@@ -196,165 +284,733 @@ def should_ignore_link(link_target: str) -> bool:
     return False
 
 
-def find_broken_links(all_files: Dict[str, str]) -> List[Dict]:
+# ============================================================
+# Rule engine: every check is a HealthRule that receives callbacks
+# while run_rules() reads and parses each document exactly once.
+# ============================================================
+@dataclass
+class ParsedDocument:
+    """One markdown file, read and link-parsed once per run"""
+    rel_path: str
+    abs_path: str
+    folder: str
+    content: str
+    links: List[Tuple[str, str]]
+    # Per-content results rules may memoize (shared across commits by --history)
+    derived: Dict[str, object] = field(default_factory=dict)
+
+
+@dataclass
+class RuleContext:
+    """Workspace-wide lookups shared by all rules"""
+    workspace_dir: str
+    all_files: Dict[str, str]
+    all_file_paths: Set[str]
+    all_file_names: Dict[str, str]   # basename -> rel_path (last one wins)
+
+
+class HealthRule:
+    """
+    Base class for a health check.
+    Override any of the callbacks; finish() returns the rule's findings.
+    `weight` is the rule's share of the health score penalty
+    (0 = informational only).
+    """
+    name = "rule"
+    description = ""
+    weight = 0.0
+
+    def start(self, ctx: RuleContext):
+        pass
+
+    def on_document(self, doc: ParsedDocument, ctx: RuleContext):
+        pass
+
+    def on_link(self, doc: ParsedDocument, link_text: str, link_target: str, ctx: RuleContext):
+        pass
+
+    def finish(self, ctx: RuleContext):
+        return []
+
+    def count(self, findings) -> int:
+        """Number of issues used for scoring"""
+        return len(findings)
+
+
+# name -> rule class
+RULE_REGISTRY: Dict[str, type] = {}
+
+# Rules run by default; the others are opt-in via --rule
+DEFAULT_RULES = ['broken_links', 'orphan_files', 'missing_from_index', 'cross_references']
+
+
+def register_rule(rule_class: type) -> type:
+    """Class decorator adding a rule to RULE_REGISTRY"""
+    RULE_REGISTRY[rule_class.name] = rule_class
+    return rule_class
+
+
+def parse_document(
+    abs_path: str,
+    rel_path: str,
+    links: Optional[List[Tuple[str, str]]] = None,
+    content: Optional[str] = None
+) -> ParsedDocument:
+    """Read and link-parse one document; pass `links` / `content` when they are already known"""
+    if content is None:
+        content = read_document(abs_path)
+    return ParsedDocument(
+        rel_path=rel_path,
+        abs_path=abs_path,
+        folder=rel_path.split('/')[0],
+        content=content,
+        links=extract_links_from_content(content) if links is None else links
+    )
+
+
+def snapshot_parser(snapshot: Optional[WorkspaceSnapshot]) -> Callable:
+    """
+    parse_document() that takes the links of unchanged documents (same
+    mtime and size) from the workspace snapshot instead of re-parsing them.
+    Contents are still read for the content-based rules.
+    """
+    if snapshot is None:
+        return parse_document
+
+    def parse(abs_path: str, rel_path: str) -> ParsedDocument:
+        i = snapshot.fresh(rel_path, abs_path)
+        return parse_document(abs_path, rel_path, snapshot.links(i) if i >= 0 else None)
+
+    return parse
+
+
+def rule_context(all_files: Dict[str, str]) -> RuleContext:
+    return RuleContext(
+        workspace_dir=WORKSPACE_DIR,
+        all_files=all_files,
+        all_file_paths=set(all_files.keys()),
+        all_file_names={os.path.basename(p): p for p in all_files.keys()}
+    )
+
+
+def run_rules(
+    all_files: Dict[str, str],
+    rules: List[HealthRule],
+    parse: Callable = parse_document,
+    documents: Optional[Iterable[str]] = None,
+    ctx: Optional[RuleContext] = None
+) -> Tuple[Dict[str, object], Dict[str, float]]:
+    """
+    Run every rule in a single traversal over the workspace.
+    `documents` limits the traversal to those rel paths (default: all);
+    rules still see every file in the context (pass `ctx` when the caller
+    already built it for `all_files`).
+    Returns: ({rule_name: findings}, {rule_name: elapsed_ms})
+    """
+    ctx = ctx or rule_context(all_files)
+    elapsed = {rule.name: 0.0 for rule in rules}
+
+    def timed(rule: HealthRule, callback: Callable, *args):
+        start = time.perf_counter()
+        result = callback(*args)
+        elapsed[rule.name] += time.perf_counter() - start
+        return result
+
+    for rule in rules:
+        timed(rule, rule.start, ctx)
+
+    for rel_path in (all_files if documents is None else documents):
+        doc = parse(all_files[rel_path], rel_path)
+        for rule in rules:
+            timed(rule, rule.on_document, doc, ctx)
+        for link_text, link_target in doc.links:
+            for rule in rules:
+                timed(rule, rule.on_link, doc, link_text, link_target, ctx)
+
+    findings = {rule.name: timed(rule, rule.finish, ctx) for rule in rules}
+    return findings, {name: round(seconds * 1000, 3) for name, seconds in elapsed.items()}
+
+
+def build_rules(names: List[str], options: Optional[Dict[str, Dict]] = None) -> List[HealthRule]:
+    """Instantiate rules by name; options maps rule name -> constructor kwargs"""
+    options = options or {}
+    return [RULE_REGISTRY[name](**options.get(name, {})) for name in names]
+
+
+# ============================================================
+@register_rule
+class BrokenLinkRule(HealthRule):
     """
     Find all broken links (references to non-existent files).
     Excludes intentional external references (templates, .agent/, etc.)
+    With `suggestions` > 0, each broken link gets up to that many likely
+    intended targets, looked up in a trigram index over file names and
+    document titles.
     """
-    broken = []
-    all_file_names = set(os.path.basename(p) for p in all_files.keys())
-    all_file_paths = set(all_files.keys())
+    name = "broken_links"
+    description = "Links to files that do not exist"
+    weight = 0.4
+
+    def __init__(self, suggestions: int = 0):
+        self.suggestions = suggestions
+
+    def start(self, ctx):
+        self.broken = []
+        self.titles: Dict[str, str] = {}
+
+    def on_document(self, doc, ctx):
+        if self.suggestions:
+            title = TITLE_PATTERN.search(doc.content)
+            if title:
+                self.titles[doc.rel_path] = title.group(1)
+
+    def on_link(self, doc, link_text, link_target, ctx):
+        if link_status(doc.folder, link_target, ctx) == 'broken':
+            self.broken.append({
+                "source_file": doc.rel_path,
+                "broken_link": link_target,
+                "context": link_text[:50] if len(link_text) > 50 else link_text
+            })
+
+    def finish(self, ctx):
+        if self.suggestions and self.broken:
+            suggest = link_suggester(ctx.all_files, self.titles, self.suggestions)
+            for item in self.broken:
+                item["suggestions"] = suggest(item["broken_link"])
+        return self.broken
+
+
+def link_status(folder: str, link_target: str, ctx: RuleContext) -> Optional[str]:
+    """
+    How a link from a document in `folder` resolves: 'listed' (a scanned
+    document), 'external' (exists outside the scanned folders) or 'broken'.
+    None for links the broken-link check skips.
+    """
+    # Skip if obviously not a file reference, and intentional external/template references
+    if not link_target.endswith('.md') or should_ignore_link(link_target):
+        return None
 
-    for rel_path, abs_path in all_files.items():
-        folder = rel_path.split('/')[0]
-        links = extract_links(abs_path)
+    normalized = normalize_path(folder, link_target)
+    if normalized in ctx.all_file_paths or os.path.basename(link_target) in ctx.all_file_names:
+        return 'listed'
+    if WORKSPACE_FS.exists(os.path.join(ctx.workspace_dir, normalized)):
+        return 'external'
+    return 'broken'
 
-        for link_text, link_target in links:
-            # Skip if obviously not a file reference
-            if not link_target.endswith('.md'):
-                continue
 
-            # Skip intentional external/template references
-            if should_ignore_link(link_target):
+def link_key(name: str) -> str:
+    """Fuzzy-match key for a file name or title: lowercase words joined by '_'"""
+    if name.lower().endswith('.md'):
+        name = name[:-3]
+    return "_".join(re.findall(r'[a-z0-9]+', name.lower()))
+
+
+def link_suggester(all_files: Dict[str, str], titles: Dict[str, str], limit: int) -> Callable:
+    """
+    Build the fuzzy index once and return suggest(broken_link) ->
+    [{"target", "distance"}, ...] with at most `limit` entries.
+    """
+    entries = defaultdict(list)
+    for rel_path in all_files:
+        if os.path.basename(rel_path) != 'index.md':
+            entries[link_key(os.path.basename(rel_path))].append(rel_path)
+    for rel_path, title in titles.items():
+        entries[link_key(title)].append(rel_path)
+    tree = build_index(entries)
+    cache = {}
+
+    def suggest(broken_link: str) -> List[Dict]:
+        key = link_key(os.path.basename(broken_link))
+        if key not in cache:
+            # Allow roughly one edit per six characters
+            radius = max(1, min(SUGGESTION_MAX_DISTANCE, len(key) // 6))
+            best: Dict[str, int] = {}
+            for distance, _, targets in tree.search(key, radius):
+                for target in targets:
+                    best.setdefault(target, distance)
+            ranked = sorted(best.items(), key=lambda item: (item[1], item[0]))[:limit]
+            cache[key] = [{"target": target, "distance": distance} for target, distance in ranked]
+        return cache[key]
+
+    return suggest
+
+
+@register_rule
+class OrphanFileRule(HealthRule):
+    """Find files that are not referenced by any other file."""
+    name = "orphan_files"
+    description = "Files not referenced by any other document"
+    weight = 0.3
+
+    def start(self, ctx):
+        self.referenced = set()
+
+    def on_link(self, doc, link_text, link_target, ctx):
+        target_basename = os.path.basename(link_target)
+        if target_basename in ctx.all_file_names:
+            self.referenced.add(ctx.all_file_names[target_basename])
+
+    def finish(self, ctx):
+        # Find orphans (exclude index files which are entry points)
+        orphans = []
+        for rel_path in ctx.all_files.keys():
+            filename = os.path.basename(rel_path)
+            # Skip index files (they're entry points, not meant to be referenced)
+            if 'index' in filename.lower():
                 continue
+            if rel_path not in self.referenced:
+                orphans.append(rel_path)
+        return sorted(orphans)
 
-            normalized = normalize_path(folder, link_target)
-            target_basename = os.path.basename(link_target)
 
-            # Check if target exists
-            exists = (
-                normalized in all_file_paths or
-                target_basename in all_file_names or
-                os.path.exists(os.path.join(WORKSPACE_DIR, normalized))
-            )
+@register_rule
+class IndexCoverageRule(HealthRule):
+    """
+    Check if each folder's index.md contains references to all files in that folder.
+    Index contents come from the shared parse; sharded indexes use their manifest.
+    """
+    name = "missing_from_index"
+    description = "Files not listed in their folder's index.md"
+    weight = 0.3
 
-            if not exists:
-                broken.append({
-                    "source_file": rel_path,
-                    "broken_link": link_target,
-                    "context": link_text[:50] if len(link_text) > 50 else link_text
-                })
+    def __init__(self, only: Optional[Set[str]] = None):
+        # Limit the check to these rel paths (changed-files mode)
+        self.only = only
 
-    return broken
+    def start(self, ctx):
+        self.index_contents = {}
 
+    def on_document(self, doc, ctx):
+        if doc.rel_path == f"{doc.folder}/index.md":
+            self.index_contents[doc.folder] = doc.content
 
-def find_orphan_files(all_files: Dict[str, str]) -> List[str]:
+    def finish(self, ctx):
+        missing = []
+
+        for folder in TARGET_FOLDERS:
+            folder_path = os.path.join(ctx.workspace_dir, folder)
+
+            if folder not in self.index_contents:
+                # No index file for this folder
+                continue
+
+            # Get files in this folder
+            folder_files = [
+                os.path.basename(p)
+                for p in (ctx.all_files.keys() if self.only is None else sorted(self.only & ctx.all_file_paths))
+                if p.startswith(f"{folder}/") and 'index' not in p.lower()
+            ]
+
+            # Sharded index: the manifest lists every indexed file
+            manifest_path = os.path.join(folder_path, SHARD_MANIFEST)
+            if WORKSPACE_FS.exists(manifest_path):
+                try:
+                    manifest = json.loads(WORKSPACE_FS.read_text(manifest_path))
+                    index_content = {
+                        name for shard in manifest.get('shards', {}).values() for name in shard.get('files', {})
+                    }
+                except (OSError, json.JSONDecodeError):
+                    continue
+                listed = index_content
+            else:
+                index_content = self.index_contents[folder]
+                # Names written out in the index are substrings of it for sure;
+                # only the remaining files need a substring search
+                listed = set(INDEX_NAME_PATTERN.findall(index_content))
+
+            # Check each file (substring search for index.md, set lookup for a manifest)
+            for filename in folder_files:
+                if filename not in listed and filename not in index_content:
+                    missing.append({
+                        "folder": folder,
+                        "file": filename,
+                        "index_file": f"{folder}/index.md"
+                    })
+
+        return missing
+
+
+@register_rule
+class CrossReferenceRule(HealthRule):
+    """Build a map of which files reference which other files."""
+    name = "cross_references"
+    description = "Document reference map"
+    weight = 0.0
+
+    def start(self, ctx):
+        self.ref_map = defaultdict(list)
+
+    def on_link(self, doc, link_text, link_target, ctx):
+        target_basename = os.path.basename(link_target)
+        if target_basename in ctx.all_file_names:
+            target_rel = ctx.all_file_names[target_basename]
+            if target_rel not in self.ref_map[doc.rel_path]:
+                self.ref_map[doc.rel_path].append(target_rel)
+
+    def finish(self, ctx):
+        return dict(self.ref_map)
+
+    def count(self, findings) -> int:
+        return 0
+
+
+# Near-duplicate detection (MinHash over word shingles + LSH banding)
+SHINGLE_SIZE = 5                  # words per shingle
+MINHASH_BINS = 128                # signature length (one-permutation hashing)
+LSH_BANDS = 32                    # MINHASH_BINS / LSH_BANDS rows per band
+NEAR_DUPLICATE_THRESHOLD = 0.8    # minimum estimated Jaccard similarity
+MIN_SHINGLES = 20                 # documents shorter than this are skipped
+MAX_SHINGLE_WORDS = 50000         # very large documents are compared on their first N words
+_EMPTY_BIN = 1 << 32              # above any crc32 shingle hash
+
+
+def minhash_signature(content: str, bins: int = MINHASH_BINS) -> Optional[Tuple[int, ...]]:
     """
-    Find files that are not referenced by any other file.
-    """
-    # Build reference map
-    referenced_files = set()
-    all_file_names = {os.path.basename(p): p for p in all_files.keys()}
-
-    for rel_path, abs_path in all_files.items():
-        links = extract_links(abs_path)
-        for _, link_target in links:
-            target_basename = os.path.basename(link_target)
-            if target_basename in all_file_names:
-                referenced_files.add(all_file_names[target_basename])
-
-    # Find orphans (exclude index files which are entry points)
-    orphans = []
-    for rel_path in all_files.keys():
-        filename = os.path.basename(rel_path)
-        # Skip index files (they're entry points, not meant to be referenced)
-        if 'index' in filename.lower():
+    One-permutation MinHash of the document's word shingles: each shingle
+    is hashed once, its bin is hash % bins and each bin keeps the minimum.
+    Shingles are hashed with crc32 rather than Python's per-process
+    salted hash(), so the same tree always yields the same pairs.
+    Returns None for documents with fewer than MIN_SHINGLES shingles.
+    """
+    words = re.findall(r'\w+', content.lower())[:MAX_SHINGLE_WORDS]
+    if len(words) - SHINGLE_SIZE + 1 < MIN_SHINGLES:
+        return None
+
+    shingles = {' '.join(shingle) for shingle in zip(*(words[i:] for i in range(SHINGLE_SIZE)))}
+    hashes = {zlib.crc32(shingle.encode('utf-8')) for shingle in shingles}
+    signature = [_EMPTY_BIN] * bins
+    for h in hashes:
+        b = h % bins
+        value = h // bins
+        if value < signature[b]:
+            signature[b] = value
+    return tuple(signature)
+
+
+def estimate_similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity: matching bins over bins used by either signature"""
+    used = 0
+    equal = 0
+    for a, b in zip(sig_a, sig_b):
+        if a == _EMPTY_BIN and b == _EMPTY_BIN:
             continue
-        if rel_path not in referenced_files:
-            orphans.append(rel_path)
+        used += 1
+        equal += a == b
+    return equal / used if used else 0.0
 
-    return sorted(orphans)
 
+@register_rule
+class NearDuplicateRule(HealthRule):
+    """
+    Report pairs of documents whose shingle sets are nearly identical.
+    Signatures are computed from the shared parse; LSH banding only
+    compares documents that collide in at least one band, so the cost
+    stays close to linear instead of O(n²).
+    """
+    name = "near_duplicates"
+    description = "Near-duplicate documents"
+    weight = 0.0
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+
+    def start(self, ctx):
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+        self.buckets: Dict[Tuple, List[str]] = defaultdict(list)
+
+    def on_document(self, doc, ctx):
+        if os.path.basename(doc.rel_path).lower() == 'index.md':
+            return
+        if 'minhash' not in doc.derived:
+            doc.derived['minhash'] = minhash_signature(doc.content)
+        signature = doc.derived['minhash']
+        if signature is None:
+            return
+        self.signatures[doc.rel_path] = signature
+        rows = MINHASH_BINS // LSH_BANDS
+        for band in range(LSH_BANDS):
+            values = signature[band * rows:(band + 1) * rows]
+            # Short documents leave most bins empty; an all-empty band says
+            # nothing about similarity and would put them all in one bucket
+            if values.count(_EMPTY_BIN) == rows:
+                continue
+            self.buckets[(band,) + values].append(doc.rel_path)
 
-def check_index_coverage(all_files: Dict[str, str]) -> List[Dict]:
+    def finish(self, ctx):
+        candidates = set()
+        for members in self.buckets.values():
+            if len(members) < 2:
+                continue
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    candidates.add((a, b) if a < b else (b, a))
+
+        pairs = []
+        for a, b in candidates:
+            similarity = estimate_similarity(self.signatures[a], self.signatures[b])
+            if similarity >= self.threshold:
+                pairs.append({"file_a": a, "file_b": b, "similarity": round(similarity, 3)})
+
+        return sorted(pairs, key=lambda p: (-p["similarity"], p["file_a"], p["file_b"]))
+
+
+# ------------------------------------------------------------
+# Opt-in rules (enable with --rule NAME)
+# ------------------------------------------------------------
+REQUIRED_PLAN_SECTIONS = ['Tujuan', 'Strategi Implementasi', 'Kriteria Sukses', 'Terkait']
+STALE_DAYS = 90
+DONE_MARKERS = ('✅', 'Done', 'Selesai')
+
+
+@register_rule
+class PlanSectionsRule(HealthRule):
+    """PLAN files must contain every section in REQUIRED_PLAN_SECTIONS"""
+    name = "plan_sections"
+    description = "PLAN files missing required sections"
+    weight = 0.1
+
+    def start(self, ctx):
+        self.findings = []
+
+    def on_document(self, doc, ctx):
+        if not os.path.basename(doc.rel_path).startswith('PLAN_'):
+            return
+        headings = re.findall(r'^##\s+(.+)$', doc.content, re.MULTILINE)
+        for section in REQUIRED_PLAN_SECTIONS:
+            if not any(section in heading for heading in headings):
+                self.findings.append({"file": doc.rel_path, "missing_section": section})
+
+    def finish(self, ctx):
+        return self.findings
+
+
+@register_rule
+class StaleDocumentRule(HealthRule):
+    """Unfinished documents whose latest Dibuat/Update date is older than STALE_DAYS"""
+    name = "stale_documents"
+    description = "Unfinished documents not updated recently"
+    weight = 0.1
+
+    def start(self, ctx):
+        self.findings = []
+        self.today = datetime.now().date()
+
+    def on_document(self, doc, ctx):
+        dates = re.findall(r'\*\*(?:Dibuat|Update):\*\*\s*(\d{4}-\d{2}-\d{2})', doc.content)
+        if not dates:
+            return
+        status = re.search(r'\*\*Status:\*\*\s*([^|\n]+)', doc.content)
+        if status and any(marker in status.group(1) for marker in DONE_MARKERS):
+            return
+        latest = max(dates)
+        age = (self.today - datetime.strptime(latest, '%Y-%m-%d').date()).days
+        if age > STALE_DAYS:
+            self.findings.append({"file": doc.rel_path, "last_update": latest, "age_days": age})
+
+    def finish(self, ctx):
+        return self.findings
+
+
+@register_rule
+class TodoMarkerRule(HealthRule):
+    """Lines containing TODO / FIXME / XXX markers"""
+    name = "todo_markers"
+    description = "Open TODO/FIXME markers"
+    weight = 0.0
+
+    def start(self, ctx):
+        self.findings = []
+
+    pattern = re.compile(r'\b(?:TODO|FIXME|XXX)\b')
+
+    def on_document(self, doc, ctx):
+        # Plain substring checks are far cheaper than the regex on big docs
+        if 'TODO' not in doc.content and 'FIXME' not in doc.content and 'XXX' not in doc.content:
+            return
+        last_line = -1
+        for match in self.pattern.finditer(doc.content):
+            line_start = doc.content.rfind('\n', 0, match.start()) + 1
+            if line_start == last_line:
+                continue
+            last_line = line_start
+            line_end = doc.content.find('\n', match.end())
+            line = doc.content[line_start:line_end if line_end != -1 else None]
+            line_no = doc.content.count('\n', 0, line_start) + 1
+            self.findings.append({"file": doc.rel_path, "line": line_no, "text": line.strip()[:80]})
+
+    def finish(self, ctx):
+        return self.findings
+
+# ------------------------------------------------------------
+# Code references into the orbit-cli source tree
+# ------------------------------------------------------------
+CODE_TREE_NAME = 'orbit-cli'
+CODE_PRUNE_DIRS = {'node_modules', 'dist', 'build', 'coverage', '.git', '.turbo'}
+CODE_EXTENSIONS = r'(?:ts|tsx|js|jsx|mjs|cjs|json)'
+CODE_REF_PATTERNS = [
+    re.compile(r'`([\w.@/-]+/[\w.@-]+\.' + CODE_EXTENSIONS + r')(?::\d+)*`'),  # `src/ui/colors.ts`
+    re.compile(r'\]\(([^)\s]+\.' + CODE_EXTENSIONS + r')\)'),                   # [x](../orbit-cli/src/cli.ts)
+]
+
+
+def default_code_root() -> str:
+    """orbit-cli/ next to the workspace folder (or archive)"""
+    return os.path.join(os.path.dirname(os.path.abspath(WORKSPACE_DIR)), CODE_TREE_NAME)
+
+
+def build_code_path_index(code_root: str) -> Set[str]:
     """
-    Check if each folder's index.md contains references to all files in that folder.
+    Walk the code tree once (pruning CODE_PRUNE_DIRS) and return every
+    path suffix of every file: src/ui/colors.ts, ui/colors.ts, colors.ts.
+    Partial references like `ui/colors.ts` then resolve with one set lookup.
+    """
+    paths = set()
+    for dirpath, dirnames, filenames in os.walk(code_root):
+        dirnames[:] = [d for d in dirnames if d not in CODE_PRUNE_DIRS]
+        rel_dir = os.path.relpath(dirpath, code_root).replace(os.sep, '/')
+        for filename in filenames:
+            parts = (filename if rel_dir == '.' else f"{rel_dir}/{filename}").split('/')
+            for i in range(len(parts)):
+                paths.add('/'.join(parts[i:]))
+    return paths
+
+
+def normalize_code_reference(reference: str) -> Optional[str]:
+    """Reduce a reference to a path relative to the code tree (None = not a code-tree reference)"""
+    if reference.startswith(('http://', 'https://')):
+        return None
+    reference = unquote(reference)
+    marker = f"{CODE_TREE_NAME}/"
+    if marker in reference:
+        return reference.split(marker, 1)[1]
+    if reference.startswith('file://') or reference.startswith('../'):
+        # Absolute or workspace-relative path outside the code tree
+        return None
+    while reference.startswith('./'):
+        reference = reference[2:]
+    return reference
+
+
+@register_rule
+class CodeReferenceRule(HealthRule):
     """
-    missing = []
+    References to source files (`src/ui/gradients.ts`, links into orbit-cli/)
+    that no longer exist in the code tree. The tree is indexed once per run.
+    """
+    name = "code_references"
+    description = "References to source files missing from the code tree"
+    weight = 0.1
+
+    def __init__(self, code_root: Optional[str] = None):
+        self.code_root = code_root or default_code_root()
+
+    def start(self, ctx):
+        self.findings = []
+        self.paths = None
+        if os.path.isdir(self.code_root):
+            self.paths = build_code_path_index(self.code_root)
+        else:
+            print(f"  ⚠️ Code tree not found, skipping code references: {self.code_root}")
+
+    def on_document(self, doc, ctx):
+        if self.paths is None or ('.ts' not in doc.content and '.js' not in doc.content):
+            return
+        seen = set()
+        for pattern in CODE_REF_PATTERNS:
+            for match in pattern.finditer(doc.content):
+                reference = match.group(1)
+                path = normalize_code_reference(reference)
+                if path is None or path in seen:
+                    continue
+                seen.add(path)
+                if path not in self.paths:
+                    self.findings.append({"source_file": doc.rel_path, "reference": path})
+
+    def finish(self, ctx):
+        return self.findings
 
-    for folder in TARGET_FOLDERS:
-        folder_path = os.path.join(WORKSPACE_DIR, folder)
-        index_path = os.path.join(folder_path, 'index.md')
 
-        if not os.path.exists(index_path):
-            # No index file for this folder
-            continue
+# ============================================================
+# Single-check helpers (one traversal each); analyze_document_health()
+# runs all rules together instead.
+# ============================================================
+def find_broken_links(all_files: Dict[str, str]) -> List[Dict]:
+    """Find all broken links (references to non-existent files)."""
+    return run_rules(all_files, [BrokenLinkRule()])[0]['broken_links']
 
-        # Get files in this folder
-        folder_files = [
-            os.path.basename(p) 
-            for p in all_files.keys() 
-            if p.startswith(f"{folder}/") and 'index' not in p.lower()
-        ]
 
-        # Read index content
-        try:
-            with open(index_path, 'r', encoding='utf-8') as f:
-                index_content = f.read()
-        except:
-            continue
+def find_orphan_files(all_files: Dict[str, str]) -> List[str]:
+    """Find files that are not referenced by any other file."""
+    return run_rules(all_files, [OrphanFileRule()])[0]['orphan_files']
 
-        # Check each file
-        for filename in folder_files:
-            if filename not in index_content:
-                missing.append({
-                    "folder": folder,
-                    "file": filename,
-                    "index_file": f"{folder}/index.md"
-                })
 
-    return missing
+def check_index_coverage(all_files: Dict[str, str]) -> List[Dict]:
+    """Check if each folder's index.md lists all files in that folder."""
+    return run_rules(all_files, [IndexCoverageRule()])[0]['missing_from_index']
 
 
 def build_cross_reference_map(all_files: Dict[str, str]) -> Dict[str, List[str]]:
-    """
-    Build a map of which files reference which other files.
-    """
-    ref_map = defaultdict(list)
-    all_file_names = {os.path.basename(p): p for p in all_files.keys()}
+    """Build a map of which files reference which other files."""
+    return run_rules(all_files, [CrossReferenceRule()])[0]['cross_references']
 
-    for rel_path, abs_path in all_files.items():
-        links = extract_links(abs_path)
-        for _, link_target in links:
-            target_basename = os.path.basename(link_target)
-            if target_basename in all_file_names:
-                target_rel = all_file_names[target_basename]
-                if target_rel not in ref_map[rel_path]:
-                    ref_map[rel_path].append(target_rel)
 
-    return dict(ref_map)
+def describe_check(name: str) -> str:
+    """Human-readable description of a rule or fast-mode check"""
+    if name in RULE_REGISTRY:
+        return RULE_REGISTRY[name].description
+    return FAST_CHECKS.get(name, name)
 
 
 def calculate_health_score(
     total_files: int,
     broken_count: int,
     orphan_count: int,
-    missing_index_count: int
+    missing_index_count: int,
+    extra_penalties: List[Tuple[float, int]] = ()
 ) -> float:
     """
     Calculate overall health score (0-100).
+    extra_penalties: [(weight, issue_count), ...] from additional rules
     """
     if total_files == 0:
         return 100.0
 
     # Weights
-    broken_weight = 0.4
-    orphan_weight = 0.3
-    index_weight = 0.3
+    weighted = [
+        (BrokenLinkRule.weight, broken_count),
+        (OrphanFileRule.weight, orphan_count),
+        (IndexCoverageRule.weight, missing_index_count),
+    ] + list(extra_penalties)
 
     # Calculate penalties
-    broken_penalty = min(broken_count / total_files, 1.0) * 100 * broken_weight
-    orphan_penalty = min(orphan_count / total_files, 1.0) * 100 * orphan_weight
-    index_penalty = min(missing_index_count / total_files, 1.0) * 100 * index_weight
+    penalty = sum(min(count / total_files, 1.0) * 100 * weight for weight, count in weighted)
 
-    score = 100 - broken_penalty - orphan_penalty - index_penalty
+    score = 100 - penalty
     return max(0, round(score, 1))
 
 
+
+def score_findings(total_files: int, rules: List[HealthRule], findings: Dict[str, object]) -> float:
+    """Health score from run_rules() findings; rules outside DEFAULT_RULES add their own penalty"""
+    extra_penalties = [
+        (rule.weight, rule.count(findings[rule.name]))
+        for rule in rules if rule.name not in DEFAULT_RULES
+    ]
+    return calculate_health_score(
+        total_files,
+        len(findings['broken_links']),
+        len(findings['orphan_files']),
+        len(findings['missing_from_index']),
+        extra_penalties
+    )
+
+
 def generate_recommendations(
     broken_links: List[Dict],
     orphan_files: List[str],
-    missing_from_index: List[Dict]
+    missing_from_index: List[Dict],
+    rule_findings: Optional[Dict[str, List]] = None,
+    near_duplicates: Optional[List[Dict]] = None
 ) -> List[str]:
     """
     Generate actionable recommendations based on issues found.
@@ -382,60 +1038,132 @@ def generate_recommendations(
             f"📋 Update index.md in {len(folders)} folder(s) - {len(missing_from_index)} file(s) not listed"
         )
 
+    if near_duplicates:
+        top = near_duplicates[0]
+        recommendations.append(
+            f"🧬 Merge or archive {len(near_duplicates)} near-duplicate pair(s) - e.g. "
+            f"{os.path.basename(top['file_a'])} ≈ {os.path.basename(top['file_b'])} ({top['similarity']:.0%})"
+        )
+
+    for name, items in (rule_findings or {}).items():
+        if items:
+            recommendations.append(f"🧩 {describe_check(name)}: {len(items)} finding(s) ({name})")
+
     if not recommendations:
         recommendations.append("✅ No critical issues found - workspace is healthy!")
 
     return recommendations
 
 # ============================================================
-def analyze_document_health() -> HealthReport:
+def analyze_document_health(
+    profiler: Optional[StageProfiler] = None,
+    rule_names: Optional[List[str]] = None,
+    rule_options: Optional[Dict[str, Dict]] = None,
+    catalog: Optional[WorkspaceCatalog] = None,
+    snapshot: Optional[WorkspaceSnapshot] = None,
+    scanner: Optional[AsyncScanner] = None
+) -> HealthReport:
     """
     Run complete document health analysis.
+    All rules (DEFAULT_RULES plus any extra `rule_names`) share one
+    traversal of the workspace; `rule_options` passes constructor
+    arguments per rule name. Pass an enabled StageProfiler to fill
+    the report's `timings` section. With a `catalog`, every parsed
+    document and its links are upserted in one transaction. With a
+    `snapshot`, links of unchanged documents are not re-parsed. With a
+    `scanner`, folders are listed and documents read concurrently ahead
+    of the rules, which receive them in the usual order.
     """
+    profiler = profiler or StageProfiler()
+    names = DEFAULT_RULES + [n for n in (rule_names or []) if n not in DEFAULT_RULES]
+    rules = build_rules(names, rule_options)
+
     print("\n" + "="*60)
     print("📋 DOCUMENT HEALTH ANALYZER")
     print("="*60)
 
-    # Step 1: Get all files
-    print("\n1️⃣ Scanning workspace...")
-    all_files = get_all_md_files(WORKSPACE_DIR)
-    print(f"   Found {len(all_files)} markdown files")
-
-    # Step 2: Find broken links
-    print("\n2️⃣ Checking for broken links...")
-    broken_links = find_broken_links(all_files)
-    print(f"   Found {len(broken_links)} broken link(s)")
-
-    # Step 3: Find orphan files
-    print("\n3️⃣ Detecting orphan files...")
-    orphan_files = find_orphan_files(all_files)
-    print(f"   Found {len(orphan_files)} orphan file(s)")
-
-    # Step 4: Check index coverage
-    print("\n4️⃣ Validating index coverage...")
-    missing_from_index = check_index_coverage(all_files)
-    print(f"   Found {len(missing_from_index)} file(s) missing from index")
-
-    # Step 5: Build cross-reference map
-    print("\n5️⃣ Building cross-reference map...")
-    cross_refs = build_cross_reference_map(all_files)
-    connected_files = len([f for f in cross_refs if cross_refs[f]])
-    print(f"   {connected_files} files have outgoing references")
-
-    # Step 6: Calculate health score
-    print("\n6️⃣ Calculating health score...")
-    health_score = calculate_health_score(
-        len(all_files),
-        len(broken_links),
-        len(orphan_files),
-        len(missing_from_index)
-    )
+    profiler.start()
+    try:
+        # Step 1: Get all files
+        print("\n1️⃣ Scanning workspace...")
+        with profiler.stage("scan"):
+            all_files = get_all_md_files(WORKSPACE_DIR, scanner)
+        print(f"   Found {len(all_files)} markdown files")
+
+        # Step 2: Run every rule in a single pass
+        print(f"\n2️⃣ Running {len(rules)} health rules in one pass...")
+        documents = None
+        if scanner:
+            # Reads (and snapshot stat checks) run ahead in the scanner; rules consume in order
+            loaded: Dict[str, Tuple[str, Optional[List[Tuple[str, str]]]]] = {}
+
+            def load(item: Tuple[str, str]):
+                rel_path, abs_path = item
+                i = snapshot.fresh(rel_path, abs_path) if snapshot else -1
+                return rel_path, read_document(abs_path), snapshot.links(i) if i >= 0 else None
+
+            def prefetched():
+                for rel_path, content, links in scanner.map(load, all_files.items()):
+                    loaded[rel_path] = (content, links)
+                    yield rel_path
+
+            def parse_prefetched(abs_path: str, rel_path: str) -> ParsedDocument:
+                content, links = loaded.pop(rel_path)
+                return parse_document(abs_path, rel_path, links, content)
+
+            documents = prefetched()
+        parse = parse_prefetched if scanner else snapshot_parser(snapshot)
+        parse = profiler.track_files(parse, WORKSPACE_DIR)
+        with profiler.stage("rules"), catalog.transaction(WORKSPACE_DIR) if catalog else nullcontext():
+            if catalog:
+                parse = catalog.track_documents(parse)
+            findings, rule_ms = run_rules(all_files, rules, parse, documents)
+            if catalog:
+                catalog.prune(all_files, TARGET_FOLDERS)
+        profiler.record_rules(rule_ms)
+
+        broken_links = findings['broken_links']
+        orphan_files = findings['orphan_files']
+        missing_from_index = findings['missing_from_index']
+        cross_refs = findings['cross_references']
+        near_duplicates = findings.get('near_duplicates', [])
+        connected_files = len([f for f in cross_refs if cross_refs[f]])
+
+        for rule in rules:
+            result = findings[rule.name]
+            shown = f"{connected_files} connected" if rule.name == 'cross_references' else f"{len(result)} found"
+            print(f"   • {rule.name}: {shown} ({rule_ms[rule.name]:.1f}ms)")
+
+        # Step 3: Calculate health score
+        print("\n3️⃣ Calculating health score...")
+        with profiler.stage("score"):
+            health_score = score_findings(len(all_files), rules, findings)
+    finally:
+        profiler.stop()
+
+    # Near-duplicate pairs have their own report field
+    rule_findings = {
+        rule.name: findings[rule.name] for rule in rules
+        if rule.name not in DEFAULT_RULES and rule.name != 'near_duplicates'
+    }
 
     # Generate recommendations
     recommendations = generate_recommendations(
-        broken_links, orphan_files, missing_from_index
+        broken_links, orphan_files, missing_from_index, rule_findings, near_duplicates
     )
 
+    summary = {
+        "total_files": len(all_files),
+        "broken_links": len(broken_links),
+        "orphan_files": len(orphan_files),
+        "missing_from_index": len(missing_from_index),
+        "connected_files": connected_files
+    }
+    if 'near_duplicates' in findings:
+        summary["near_duplicates"] = len(near_duplicates)
+    for name, items in rule_findings.items():
+        summary[name] = len(items)
+
     # Create report
     report = HealthReport(
         timestamp=datetime.now().isoformat(),
@@ -445,19 +1173,178 @@ def analyze_document_health() -> HealthReport:
         missing_from_index=missing_from_index,
         cross_references=cross_refs,
         health_score=health_score,
-        summary={
-            "total_files": len(all_files),
-            "broken_links": len(broken_links),
-            "orphan_files": len(orphan_files),
-            "missing_from_index": len(missing_from_index),
-            "connected_files": connected_files
-        },
-        recommendations=recommendations
+        summary=summary,
+        recommendations=recommendations,
+        timings=profiler.timings(),
+        near_duplicates=near_duplicates,
+        rule_findings=rule_findings
     )
 
     return report
 
 
+# ============================================================
+# Fast mode: metadata-only checks (--fast)
+# ============================================================
+# Checks that only need directory entries and stat data
+FAST_CHECKS = {
+    'missing_index': "Folders without an index.md",
+    'outdated_index': "Folders whose index.md is older than their newest document",
+    'empty_files': "Empty documents",
+    'stub_files': "Stub documents (very small files)",
+    'stale_files': "Documents not modified for a long time",
+    'size_outliers': "Unusually large documents",
+}
+# Share of the --fast metadata score penalty; unlisted checks are informational.
+# missing_index counts the documents of each folder without an index.md
+FAST_WEIGHTS = {
+    'missing_index': 0.4,
+    'empty_files': 0.3,
+    'stub_files': 0.15,
+    'stale_files': 0.15,
+}
+STUB_BYTES = 200                   # files below this size (but not empty) are stubs
+SIZE_OUTLIER_FACTOR = 20           # outlier = larger than factor × median size...
+SIZE_OUTLIER_MIN_BYTES = 256 * 1024  # ...and at least this large
+INDEXLESS_FOLDERS = {'Log'}        # folders that never have an index.md
+
+
+@dataclass
+class FileStat:
+    """Directory-entry metadata for one markdown file"""
+    rel_path: str
+    folder: str
+    size: int
+    mtime: float
+
+
+def scan_metadata(workspace_path: str) -> Tuple[List[FileStat], Dict[str, Optional[float]]]:
+    """
+    Collect stat data for every markdown file with os.scandir (no file is opened).
+    Returns: (files, {folder: index.md mtime or None if missing})
+    """
+    files = []
+    index_mtimes = {}
+    for folder in TARGET_FOLDERS:
+        folder_path = os.path.join(workspace_path, folder)
+        try:
+            entries = list(WORKSPACE_FS.scandir(folder_path))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        index_mtimes[folder] = None
+        for entry in entries:
+            if not entry.name.endswith('.md') or not entry.is_file():
+                continue
+            stat = entry.stat()
+            if entry.name == 'index.md':
+                index_mtimes[folder] = stat.st_mtime
+            files.append(FileStat(f"{folder}/{entry.name}", folder, stat.st_size, stat.st_mtime))
+    return files, index_mtimes
+
+
+def run_fast_checks(
+    files: List[FileStat],
+    index_mtimes: Dict[str, Optional[float]],
+    now: float
+) -> Dict[str, List]:
+    """Evaluate every FAST_CHECKS entry from stat data alone"""
+    findings = {name: [] for name in FAST_CHECKS}
+    documents = [f for f in files if not f.rel_path.endswith('/index.md')]
+
+    newest = {}
+    for f in documents:
+        newest[f.folder] = max(newest.get(f.folder, 0.0), f.mtime)
+
+    for folder, index_mtime in index_mtimes.items():
+        if folder in INDEXLESS_FOLDERS:
+            continue
+        if index_mtime is None:
+            count = sum(1 for f in documents if f.folder == folder)
+            findings['missing_index'].append({"folder": folder, "files": count})
+        elif newest.get(folder, 0.0) > index_mtime:
+            findings['outdated_index'].append({
+                "folder": folder,
+                "index_age_days": round((newest[folder] - index_mtime) / 86400, 1)
+            })
+
+    sizes = sorted(f.size for f in documents)
+    median = sizes[len(sizes) // 2] if sizes else 0
+    outlier_bytes = max(median * SIZE_OUTLIER_FACTOR, SIZE_OUTLIER_MIN_BYTES)
+
+    for f in documents:
+        if f.size == 0:
+            findings['empty_files'].append({"file": f.rel_path})
+        elif f.size < STUB_BYTES:
+            findings['stub_files'].append({"file": f.rel_path, "bytes": f.size})
+        if f.size > outlier_bytes:
+            findings['size_outliers'].append({"file": f.rel_path, "bytes": f.size})
+        age_days = (now - f.mtime) / 86400
+        if age_days > STALE_DAYS:
+            findings['stale_files'].append({"file": f.rel_path, "age_days": int(age_days)})
+
+    return findings
+
+
+def analyze_metadata_health(profiler: Optional[StageProfiler] = None) -> HealthReport:
+    """
+    Quick health gate from directory metadata only (--fast).
+    No document is opened, so link-based checks are skipped and listed
+    in the report's `skipped_checks`. The result is a `metadata_score`
+    weighted by FAST_WEIGHTS; `health_score` stays None because the two
+    measure different things. Runs in time proportional to the number of
+    directory entries.
+    """
+    profiler = profiler or StageProfiler()
+
+    print("\n" + "="*60)
+    print("📋 DOCUMENT HEALTH ANALYZER (fast, metadata only)")
+    print("="*60)
+
+    profiler.start()
+    try:
+        print("\n1️⃣ Scanning directory metadata...")
+        with profiler.stage("scan"):
+            files, index_mtimes = scan_metadata(WORKSPACE_DIR)
+        print(f"   Found {len(files)} markdown files in {len(index_mtimes)} folders")
+
+        print(f"\n2️⃣ Running {len(FAST_CHECKS)} metadata checks...")
+        with profiler.stage("checks"):
+            findings = run_fast_checks(files, index_mtimes, time.time())
+        for name, items in findings.items():
+            print(f"   • {name}: {len(items)} found")
+
+        print("\n3️⃣ Calculating metadata score...")
+        with profiler.stage("score"):
+            counts = {name: len(findings[name]) for name in FAST_WEIGHTS}
+            counts['missing_index'] = sum(item['files'] for item in findings['missing_index'])
+            metadata_score = calculate_health_score(
+                len(files), 0, 0, 0, [(weight, counts[name]) for name, weight in FAST_WEIGHTS.items()]
+            )
+    finally:
+        profiler.stop()
+
+    summary = {"total_files": len(files)}
+    for name, items in findings.items():
+        summary[name] = len(items)
+
+    return HealthReport(
+        timestamp=datetime.now().isoformat(),
+        total_files=len(files),
+        broken_links=[],
+        orphan_files=[],
+        missing_from_index=[],
+        cross_references={},
+        health_score=None,
+        summary=summary,
+        recommendations=generate_recommendations([], [], [], findings),
+        timings=profiler.timings(),
+        rule_findings=findings,
+        mode="fast",
+        skipped_checks=list(DEFAULT_RULES),
+        metadata_score=metadata_score
+    )
+
+
 def print_report(report: HealthReport):
     """
     Print formatted health report to console.
@@ -466,8 +1353,9 @@ def print_report(report: HealthReport):
     print("📊 HEALTH REPORT")
     print("="*60)
 
-    # Health Score
-    score = report.health_score
+    # Health Score (--fast: metadata score)
+    score = report.health_score if report.health_score is not None else report.metadata_score
+    label = "Health Score" if report.health_score is not None else "Metadata Score"
     if score >= 80:
         status = "🟢 HEALTHY"
     elif score >= 60:
@@ -480,24 +1368,71 @@ def print_report(report: HealthReport):
     bar = "█" * bar_filled + "░" * bar_empty
 
     print(f"\n{status}")
-    print(f"Health Score: [{bar}] {score}/100")
+    if report.estimates:
+        est = report.estimates
+        print(f"Health Score: [{bar}] {score} ± {est['health_score']['error']:.1f}/100 "
+              f"({est['confidence']:.0%} CI, {est['sampled']}/{est['population']} docs sampled)")
+    else:
+        print(f"{label}: [{bar}] {score}/100")
 
     # Summary
     print(f"\n📈 Summary:")
     print(f"   • Total Files: {report.summary['total_files']}")
-    print(f"   • Broken Links: {report.summary['broken_links']}")
-    print(f"   • Orphan Files: {report.summary['orphan_files']}")
-    print(f"   • Missing from Index: {report.summary['missing_from_index']}")
-    print(f"   • Connected Files: {report.summary['connected_files']}")
+    if report.mode == "approximate":
+        est = report.estimates
+        for key, label in (('broken_links', 'Broken Links'), ('orphan_files', 'Orphan Files')):
+            print(f"   • {label}: ~{est[key]['estimate']:.0f} (± {est[key]['error']:.0f})")
+        print(f"   • Missing from Index: {report.summary['missing_from_index']} (exact)")
+        print(f"\n📐 Approximate mode - skipped checks: {', '.join(report.skipped_checks)}")
+    elif report.mode == "changed":
+        print(f"   • Broken Links: {report.summary['broken_links']}")
+        print(f"   • Orphan Files: {report.summary['orphan_files']}")
+        print(f"   • Missing from Index: {report.summary['missing_from_index']}")
+        print(f"\n🎯 Changed since {report.scope['base']}: {report.summary['changed_files']} file(s) changed, "
+              f"{report.total_files} document(s) in scope - skipped checks: {', '.join(report.skipped_checks) or 'none'}")
+    elif report.mode == "budgeted":
+        cov = report.coverage
+        print(f"   • Broken Links: {report.summary['broken_links']}")
+        print(f"   • Orphan Files: {report.summary['orphan_files']}")
+        print(f"   • Missing from Index: {report.summary['missing_from_index']}")
+        print(f"   • Connected Files: {report.summary['connected_files']}")
+        state = "PARTIAL" if report.partial else "complete"
+        print(f"\n⏳ Budget {cov['budget_ms']:g}ms ({state}): {cov['covered']}/{cov['documents']} documents "
+              f"covered ({cov['percent']}%) - {cov['processed']} processed this run, {cov['resumed']} resumed, "
+              f"{cov['remaining']} remaining")
+        print(f"   Score covers analyzed documents only - skipped checks: {', '.join(report.skipped_checks) or 'none'}")
+    elif report.mode == "fast":
+        for name in FAST_CHECKS:
+            print(f"   • {describe_check(name)}: {report.summary[name]}")
+        print(f"\n⚡ Fast mode - skipped checks: {', '.join(report.skipped_checks)}")
+        print("   Metadata score is not comparable with the health score of a full run")
+    else:
+        print(f"   • Broken Links: {report.summary['broken_links']}")
+        print(f"   • Orphan Files: {report.summary['orphan_files']}")
+        print(f"   • Missing from Index: {report.summary['missing_from_index']}")
+        print(f"   • Connected Files: {report.summary['connected_files']}")
+        if 'near_duplicates' in report.summary:
+            print(f"   • Near-Duplicate Pairs: {report.summary['near_duplicates']}")
 
     # Broken Links Detail
     if report.broken_links:
         print(f"\n🔗 Broken Links ({len(report.broken_links)}):")
         for item in report.broken_links[:10]:
             print(f"   • {item['source_file']} → {item['broken_link']}")
+            if item.get('suggestions'):
+                hints = ", ".join(f"{s['target']} (d={s['distance']})" for s in item['suggestions'])
+                print(f"     ↳ did you mean: {hints}")
         if len(report.broken_links) > 10:
             print(f"   ... and {len(report.broken_links) - 10} more")
 
+    # Applied fixes (--fix)
+    if report.link_fixes:
+        print(f"\n🛠️ Rewritten Links ({len(report.link_fixes)}):")
+        for fix in report.link_fixes[:10]:
+            print(f"   • {fix['source_file']}: {fix['old']} → {fix['new']}")
+        if len(report.link_fixes) > 10:
+            print(f"   ... and {len(report.link_fixes) - 10} more")
+
     # Orphan Files Detail
     if report.orphan_files:
         print(f"\n📄 Orphan Files ({len(report.orphan_files)}):")
@@ -514,26 +1449,313 @@ def print_report(report: HealthReport):
         if len(report.missing_from_index) > 10:
             print(f"   ... and {len(report.missing_from_index) - 10} more")
 
+    # Near-Duplicate Detail
+    if report.near_duplicates:
+        print(f"\n🧬 Near-Duplicate Documents ({len(report.near_duplicates)}):")
+        for item in report.near_duplicates[:10]:
+            print(f"   • {item['similarity']:.0%} {item['file_a']} ≈ {item['file_b']}")
+        if len(report.near_duplicates) > 10:
+            print(f"   ... and {len(report.near_duplicates) - 10} more")
+
+    # Extra rule findings
+    for name, items in report.rule_findings.items():
+        if items:
+            print(f"\n🧩 {describe_check(name)} ({len(items)}):")
+            for item in items[:10]:
+                print(f"   • {', '.join(str(v) for v in item.values())}")
+            if len(items) > 10:
+                print(f"   ... and {len(items) - 10} more")
+
     # Recommendations
     print(f"\n💡 Recommendations:")
     for rec in report.recommendations:
         print(f"   {rec}")
 
+    print_timings(report.timings)
+
     print("\n" + "="*60)
 
 
-def save_report(report: HealthReport):
-    """Save report to JSON file."""
-    output_path = os.path.join(OUTPUT_DIR, "document_health_report.json")
+def iter_report_records(report: HealthReport):
+    """
+    Yield the report as flat NDJSON records: meta, one record per
+    finding / cross-reference edge / recommendation, then summary.
+    Only serialization streams: the findings are already in memory, since
+    orphans, the score and the recommendations need the whole rule pass.
+    """
+    yield {
+        "type": "meta",
+        "report": "document_health",
+        "format_version": NDJSON_FORMAT_VERSION,
+        "timestamp": report.timestamp,
+        "mode": report.mode,
+        "skipped_checks": report.skipped_checks,
+    }
+    if report.estimates:
+        yield {"type": "estimates", **report.estimates}
+    if report.scope:
+        yield {"type": "scope", **report.scope}
+    if report.coverage:
+        yield {"type": "coverage", "partial": report.partial, **report.coverage}
+    for item in report.broken_links:
+        yield {"type": "broken_link", **item}
+    for fix in report.link_fixes:
+        yield {"type": "link_fix", **fix}
+    for path in report.orphan_files:
+        yield {"type": "orphan_file", "file": path}
+    for item in report.missing_from_index:
+        yield {"type": "missing_from_index", **item}
+    for source, targets in report.cross_references.items():
+        for target in targets:
+            yield {"type": "cross_reference", "source": source, "target": target}
+    for item in report.near_duplicates:
+        yield {"type": "near_duplicate", **item}
+    for name, items in report.rule_findings.items():
+        for item in items:
+            yield {"type": "rule_finding", "rule": name, **item}
+    for rec in report.recommendations:
+        yield {"type": "recommendation", "text": rec}
+    if report.timings:
+        yield {"type": "timings", **report.timings}
+    yield {
+        "type": "summary",
+        "health_score": report.health_score,
+        **({"metadata_score": report.metadata_score} if report.metadata_score is not None else {}),
+        "total_files": report.total_files,
+        **report.summary,
+    }
+
+
+def suggested_href(source_file: str, target: str, original: str) -> str:
+    """Write `target` in the same style as the broken link it replaces"""
+    source_folder = source_file.split('/')[0]
+    if '/' not in original and target.startswith(f"{source_folder}/") and target.count('/') == 1:
+        return os.path.basename(target)
+    if original.startswith('../'):
+        return f"../{target}"
+    return target
+
+
+def apply_link_fixes(broken_links: List[Dict]) -> List[Dict]:
+    """
+    Rewrite broken links whose best suggestion is unambiguous and within
+    FIX_MAX_DISTANCE edits (--fix).
+    Only `(link)` and `` `link` `` occurrences are replaced; each file is
+    written atomically.
+    Returns: [{"source_file", "old", "new"}, ...]
+    """
+    fixes_by_file = defaultdict(dict)
+    for item in broken_links:
+        suggestions = item.get('suggestions') or []
+        if not suggestions or suggestions[0]['distance'] > FIX_MAX_DISTANCE:
+            continue
+        if len(suggestions) > 1 and suggestions[1]['distance'] == suggestions[0]['distance']:
+            continue
+        old = item['broken_link']
+        fixes_by_file[item['source_file']][old] = suggested_href(
+            item['source_file'], suggestions[0]['target'], old
+        )
 
-    report_dict = asdict(report)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(report_dict, f, indent=2, ensure_ascii=False)
+    applied = []
+    for source_file, rewrites in sorted(fixes_by_file.items()):
+        abs_path = os.path.join(WORKSPACE_DIR, source_file)
+        content = read_document(abs_path)
+        updated = content
+        for old, new in rewrites.items():
+            replaced = updated.replace(f"({old})", f"({new})").replace(f"`{old}`", f"`{new}`")
+            if replaced != updated:
+                applied.append({"source_file": source_file, "old": old, "new": new})
+                updated = replaced
+        if updated != content:
+            temp_path = f"{abs_path}.tmp-{os.getpid()}"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(updated)
+            os.replace(temp_path, abs_path)
+    return applied
+
+
+def save_report(
+    report: HealthReport,
+    output_format: str = 'json',
+    compress: bool = False,
+    compact: bool = False
+):
+    """Save report to JSON (or NDJSON) file."""
+    output_path = report_path(OUTPUT_DIR, "document_health_report", output_format, compress)
+
+    if output_format == 'ndjson':
+        write_ndjson(output_path, iter_report_records(report), compress)
+    else:
+        write_json(output_path, asdict(report), compress, compact)
 
     print(f"\n💾 Report saved to: {output_path}")
 
 # ============================================================
+# ============================================================
+# CLI: analysis modes are mutually exclusive; each supports a subset of options
+MODE_FLAGS = {
+    'fast': "--fast",
+    'approximate': "--approximate",
+    'history': "--history",
+    'changed': "--staged / --changed-since",
+    'budgeted': "--budget-ms",
+}
+OPTION_FLAGS = {
+    'fix': "--fix",
+    'catalog': "--catalog",
+    'rule': "--rule",
+    'io': "--io-concurrency above 1",
+    'archive': "an archive workspace",
+}
+MODE_OPTIONS = {
+    'full': {'fix', 'catalog', 'rule', 'io', 'archive'},
+    'fast': {'archive'},
+    'approximate': {'archive'},
+    'history': {'rule'},
+    'changed': {'rule'},
+    'budgeted': {'rule'},
+}
+
+
+def analysis_mode(parser, args) -> str:
+    """Mode selected by the arguments; exits via parser.error() on a conflict"""
+    selected = {
+        'fast': args.fast,
+        'approximate': args.approximate,
+        'history': args.history is not None,
+        'changed': scope_base(args) is not None,
+        'budgeted': args.budget_ms is not None,
+    }
+    modes = [mode for mode, on in selected.items() if on]
+    if len(modes) > 1:
+        parser.error(f"{' and '.join(MODE_FLAGS[mode] for mode in modes)} cannot be combined")
+    mode = modes[0] if modes else 'full'
+
+    options = {
+        'fix': args.fix,
+        'catalog': bool(args.catalog),
+        'rule': bool(args.rule),
+        'io': args.io_concurrency > 1,
+        'archive': WORKSPACE_FS.read_only,
+    }
+    for option, on in options.items():
+        if on and option not in MODE_OPTIONS[mode]:
+            parser.error(f"{MODE_FLAGS[mode]} does not support {OPTION_FLAGS[option]}")
+    if options['archive'] and (args.fix or options['io']):
+        parser.error("--fix and --io-concurrency need a workspace folder, not an archive")
+    return mode
+
+
 if __name__ == "__main__":
-    report = analyze_document_health()
-    print_report(report)
-    save_report(report)
+    # The mode modules import this file by name: let them share this instance
+    sys.modules.setdefault('document_health_analyzer', sys.modules[__name__])
+    from health_approximate import add_approximate_arguments, analyze_approximate_health
+    from health_budget import add_budget_arguments, analyze_budgeted_health
+    from health_changed import add_changed_arguments, analyze_changed_health
+    from health_history import add_history_arguments, analyze_history, save_history_report
+
+    parser = argparse.ArgumentParser(description="Check document health of the Agent-0 workspace")
+    add_profile_arguments(parser)
+    add_output_arguments(parser)
+    add_lock_arguments(parser)
+    add_workspace_arguments(parser)
+    parser.add_argument('--rule', action='append', default=[], choices=sorted(RULE_REGISTRY),
+                        help="Enable an extra health rule (repeatable)")
+    parser.add_argument('--duplicate-threshold', type=float, default=NEAR_DUPLICATE_THRESHOLD,
+                        metavar='J', help="--rule near_duplicates: minimum estimated Jaccard similarity "
+                                          f"for near-duplicate pairs (default: {NEAR_DUPLICATE_THRESHOLD})")
+    parser.add_argument('--fast', action='store_true',
+                        help="Metadata-only health gate: never opens documents, skips link-based checks")
+    parser.add_argument('--suggestions', type=int, nargs='?', const=SUGGESTION_LIMIT, default=0, metavar='K',
+                        help=f"Suggest up to K targets per broken link (default K: {SUGGESTION_LIMIT}; off unless given)")
+    parser.add_argument('--fix', action='store_true',
+                        help="Rewrite broken links whose best suggestion is unambiguous "
+                             f"and within {FIX_MAX_DISTANCE} edits")
+    parser.add_argument('--code-root', metavar='PATH',
+                        help=f"Source tree for --rule code_references (default: {CODE_TREE_NAME}/ next to the workspace)")
+    add_history_arguments(parser)
+    add_approximate_arguments(parser)
+    add_catalog_arguments(parser)
+    add_changed_arguments(parser)
+    add_snapshot_arguments(parser)
+    add_io_arguments(parser)
+    add_budget_arguments(parser)
+    args = parser.parse_args()
+
+    if args.io_concurrency < 1:
+        parser.error("--io-concurrency must be at least 1")
+    mode = analysis_mode(parser, args)
+    if mode == 'budgeted' and args.budget_ms <= 0:
+        parser.error("--budget-ms needs a positive budget")
+    if args.restart and mode != 'budgeted':
+        parser.error("--restart only applies to --budget-ms")
+    if args.suggestions < 0:
+        parser.error("--suggestions needs a non-negative K")
+    if args.fix and not args.suggestions:
+        # --fix works from the suggestions: turn them on
+        args.suggestions = SUGGESTION_LIMIT
+    base = scope_base(args)
+    changed = set()
+    if base:
+        try:
+            changed = changed_paths(WORKSPACE_DIR, args.staged, args.changed_since)
+        except subprocess.CalledProcessError as e:
+            parser.error(f"git diff failed: {e.stderr.decode('utf-8', 'replace').strip()}")
+    rule_options = {
+        "broken_links": {"suggestions": args.suggestions},
+        "code_references": {"code_root": args.code_root},
+        "near_duplicates": {"threshold": args.duplicate_threshold},
+    }
+
+    def run_analysis() -> StageProfiler:
+        profiler = profiler_from_args(args)
+        catalog = None
+        if mode == 'fast':
+            report = analyze_metadata_health(profiler)
+        elif mode == 'changed':
+            report = analyze_changed_health(base, changed, profiler, args.rule, rule_options, args.backlink_index)
+        elif mode == 'budgeted':
+            report = analyze_budgeted_health(args.budget_ms, profiler, args.rule, rule_options, args.checkpoint,
+                                             args.restart)
+        elif mode == 'approximate':
+            report = analyze_approximate_health(args.precision, args.approx_budget_ms, args.seed, profiler=profiler)
+        else:
+            if args.catalog:
+                catalog = WorkspaceCatalog(args.catalog)
+            snapshot = None if WORKSPACE_FS.read_only else snapshot_from_args(args, WORKSPACE_DIR)
+            scanner = scanner_from_args(args)
+            try:
+                report = analyze_document_health(profiler, args.rule, rule_options, catalog, snapshot, scanner)
+            finally:
+                if catalog:
+                    catalog.close()
+                if snapshot:
+                    snapshot.close()
+                if scanner:
+                    scanner.close()
+            if args.fix:
+                report.link_fixes = apply_link_fixes(report.broken_links)
+        print_report(report)
+        if catalog:
+            print_catalog_stats(catalog)
+        save_report(report, args.output_format, args.gzip, args.compact)
+        return profiler
+
+    if mode == 'history':
+        # Read-only over git objects: no job lock needed
+        profiler = profiler_from_args(args)
+        history = analyze_history(args.history, profiler, args.rule, rule_options)
+        save_history_report(history, args.output_format, args.gzip, args.compact)
+        print_timings(history.timings)
+        finish_profiling(profiler, args)
+        exit(0)
+
+    # Concurrent runs with the same arguments (and changed-file set) share one analysis
+    job_name = job_name_for("document_health", args, *([base] + sorted(changed) if base else []))
+    job = CoalescingJob(job_name, WORKSPACE_DIR)
+    outcome, profiler = job.run(run_analysis, args.lock)
+    if profiler:
+        finish_profiling(profiler, args)
+    else:
+        print(f"\n{describe_outcome(outcome)}")
+        print(f"   Report: {report_path(OUTPUT_DIR, 'document_health_report', args.output_format, args.gzip)}")
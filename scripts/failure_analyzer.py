@@ -8,6 +8,22 @@ Fitur:
 2. Group failures by similarity (Tool + Error Type)
 3. Detect new patterns (≥3 similar failures tanpa Pattern ID)
 4. Generate analysis report
+5. Profiling (--profile) - Timing per stage di report
+6. Output NDJSON/gzip (--output-format ndjson --gzip) - Streaming record per group
+7. Workspace archive (--workspace path/ke/workspace.zip|.tar.gz) - failures.md dibaca
+   langsung dari arsip tanpa ekstraksi
+8. Fleet mode (--fleet WS1 WS2 ...) - Failure log banyak agent di-parse paralel
+   (process pool), lalu group/tool/pattern di-merge; kandidat pattern lintas agent
+   yang tidak mencapai PATTERN_THRESHOLD di satu agent pun dilaporkan
+9. Catalog (--catalog) - Failure entry di-upsert ke katalog SQLite
+   (lihat workspace_catalog.py)
+10. Bytes-level parse - failures.md di-memory-map dan di-scan dengan pola bytes;
+    hanya nilai field yang match yang di-decode (lihat mmap_scan.py)
+11. Append (--append TOOL --error ... / append_failure()) - Entry baru ditulis
+    atomic di bawah file lock; ID F-NNN berikutnya, group, fingerprint dan
+    counter per tool (tabel Statistik) diambil/di-update dari
+    scripts/failure_index.json tanpa parse ulang, dan langsung dilaporkan
+    jika group mencapai PATTERN_THRESHOLD
 
 Author: Created via Antigravity AI
 Date: 2024-12-22
@@ -16,11 +32,26 @@ Date: 2024-12-22
 import os
 import re
 import json
+import hashlib
+import argparse
+from contextlib import ExitStack
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, asdict
 from typing import List, Dict, Set, Tuple, Optional
 
+from job_lock import workspace_lock
+from mmap_scan import Content, compiled_pattern, span_text
+from report_writer import (
+    NDJSON_FORMAT_VERSION, open_output, report_path, write_json, write_ndjson, add_output_arguments
+)
+from stage_profiler import (
+    StageProfiler, add_profile_arguments, profiler_from_args, print_timings, finish_profiling
+)
+from workspace_catalog import WorkspaceCatalog, add_catalog_arguments, print_catalog_stats
+from workspace_fs import ARCHIVE_SUFFIXES, open_workspace, workspace_override, add_workspace_arguments
+
 # ============================================================
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.dirname(SCRIPT_DIR)
@@ -31,12 +62,17 @@ OUTPUT_DIR = SCRIPT_DIR
 WORKSPACE_CANDIDATES = ['Agent-0', 'agent-workspace']
 WORKSPACE_DIR = None
 
+# Strategy 0: Explicit override via --workspace or AGENT_WORKSPACE
+# (benchmarks, CI, synthetic workspaces, workspace archives)
+WORKSPACE_DIR = workspace_override()
+
 # Strategy 1: Look relative to script location
-for candidate in WORKSPACE_CANDIDATES:
-    path = os.path.join(BASE_DIR, candidate)
-    if os.path.exists(path):
-        WORKSPACE_DIR = path
-        break
+if not WORKSPACE_DIR:
+    for candidate in WORKSPACE_CANDIDATES:
+        path = os.path.join(BASE_DIR, candidate)
+        if os.path.exists(path):
+            WORKSPACE_DIR = path
+            break
 
 # Strategy 2: Look relative to current working directory
 if not WORKSPACE_DIR:
@@ -67,6 +103,9 @@ if not WORKSPACE_DIR:
     print("   Tip: Make sure 'Agent-0/' or 'agent-workspace/' folder exists")
     exit(1)
 
+# Folder or archive (.zip / .tar.*) view of the workspace
+WORKSPACE_FS = open_workspace(WORKSPACE_DIR)
+
 FAILURES_FILE = os.path.join(WORKSPACE_DIR, "Log", "failures.md")
 
 # Minimum occurrences to be considered a pattern
@@ -98,25 +137,27 @@ class FailureReport:
     new_pattern_candidates: List[Dict]
     existing_patterns: List[Dict]
     recommendations: List[str]
+    timings: Optional[Dict] = None
 
 # ============================================================
-def parse_failure_entries(content: str) -> List[FailureEntry]:
+def parse_failure_entries(content: Content) -> List[FailureEntry]:
     """
     Parse all F-XXX entries from failures.md
+    `content` may be a memory-mapped file (see mmap_scan.py); fields are
+    searched in place and only the matched values are decoded.
     """
     entries = []
 
     # Pattern to match failure entries
     # Format: ### F-{NNN} | {Tool} | {Date}
-    entry_pattern = r'### (F-\d+) \| (\w+) \| (\d{4}-\d{2}-\d{2})'
+    entry_pattern = compiled_pattern(r'### (F-\d+) \| (\w+) \| (\d{4}-\d{2}-\d{2})', content)
+    section_pattern = compiled_pattern(r'\n---', content)
 
     # Find all entry headers
-    matches = list(re.finditer(entry_pattern, content))
+    matches = list(entry_pattern.finditer(content))
 
     for i, match in enumerate(matches):
-        entry_id = match.group(1)
-        tool = match.group(2)
-        date = match.group(3)
+        entry_id, tool, date = map(span_text, match.groups())
 
         # Get content until next entry or section
         start = match.end()
@@ -124,17 +165,15 @@ def parse_failure_entries(content: str) -> List[FailureEntry]:
             end = matches[i + 1].start()
         else:
             # Find next section (---)
-            next_section = content.find('\n---', start)
-            end = next_section if next_section != -1 else len(content)
-
-        entry_content = content[start:end]
+            next_section = section_pattern.search(content, start)
+            end = next_section.start() if next_section else len(content)
 
         # Parse fields
-        command = extract_field(entry_content, r'\*\*Command/Params:\*\*\s*`?([^`\n]+)`?')
-        error = extract_field(entry_content, r'\*\*Error:\*\*\s*([^\n]+)')
-        context = extract_field(entry_content, r'\*\*Context:\*\*\s*([^\n]+)')
-        workaround = extract_field(entry_content, r'\*\*Workaround:\*\*\s*([^\n]+)')
-        pattern_id = extract_field(entry_content, r'\*\*Pattern ID:\*\*\s*(P-\d+)?')
+        command = extract_field(content, r'\*\*Command/Params:\*\*\s*`?([^`\n]+)`?', start, end)
+        error = extract_field(content, r'\*\*Error:\*\*\s*([^\n]+)', start, end)
+        context = extract_field(content, r'\*\*Context:\*\*\s*([^\n]+)', start, end)
+        workaround = extract_field(content, r'\*\*Workaround:\*\*\s*([^\n]+)', start, end)
+        pattern_id = extract_field(content, r'\*\*Pattern ID:\*\*\s*(P-\d+)?', start, end)
 
         entries.append(FailureEntry(
             id=entry_id,
@@ -150,45 +189,49 @@ def parse_failure_entries(content: str) -> List[FailureEntry]:
     return entries
 
 
-def extract_field(content: str, pattern: str) -> Optional[str]:
-    """Extract a field value using regex pattern"""
-    match = re.search(pattern, content)
-    if match:
-        value = match.group(1).strip()
+def extract_field(content: Content, pattern: str, start: int = 0, end: Optional[int] = None) -> Optional[str]:
+    """Extract a field value using regex pattern (within content[start:end])"""
+    end = len(content) if end is None else end
+    match = compiled_pattern(pattern, content).search(content, start, end)
+    if match and match.group(1):
+        value = span_text(match.group(1)).strip()
         return value if value else None
     return None
 
 
-def parse_existing_patterns(content: str) -> List[Dict]:
+def parse_existing_patterns(content: Content) -> List[Dict]:
     """
     Parse identified patterns section
     """
     patterns = []
 
     # Find the "Identified Patterns" section
-    section_match = re.search(r'## 🔍 Identified Patterns\s*\n(.*?)(?=\n## |\n---|\Z)', content, re.DOTALL)
+    section_match = compiled_pattern(
+        r'## 🔍 Identified Patterns\s*\n(.*?)(?=\n## |\n---|\Z)', content, re.DOTALL
+    ).search(content)
     if not section_match:
         return patterns
 
-    section_content = section_match.group(1)
+    section_start, section_end = section_match.span(1)
 
     # Pattern header: ### P-XXX: Name [STATUS]
-    pattern_regex = r'### (P-\d+):\s*([^\[\n]+)(?:\[([^\]]+)\])?'
+    pattern_regex = compiled_pattern(r'### (P-\d+):\s*([^\[\n]+)(?:\[([^\]]+)\])?', content)
+    next_pattern_regex = compiled_pattern(r'\n### P-\d+', content)
+    occurrences_regex = compiled_pattern(r'\*\*Occurrences:\*\*\s*(\d+)', content)
 
-    for match in re.finditer(pattern_regex, section_content):
-        pattern_id = match.group(1)
-        name = match.group(2).strip()
-        status = match.group(3) if match.group(3) else "Active"
+    for match in pattern_regex.finditer(content, section_start, section_end):
+        pattern_id = span_text(match.group(1))
+        name = span_text(match.group(2)).strip()
+        status = span_text(match.group(3)) if match.group(3) else "Active"
 
         # Get pattern content
         start = match.end()
-        next_pattern = re.search(r'\n### P-\d+', section_content[start:])
-        end = start + next_pattern.start() if next_pattern else len(section_content)
-        pattern_content = section_content[start:end]
+        next_pattern = next_pattern_regex.search(content, start, section_end)
+        end = next_pattern.start() if next_pattern else section_end
 
         # Extract occurrences
-        occurrences_match = re.search(r'\*\*Occurrences:\*\*\s*(\d+)', pattern_content)
-        occurrences = int(occurrences_match.group(1)) if occurrences_match else 0
+        occurrences_match = occurrences_regex.search(content, start, end)
+        occurrences = int(span_text(occurrences_match.group(1))) if occurrences_match else 0
 
         patterns.append({
             "id": pattern_id,
@@ -200,13 +243,16 @@ def parse_existing_patterns(content: str) -> List[Dict]:
     return patterns
 
 
-def count_archived_patterns(content: str) -> int:
+def count_archived_patterns(content: Content) -> int:
     """Count patterns in Archived section"""
-    section_match = re.search(r'## 📦 Archived Patterns\s*\n(.*?)(?=\n## |\Z)', content, re.DOTALL)
+    section_match = compiled_pattern(
+        r'## 📦 Archived Patterns\s*\n(.*?)(?=\n## |\Z)', content, re.DOTALL
+    ).search(content)
     if not section_match:
         return 0
 
-    return len(re.findall(r'### P-\d+:', section_match.group(1)))
+    start, end = section_match.span(1)
+    return len(compiled_pattern(r'### P-\d+:', content).findall(content, start, end))
 
 # ============================================================
 def normalize_error(error: str) -> str:
@@ -226,6 +272,36 @@ def normalize_error(error: str) -> str:
     return error
 
 
+def failure_group_key(tool: str, error: str) -> str:
+    """
+    Group key of one failure: tool|error_type
+    """
+    normalized = normalize_error(error)
+    # Simplify to main keywords
+    if 'stuck' in normalized or 'timeout' in normalized:
+        error_type = 'stuck_timeout'
+    elif 'not' in normalized and ('delete' in normalized or 'hapus' in normalized or 'terhapus' in normalized):
+        error_type = 'file_not_deleted'
+    elif 'not found' in normalized:
+        error_type = 'not_found'
+    elif 'permission' in normalized or 'access' in normalized:
+        error_type = 'permission_denied'
+    else:
+        # Use first 3 words as key
+        words = normalized.split()[:3]
+        error_type = '_'.join(words) if words else 'unknown'
+
+    return f"{tool}|{error_type}"
+
+
+def failure_fingerprint(tool: str, error: str) -> str:
+    """
+    Fingerprint of the full normalized error: entries sharing one are
+    repeats of the same failure (a group can hold several fingerprints).
+    """
+    return hashlib.sha1(f"{tool}|{normalize_error(error)}".encode('utf-8')).hexdigest()[:12]
+
+
 def group_failures(entries: List[FailureEntry]) -> Dict[str, List[str]]:
     """
     Group failures by Tool + normalized error pattern
@@ -233,24 +309,7 @@ def group_failures(entries: List[FailureEntry]) -> Dict[str, List[str]]:
     groups = defaultdict(list)
 
     for entry in entries:
-        # Create group key: tool|normalized_error
-        normalized = normalize_error(entry.error)
-        # Simplify to main keywords
-        if 'stuck' in normalized or 'timeout' in normalized:
-            error_type = 'stuck_timeout'
-        elif 'not' in normalized and ('delete' in normalized or 'hapus' in normalized or 'terhapus' in normalized):
-            error_type = 'file_not_deleted'
-        elif 'not found' in normalized:
-            error_type = 'not_found'
-        elif 'permission' in normalized or 'access' in normalized:
-            error_type = 'permission_denied'
-        else:
-            # Use first 3 words as key
-            words = normalized.split()[:3]
-            error_type = '_'.join(words) if words else 'unknown'
-
-        group_key = f"{entry.tool}|{error_type}"
-        groups[group_key].append(entry.id)
+        groups[failure_group_key(entry.tool, entry.error)].append(entry.id)
 
     return dict(groups)
 
@@ -281,20 +340,25 @@ def find_new_pattern_candidates(
         ]
 
         if unpatterned:
-            tool, error_type = group_key.split('|', 1)
-            candidates.append({
-                "group_key": group_key,
-                "tool": tool,
-                "error_type": error_type,
-                "total_occurrences": len(entry_ids),
-                "unpatterned_count": len(unpatterned),
-                "unpatterned_ids": unpatterned,
-                "suggested_pattern_name": f"{tool.title()} {error_type.replace('_', ' ').title()}"
-            })
+            candidates.append(pattern_candidate(group_key, entry_ids, unpatterned))
 
     return candidates
 
 
+def pattern_candidate(group_key: str, entry_ids: List[str], unpatterned: List[str]) -> Dict:
+    """New pattern candidate record for one group"""
+    tool, error_type = group_key.split('|', 1)
+    return {
+        "group_key": group_key,
+        "tool": tool,
+        "error_type": error_type,
+        "total_occurrences": len(entry_ids),
+        "unpatterned_count": len(unpatterned),
+        "unpatterned_ids": unpatterned,
+        "suggested_pattern_name": f"{tool.title()} {error_type.replace('_', ' ').title()}"
+    }
+
+
 def generate_recommendations(
     entries: List[FailureEntry],
     candidates: List[Dict],
@@ -325,43 +389,74 @@ def generate_recommendations(
     return recommendations
 
 # ============================================================
-def analyze_failures() -> FailureReport:
+def open_failure_log(file_path: str, stack: ExitStack) -> Content:
+    """
+    Open the failure log for scanning (from a folder or workspace archive).
+    Folder workspaces are memory-mapped; the map stays open until `stack` closes.
+    """
+    if not WORKSPACE_FS.exists(file_path):
+        raise FileNotFoundError(file_path)
+    return stack.enter_context(WORKSPACE_FS.map_text(file_path))
+
+
+def analyze_failures(
+    profiler: Optional[StageProfiler] = None,
+    catalog: Optional[WorkspaceCatalog] = None
+) -> FailureReport:
     """
     Run complete failure analysis
+    Pass an enabled StageProfiler to fill the report's `timings` section.
+    With a `catalog`, the parsed entries are upserted into it.
     """
+    profiler = profiler or StageProfiler()
+
     print("\n" + "="*60)
     print("📊 FAILURE PATTERN ANALYZER")
     print("="*60)
 
-    # Read failures.md
-    print("\n1️⃣ Reading failure log...")
+    profiler.start()
+    log = ExitStack()
     try:
-        with open(FAILURES_FILE, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except FileNotFoundError:
-        print(f"   ⚠️ File not found: {FAILURES_FILE}")
-        return None
-
-    # Parse entries
-    print("\n2️⃣ Parsing failure entries...")
-    entries = parse_failure_entries(content)
-    print(f"   Found {len(entries)} entries")
-
-    # Parse existing patterns
-    print("\n3️⃣ Parsing existing patterns...")
-    existing_patterns = parse_existing_patterns(content)
-    archived_count = count_archived_patterns(content)
-    print(f"   Found {len(existing_patterns)} active, {archived_count} archived")
-
-    # Group failures
-    print("\n4️⃣ Grouping failures by similarity...")
-    groups = group_failures(entries)
-    print(f"   Created {len(groups)} groups")
-
-    # Find new pattern candidates
-    print("\n5️⃣ Detecting new pattern candidates...")
-    candidates = find_new_pattern_candidates(entries, groups)
-    print(f"   Found {len(candidates)} potential new patterns")
+        # Read failures.md
+        print("\n1️⃣ Reading failure log...")
+        try:
+            with profiler.stage("read"):
+                content = profiler.track_files(open_failure_log, WORKSPACE_DIR)(FAILURES_FILE, log)
+        except FileNotFoundError:
+            print(f"   ⚠️ File not found: {FAILURES_FILE}")
+            return None
+
+        # Parse entries
+        print("\n2️⃣ Parsing failure entries...")
+        with profiler.stage("parse_entries"):
+            entries = parse_failure_entries(content)
+        print(f"   Found {len(entries)} entries")
+
+        if catalog:
+            with profiler.stage("catalog"), catalog.transaction(WORKSPACE_DIR):
+                catalog.replace_failures(asdict(e) for e in entries)
+
+        # Parse existing patterns
+        print("\n3️⃣ Parsing existing patterns...")
+        with profiler.stage("parse_patterns"):
+            existing_patterns = parse_existing_patterns(content)
+            archived_count = count_archived_patterns(content)
+        print(f"   Found {len(existing_patterns)} active, {archived_count} archived")
+
+        # Group failures
+        print("\n4️⃣ Grouping failures by similarity...")
+        with profiler.stage("group"):
+            groups = group_failures(entries)
+        print(f"   Created {len(groups)} groups")
+
+        # Find new pattern candidates
+        print("\n5️⃣ Detecting new pattern candidates...")
+        with profiler.stage("candidates"):
+            candidates = find_new_pattern_candidates(entries, groups)
+        print(f"   Found {len(candidates)} potential new patterns")
+    finally:
+        log.close()
+        profiler.stop()
 
     # Calculate stats
     patterned = len([e for e in entries if e.pattern_id])
@@ -380,7 +475,8 @@ def analyze_failures() -> FailureReport:
         groups=groups,
         new_pattern_candidates=candidates,
         existing_patterns=existing_patterns,
-        recommendations=recommendations
+        recommendations=recommendations,
+        timings=profiler.timings()
     )
 
     return report
@@ -430,22 +526,665 @@ def print_report(report: FailureReport):
     for rec in report.recommendations:
         print(f"   {rec}")
 
+    print_timings(report.timings)
+
+    print("\n" + "="*60)
+
+
+def iter_report_records(report: FailureReport):
+    """
+    Yield the report as flat NDJSON records: meta, one record per
+    group / candidate / pattern / recommendation, then summary.
+    """
+    yield {
+        "type": "meta",
+        "report": "failure_analysis",
+        "format_version": NDJSON_FORMAT_VERSION,
+        "timestamp": report.timestamp,
+    }
+    for group_key, entry_ids in report.groups.items():
+        tool, error_type = group_key.split('|', 1)
+        yield {
+            "type": "group",
+            "group_key": group_key,
+            "tool": tool,
+            "error_type": error_type,
+            "entry_ids": entry_ids,
+        }
+    for candidate in report.new_pattern_candidates:
+        yield {"type": "new_pattern_candidate", **candidate}
+    for pattern in report.existing_patterns:
+        yield {"type": "existing_pattern", **pattern}
+    for rec in report.recommendations:
+        yield {"type": "recommendation", "text": rec}
+    if report.timings:
+        yield {"type": "timings", **report.timings}
+    yield {
+        "type": "summary",
+        "total_failures": report.total_failures,
+        "patterns_identified": report.patterns_identified,
+        "unpatterned": report.unpatterned,
+        "archived_patterns": report.archived_patterns,
+    }
+
+
+def save_report(
+    report: FailureReport,
+    output_format: str = 'json',
+    compress: bool = False,
+    compact: bool = False
+):
+    """Save report to JSON (or NDJSON) file"""
+    output_path = report_path(OUTPUT_DIR, "failure_analysis_report", output_format, compress)
+
+    if output_format == 'ndjson':
+        write_ndjson(output_path, iter_report_records(report), compress)
+    else:
+        write_json(output_path, asdict(report), compress, compact)
+
+    print(f"\n💾 Report saved to: {output_path}")
+
+# ============================================================
+# Ingestion: append_failure() with a write-through failure index (--append)
+# ============================================================
+DEFAULT_FAILURE_INDEX = os.path.join(SCRIPT_DIR, "failure_index.json")
+FAILURE_INDEX_VERSION = 1
+
+LOG_ENTRIES_HEADING = "## 📝 Log Entries"
+STATISTICS_HEADING = "## 📊 Statistik"
+NEW_FAILURE_LOG = (
+    "# Failure Log\n\n"
+    "Log kegagalan tool/command untuk pembelajaran Agent.\n\n"
+    "---\n\n"
+    f"{LOG_ENTRIES_HEADING}\n\n"
+)
+
+
+@dataclass
+class AppendResult:
+    """Outcome of one append_failure() call"""
+    entry: FailureEntry
+    group_key: str
+    group_size: int
+    fingerprint: str
+    repeats: List[str]              # earlier entries with the same fingerprint
+    candidate: Optional[Dict]       # set when the group is a new pattern candidate
+    crossed_threshold: bool         # this entry brought the group up to the threshold
+    index_rebuilt: bool             # failures.md was edited by hand and had to be re-parsed
+
+
+def index_failure(index: Dict, entry: FailureEntry):
+    """Add one entry to the index's groups, fingerprints and per-tool counters"""
+    group_key = failure_group_key(entry.tool, entry.error)
+    index["groups"].setdefault(group_key, []).append(entry.id)
+    if not entry.pattern_id:
+        index["unpatterned"].setdefault(group_key, []).append(entry.id)
+    index["fingerprints"].setdefault(failure_fingerprint(entry.tool, entry.error), []).append(entry.id)
+    tool = index["tools"].setdefault(entry.tool, {"count": 0, "last": entry.date})
+    tool["count"] += 1
+    tool["last"] = max(tool["last"], entry.date)
+    index["next_id"] = max(index["next_id"], int(entry.id[2:]) + 1)
+
+
+def entries_insert_offset(data: bytes) -> Optional[int]:
+    """
+    Byte offset where the next entry goes: the end of the Log Entries
+    section (start of the next `## ` heading, or end of file).
+    None when the section is missing.
+    """
+    heading = data.find(LOG_ENTRIES_HEADING.encode('utf-8'))
+    if heading < 0:
+        return None
+    next_section = data.find(b'\n## ', heading)
+    return next_section + 1 if next_section >= 0 else len(data)
+
+
+def build_failure_index(data: bytes) -> Dict:
+    """
+    Failure index from a full parse of failures.md.
+    The next ID comes from every `### F-NNN` heading, including entries
+    parse_failure_entries() skips (e.g. a tool name with spaces).
+    """
+    index = {"next_id": 1, "insert_at": entries_insert_offset(data),
+             "groups": {}, "unpatterned": {}, "fingerprints": {}, "tools": {}}
+    for entry in parse_failure_entries(data):
+        index_failure(index, entry)
+    for match in compiled_pattern(r'^### F-(\d+)\b', data, re.MULTILINE).finditer(data):
+        index["next_id"] = max(index["next_id"], int(match.group(1)) + 1)
+    return index
+
+
+def load_failure_index(path: str, stat: Optional[os.stat_result]) -> Optional[Dict]:
+    """
+    Persisted failure index, or None when it no longer describes failures.md
+    (missing, another workspace, or the log's size/mtime changed).
+    """
+    if stat is None:
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if (index.get("version") != FAILURE_INDEX_VERSION or index.get("workspace") != WORKSPACE_DIR
+            or index.get("size") != stat.st_size or index.get("mtime_ns") != stat.st_mtime_ns):
+        return None
+    return index
+
+
+def save_failure_index(path: str, index: Dict, stat: os.stat_result):
+    encoded = json.dumps({
+        **index,
+        "version": FAILURE_INDEX_VERSION,
+        "workspace": WORKSPACE_DIR,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }, separators=(',', ':'), ensure_ascii=False)
+    with open_output(path, compress=False) as f:
+        f.write(encoded)
+
+
+def single_line(value: Optional[str]) -> str:
+    """Entry fields are parsed up to the end of their line"""
+    return re.sub(r'\s*\n\s*', ' ', value or '').strip()
+
+
+def render_failure_entry(entry: FailureEntry) -> str:
+    """
+    One entry in the failures.md format, with its trailing separator.
+    Empty fields are written as '-': the field patterns skip whitespace,
+    so a blank value would capture the next line.
+    """
+    return (
+        f"### {entry.id} | {entry.tool} | {entry.date}\n\n"
+        f"- **Command/Params:** {entry.command or '-'}\n"
+        f"- **Error:** {entry.error or '-'}\n"
+        f"- **Context:** {entry.context or '-'}\n"
+        f"- **Workaround:** {entry.workaround or '-'}\n"
+        f"- **Pattern ID:** {entry.pattern_id or '-'}\n\n"
+        "---\n\n"
+    )
+
+
+def update_statistics(head: str, tool: str, date: str) -> str:
+    """
+    Count one more failure for `tool` in the 📊 Statistik table (a row is
+    added for a new tool). Returned unchanged when there is no table.
+    """
+    section = re.search(
+        rf'{re.escape(STATISTICS_HEADING)}[^\n]*\n(.*?)(?=\n---|\n## |\Z)', head, re.DOTALL
+    )
+    if not section:
+        return head
+    lines = section.group(1).split('\n')
+    table = [i for i, line in enumerate(lines) if line.startswith('|')]
+    rows = [[cell.strip() for cell in lines[i].strip().strip('|').split('|')] for i in table]
+    if len(rows) < 2 or any(len(row) != 3 for row in rows):
+        return head
+
+    header, body = rows[0], rows[2:]
+    for row in body:
+        if row[0] == tool:
+            row[1] = str(int(row[1]) + 1) if row[1].isdigit() else row[1]
+            row[2] = max(row[2], date)
+            break
+    else:
+        body.append([tool, '1', date])
+
+    widths = [max(len(row[i]) for row in [header] + body) for i in range(3)]
+    render = lambda cells: "| " + " | ".join(c.ljust(w) for c, w in zip(cells, widths)) + " |"
+    rendered = [render(header), render(['-' * w for w in widths])] + [render(row) for row in body]
+    lines[table[0]:table[-1] + 1] = rendered
+    return head[:section.start(1)] + '\n'.join(lines) + head[section.end(1):]
+
+
+def append_failure(
+    tool: str,
+    command: str,
+    error: str,
+    context: str,
+    workaround: Optional[str] = None,
+    pattern_id: Optional[str] = None,
+    date: Optional[str] = None,
+    index_path: str = DEFAULT_FAILURE_INDEX,
+    threshold: int = PATTERN_THRESHOLD
+) -> AppendResult:
+    """
+    Append one failure entry to Log/failures.md under the workspace's
+    failure lock (atomic replace) and update the failure index in the
+    same call. The next F-NNN ID, the group, fingerprint and per-tool
+    counters come from the persisted index; failures.md is only re-parsed
+    when it was edited by hand since the last append (size/mtime changed).
+    Raises ValueError for fields the parser could not read back.
+    """
+    if not re.fullmatch(r'\w+', tool or ''):
+        raise ValueError(f"Tool must be a single word (letters, digits, _): {tool!r}")
+    if pattern_id and not re.fullmatch(r'P-\d+', pattern_id):
+        raise ValueError(f"Pattern ID must look like P-NNN: {pattern_id!r}")
+    date = date or datetime.now().strftime('%Y-%m-%d')
+    if not re.fullmatch(r'\d{4}-\d{2}-\d{2}', date):
+        raise ValueError(f"Date must be YYYY-MM-DD: {date!r}")
+
+    with workspace_lock(WORKSPACE_DIR, "failures"):
+        try:
+            with open(FAILURES_FILE, 'rb') as f:
+                data = f.read()
+                stat = os.fstat(f.fileno())
+        except FileNotFoundError:
+            data, stat = NEW_FAILURE_LOG.encode('utf-8'), None
+
+        index = load_failure_index(index_path, stat)
+        rebuilt = index is None
+        if rebuilt:
+            index = build_failure_index(data)
+        insert_at = index["insert_at"]
+        if insert_at is None:
+            data = data.rstrip(b'\n') + f"\n\n{LOG_ENTRIES_HEADING}\n\n".encode('utf-8')
+            insert_at = len(data)
+
+        entry = FailureEntry(
+            id=f"F-{index['next_id']:03d}",
+            tool=tool,
+            date=date,
+            command=single_line(command),
+            error=single_line(error),
+            context=single_line(context),
+            workaround=single_line(workaround) or None,
+            pattern_id=pattern_id
+        )
+
+        # Splice the entry in at the end of the Log Entries section; only
+        # the short head before that section is decoded (statistics table)
+        heading = data.find(LOG_ENTRIES_HEADING.encode('utf-8'), 0, insert_at)
+        head = update_statistics(data[:heading].decode('utf-8'), tool, date).encode('utf-8')
+        body = data[heading:insert_at]
+        if not body.endswith(b'\n\n'):
+            body += b'\n' if body.endswith(b'\n') else b'\n\n'
+        body += render_failure_entry(entry).encode('utf-8')
+
+        os.makedirs(os.path.dirname(FAILURES_FILE), exist_ok=True)
+        temp_path = f"{FAILURES_FILE}.tmp-{os.getpid()}"
+        with open(temp_path, 'wb') as f:
+            f.write(head + body + data[insert_at:])
+        os.replace(temp_path, FAILURES_FILE)
+
+        group_key = failure_group_key(entry.tool, entry.error)
+        fingerprint = failure_fingerprint(entry.tool, entry.error)
+        before = len(index["groups"].get(group_key, []))
+        repeats = list(index["fingerprints"].get(fingerprint, []))
+        index_failure(index, entry)
+        index["insert_at"] = len(head) + len(body)
+        save_failure_index(index_path, index, os.stat(FAILURES_FILE))
+
+    entry_ids = index["groups"][group_key]
+    unpatterned = index["unpatterned"].get(group_key, [])
+    candidate = pattern_candidate(group_key, entry_ids, unpatterned) \
+        if len(entry_ids) >= threshold and unpatterned else None
+    return AppendResult(
+        entry=entry,
+        group_key=group_key,
+        group_size=len(entry_ids),
+        fingerprint=fingerprint,
+        repeats=repeats,
+        candidate=candidate,
+        crossed_threshold=candidate is not None and before < threshold,
+        index_rebuilt=rebuilt
+    )
+
+
+def print_append_result(result: AppendResult, threshold: int = PATTERN_THRESHOLD):
+    """Print the appended entry and any pattern alert"""
+    entry = result.entry
+    print(f"\n📝 Appended {entry.id} | {entry.tool} | {entry.date} to {FAILURES_FILE}")
+    if result.index_rebuilt:
+        print("   (failures.md changed since the last append - failure index rebuilt)")
+    print(f"   • Group: {result.group_key} ({result.group_size} entries)")
+    repeats = f" - repeat of {', '.join(result.repeats)}" if result.repeats else ""
+    print(f"   • Fingerprint: {result.fingerprint}{repeats}")
+
+    c = result.candidate
+    if result.crossed_threshold:
+        print(f"\n🆕 Group reached PATTERN_THRESHOLD ({threshold}): create pattern "
+              f"'{c['suggested_pattern_name']}' for {', '.join(c['unpatterned_ids'])}")
+    elif c:
+        print(f"\n⚠️ Group is above PATTERN_THRESHOLD ({threshold}) with "
+              f"{c['unpatterned_count']} unpatterned entries - '{c['suggested_pattern_name']}'")
+
+
+# ============================================================
+# Fleet mode: map-reduce over many agent workspaces (--fleet)
+# ============================================================
+@dataclass
+class FleetReport:
+    """Failure analysis merged across many agent workspaces"""
+    timestamp: str
+    workspaces: List[Dict]                  # per-agent stats (or error)
+    total_failures: int
+    unpatterned: int
+    tool_counts: Dict[str, int]
+    groups: Dict[str, List[str]]            # group key -> "agent:F-XXX" ids
+    group_agents: Dict[str, Dict[str, int]]  # group key -> {agent: occurrences}
+    pattern_catalog: List[Dict]             # patterns merged by name across agents
+    cross_agent_candidates: List[Dict]
+    recommendations: List[str]
+    timings: Optional[Dict] = None
+
+
+def workspace_labels(paths: List[str]) -> List[str]:
+    """Short unique label per workspace: the folder name, or parent/folder on collisions"""
+    names = []
+    for path in paths:
+        name = os.path.basename(os.path.normpath(path))
+        for suffix in ARCHIVE_SUFFIXES:
+            if name.lower().endswith(suffix):
+                name = name[:-len(suffix)]
+                break
+        names.append(name)
+    labels = []
+    for path, name in zip(paths, names):
+        if names.count(name) > 1:
+            parent = os.path.basename(os.path.dirname(os.path.normpath(path)))
+            name = f"{parent}/{name}"
+        labels.append(name)
+    return labels
+
+
+def map_failure_log(job: Tuple[str, str]) -> Dict:
+    """
+    Map step (runs in a worker process): parse one workspace's failure log
+    into a small, picklable partial result.
+    """
+    label, path = job
+    result = {"agent": label, "path": path, "error": None}
+    with ExitStack() as log:
+        try:
+            fs = open_workspace(path)
+            log.callback(fs.close)
+            content = log.enter_context(fs.map_text(os.path.join(path, "Log", "failures.md")))
+        except (OSError, KeyError, UnicodeDecodeError) as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            return result
+
+        entries = parse_failure_entries(content)
+        patterns = parse_existing_patterns(content)
+
+    groups = group_failures(entries)
+    unpatterned_ids = {e.id for e in entries if not e.pattern_id}
+    result.update({
+        "failures": len(entries),
+        "unpatterned": len(unpatterned_ids),
+        "tools": dict(Counter(e.tool for e in entries)),
+        "groups": groups,
+        "unpatterned_by_group": {
+            key: [eid for eid in ids if eid in unpatterned_ids] for key, ids in groups.items()
+        },
+        "patterns": patterns,
+    })
+    return result
+
+
+def reduce_failure_logs(partials: List[Dict], threshold: int = PATTERN_THRESHOLD) -> Dict:
+    """
+    Reduce step: merge group maps, tool counters and pattern catalogs,
+    then find groups that only reach `threshold` when agents are combined.
+    """
+    tools = Counter()
+    groups = defaultdict(list)
+    group_agents = defaultdict(dict)
+    unpatterned_groups = defaultdict(list)
+    catalog: Dict[str, Dict] = {}
+
+    for part in partials:
+        if part["error"]:
+            continue
+        agent = part["agent"]
+        tools.update(part["tools"])
+        for key, ids in part["groups"].items():
+            groups[key].extend(f"{agent}:{eid}" for eid in ids)
+            group_agents[key][agent] = len(ids)
+            unpatterned_groups[key].extend(f"{agent}:{eid}" for eid in part["unpatterned_by_group"][key])
+        for pattern in part["patterns"]:
+            entry = catalog.setdefault(pattern["name"].lower(), {
+                "name": pattern["name"], "agents": {}, "occurrences": 0
+            })
+            entry["agents"][agent] = pattern["id"]
+            entry["occurrences"] += pattern["occurrences"]
+
+    cross_agent = []
+    for key, agents in group_agents.items():
+        total = sum(agents.values())
+        if total < threshold or max(agents.values()) >= threshold or not unpatterned_groups[key]:
+            continue
+        tool, error_type = key.split('|', 1)
+        cross_agent.append({
+            "group_key": key,
+            "tool": tool,
+            "error_type": error_type,
+            "total_occurrences": total,
+            "agents": dict(sorted(agents.items())),
+            "unpatterned_count": len(unpatterned_groups[key]),
+            "unpatterned_ids": unpatterned_groups[key],
+            "suggested_pattern_name": f"{tool.title()} {error_type.replace('_', ' ').title()}"
+        })
+    cross_agent.sort(key=lambda c: (-c["total_occurrences"], c["group_key"]))
+
+    return {
+        "tool_counts": dict(tools.most_common()),
+        "groups": dict(groups),
+        "group_agents": dict(group_agents),
+        "pattern_catalog": sorted(catalog.values(), key=lambda p: (-len(p["agents"]), p["name"])),
+        "cross_agent_candidates": cross_agent,
+    }
+
+
+def analyze_fleet(
+    paths: List[str],
+    jobs: Optional[int] = None,
+    profiler: Optional[StageProfiler] = None
+) -> FleetReport:
+    """
+    Analyze the failure logs of many workspaces (folders or archives).
+    Logs are parsed in a process pool (map) and merged in this process (reduce).
+    """
+    profiler = profiler or StageProfiler()
+    labels = workspace_labels(paths)
+
+    print("\n" + "="*60)
+    print("📊 FAILURE PATTERN ANALYZER (fleet)")
+    print("="*60)
+
+    profiler.start()
+    try:
+        print(f"\n1️⃣ Parsing {len(paths)} failure logs...")
+        with profiler.stage("map"):
+            work = list(zip(labels, paths))
+            if jobs == 1 or len(work) <= 1:
+                partials = [map_failure_log(job) for job in work]
+            else:
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    partials = list(pool.map(map_failure_log, work, chunksize=max(1, len(work) // 32)))
+        for part in partials:
+            if part["error"]:
+                print(f"   ⚠️ {part['agent']}: {part['error']}")
+
+        print("\n2️⃣ Merging groups, tool counts and pattern catalogs...")
+        with profiler.stage("reduce"):
+            merged = reduce_failure_logs(partials)
+        print(f"   {len(merged['groups'])} groups, "
+              f"{len(merged['cross_agent_candidates'])} cross-agent pattern candidates")
+    finally:
+        profiler.stop()
+
+    ok = [p for p in partials if not p["error"]]
+    workspaces = [
+        {"agent": p["agent"], "path": p["path"], "error": p["error"]} if p["error"] else {
+            "agent": p["agent"], "path": p["path"], "failures": p["failures"],
+            "unpatterned": p["unpatterned"], "patterns": len(p["patterns"]),
+        }
+        for p in partials
+    ]
+
+    recommendations = []
+    for c in merged["cross_agent_candidates"][:5]:
+        recommendations.append(
+            f"🌐 Create fleet pattern: {c['suggested_pattern_name']} "
+            f"({c['total_occurrences']} occurrences across {len(c['agents'])} agents)"
+        )
+    shared = [p for p in merged["pattern_catalog"] if len(p["agents"]) > 1]
+    if shared:
+        recommendations.append(
+            f"🔁 {len(shared)} pattern(s) are defined separately by several agents - consider a shared catalog"
+        )
+    if not recommendations:
+        recommendations.append("✅ No cross-agent patterns found")
+
+    return FleetReport(
+        timestamp=datetime.now().isoformat(),
+        workspaces=workspaces,
+        total_failures=sum(p["failures"] for p in ok),
+        unpatterned=sum(p["unpatterned"] for p in ok),
+        tool_counts=merged["tool_counts"],
+        groups=merged["groups"],
+        group_agents=merged["group_agents"],
+        pattern_catalog=merged["pattern_catalog"],
+        cross_agent_candidates=merged["cross_agent_candidates"],
+        recommendations=recommendations,
+        timings=profiler.timings()
+    )
+
+
+def print_fleet_report(report: FleetReport):
+    """Print the merged fleet report"""
     print("\n" + "="*60)
+    print("📊 FLEET FAILURE REPORT")
+    print("="*60)
+
+    print(f"\n📈 Statistics:")
+    print(f"   • Workspaces: {len(report.workspaces)}")
+    print(f"   • Total Failures: {report.total_failures}")
+    print(f"   • Unpatterned: {report.unpatterned}")
+    print(f"   • Failure Groups: {len(report.groups)}")
+
+    print(f"\n🛠️ Failures per Tool:")
+    for tool, count in report.tool_counts.items():
+        print(f"   • {tool}: {count}")
+
+    if report.cross_agent_candidates:
+        print(f"\n🌐 Cross-Agent Pattern Candidates ({len(report.cross_agent_candidates)}):")
+        for c in report.cross_agent_candidates[:10]:
+            spread = ", ".join(f"{agent}×{n}" for agent, n in c['agents'].items())
+            print(f"   • {c['suggested_pattern_name']}: {c['total_occurrences']} ({spread})")
+        if len(report.cross_agent_candidates) > 10:
+            print(f"   ... and {len(report.cross_agent_candidates) - 10} more")
+    else:
+        print(f"\n🌐 Cross-Agent Pattern Candidates: (none)")
+
+    print(f"\n💡 Recommendations:")
+    for rec in report.recommendations:
+        print(f"   {rec}")
 
+    print_timings(report.timings)
 
-def save_report(report: FailureReport):
-    """Save report to JSON file"""
-    output_path = os.path.join(OUTPUT_DIR, "failure_analysis_report.json")
+    print("\n" + "="*60)
 
-    report_dict = asdict(report)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(report_dict, f, indent=2, ensure_ascii=False)
+
+def save_fleet_report(
+    report: FleetReport,
+    output_format: str = 'json',
+    compress: bool = False,
+    compact: bool = False
+):
+    """Save the fleet report to JSON (or NDJSON) file."""
+    output_path = report_path(OUTPUT_DIR, "failure_fleet_report", output_format, compress)
+
+    if output_format == 'ndjson':
+        def records():
+            yield {"type": "meta", "report": "failure_fleet", "format_version": NDJSON_FORMAT_VERSION,
+                   "timestamp": report.timestamp}
+            for workspace in report.workspaces:
+                yield {"type": "workspace", **workspace}
+            for key, ids in report.groups.items():
+                yield {"type": "group", "group_key": key, "agents": report.group_agents[key], "entry_ids": ids}
+            for pattern in report.pattern_catalog:
+                yield {"type": "pattern", **pattern}
+            for candidate in report.cross_agent_candidates:
+                yield {"type": "cross_agent_candidate", **candidate}
+            for rec in report.recommendations:
+                yield {"type": "recommendation", "text": rec}
+            if report.timings:
+                yield {"type": "timings", **report.timings}
+            yield {"type": "summary", "workspaces": len(report.workspaces),
+                   "total_failures": report.total_failures, "unpatterned": report.unpatterned,
+                   "tool_counts": report.tool_counts}
+        write_ndjson(output_path, records(), compress)
+    else:
+        write_json(output_path, asdict(report), compress, compact)
 
     print(f"\n💾 Report saved to: {output_path}")
 
+
 # ============================================================
 if __name__ == "__main__":
-    report = analyze_failures()
+    parser = argparse.ArgumentParser(description="Analyze failure patterns in Log/failures.md")
+    add_profile_arguments(parser)
+    add_output_arguments(parser)
+    add_workspace_arguments(parser)
+    parser.add_argument('--fleet', nargs='+', metavar='WORKSPACE',
+                        help="Analyze many agent workspaces (folders or archives) together")
+    parser.add_argument('--jobs', type=int, default=None, metavar='N',
+                        help="Worker processes for --fleet (default: CPU count)")
+    add_catalog_arguments(parser)
+    append = parser.add_argument_group("append a failure entry (instead of analyzing)")
+    append.add_argument('--append', metavar='TOOL',
+                        help="Append a failure for TOOL to Log/failures.md and report its group")
+    append.add_argument('--command', help="--append: command / parameters that failed")
+    append.add_argument('--error', help="--append: error message (required)")
+    append.add_argument('--context', help="--append: what was being done")
+    append.add_argument('--workaround', help="--append: workaround, if known")
+    append.add_argument('--pattern-id', metavar='P-NNN', help="--append: known pattern of this failure")
+    append.add_argument('--date', metavar='YYYY-MM-DD', help="--append: failure date (default: today)")
+    append.add_argument('--failure-index', default=DEFAULT_FAILURE_INDEX, metavar='PATH',
+                        help="--append: persisted IDs / groups / counters "
+                             f"(default: {os.path.relpath(DEFAULT_FAILURE_INDEX)})")
+    args = parser.parse_args()
+    if args.fleet and args.catalog:
+        parser.error("--catalog mirrors a single workspace and cannot be combined with --fleet")
+    entry_fields = [args.command, args.error, args.context, args.workaround, args.pattern_id, args.date]
+    if args.append is None and any(value is not None for value in entry_fields):
+        parser.error("--command / --error / --context / --workaround / --pattern-id / --date need --append")
+
+    if args.append is not None:
+        if args.fleet or args.catalog or WORKSPACE_FS.read_only:
+            parser.error("--append writes one workspace folder (not --fleet, --catalog or an archive)")
+        if not args.error:
+            parser.error("--append needs --error")
+        try:
+            result = append_failure(
+                args.append, args.command, args.error, args.context, args.workaround,
+                args.pattern_id, args.date, args.failure_index
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        print_append_result(result)
+        exit(0)
+
+    profiler = profiler_from_args(args)
+    if args.fleet:
+        fleet_report = analyze_fleet([os.path.abspath(p) for p in args.fleet], args.jobs, profiler)
+        print_fleet_report(fleet_report)
+        save_fleet_report(fleet_report, args.output_format, args.gzip, args.compact)
+        finish_profiling(profiler, args)
+        exit(0)
+
+    catalog = WorkspaceCatalog(args.catalog) if args.catalog else None
+    try:
+        report = analyze_failures(profiler, catalog)
+    finally:
+        if catalog:
+            catalog.close()
     if report:
         print_report(report)
-        save_report(report)
+        if catalog:
+            print_catalog_stats(catalog)
+        save_report(report, args.output_format, args.gzip, args.compact)
+        finish_profiling(profiler, args)
@@ -0,0 +1,162 @@
+"""
+Fuzzy Index
+============
+Trigram index untuk mencari string terdekat berdasarkan edit distance (Levenshtein).
+
+Dipakai oleh document_health_analyzer.py untuk menyarankan target yang
+kemungkinan dimaksud oleh broken link.
+
+Fitur:
+1. Index dibangun sekali dari semua key (nama file, judul dokumen)
+2. Positional q-gram: trigram disimpan bersama posisinya. String dengan edit
+   distance <= k kehilangan maksimal 3k trigram dan sisanya bergeser paling
+   jauh k posisi, jadi yang cocok harus berbagi >= max(len) + 1 - 3k trigram
+   pada posisi yang berdekatan (count filter)
+3. ScanCount: kandidat dihitung dari posting list 3k+1 trigram paling jarang
+   (prefix filter), trigram lainnya hanya menambah hitungan kandidat yang
+   masih bisa lolos; edit distance (banded, berhenti begitu melewati k) hanya
+   dihitung untuk kandidat yang lolos count filter
+4. Satu key bisa menunjuk ke beberapa value (mis. nama file sama di folder berbeda)
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+from collections import Counter
+from typing import Dict, List, Set, Tuple, Optional, Any
+
+
+# ============================================================
+def levenshtein(a: str, b: str, limit: Optional[int] = None) -> int:
+    """
+    Edit distance between a and b.
+    With `limit`, returns limit + 1 as soon as the distance is known to exceed it.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+
+    if limit is None:
+        limit = len(a)
+    # Only cells within `limit` of the diagonal can stay <= limit
+    outside = limit + 1
+    previous = [j if j <= limit else outside for j in range(len(b) + 1)]
+    for i, ca in enumerate(a, 1):
+        low = max(1, i - limit)
+        high = min(len(b), i + limit)
+        current = [outside] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        best = current[0]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < best:
+                best = cost
+        if best > limit:
+            return outside
+        previous = current
+    return min(previous[-1], outside)
+
+
+def trigrams(key: str) -> List[Tuple[int, str]]:
+    """
+    Padded positional trigrams [(position, gram), ...], so short keys still
+    get grams at both ends. A key of length n has n + 1 of them.
+    """
+    padded = f"$${key}$"
+    return [(i, padded[i:i + 3]) for i in range(len(padded) - 2)]
+
+
+class TrigramIndex:
+    """Inverted index (trigram, position) -> key ids, with edit-distance lookups"""
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.values: Dict[str, List[Any]] = {}
+        self.postings: Dict[str, Dict[int, Set[int]]] = {}
+        self.frequency: Counter = Counter()          # gram -> number of positions holding it
+
+    def add(self, key: str, value: Any):
+        if key not in self.values:
+            self.values[key] = []
+            key_id = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+            grams = trigrams(key)
+            for position, gram in grams:
+                by_position = self.postings.setdefault(gram, {})
+                if position in by_position:
+                    by_position[position].add(key_id)
+                else:
+                    by_position[position] = {key_id}
+            self.frequency.update(gram for _, gram in grams)
+        if value not in self.values[key]:
+            self.values[key].append(value)
+
+    def search(self, key: str, radius: int) -> List[Tuple[int, str, List[Any]]]:
+        """
+        All keys within `radius` edits of `key`.
+        Returns: [(distance, key, values), ...] sorted by distance, then key
+        """
+        # Each edit destroys at most 3 grams and shifts the others by at most
+        # one position, so a match keeps >= max(len) + 1 - 3r grams within r
+        # positions of where they are in the query (positional count filter)
+        required = len(key) + 1 - 3 * radius
+        counts: Counter = Counter()
+        if required > 0:
+            grams = sorted(trigrams(key), key=lambda item: self.frequency[item[1]])
+
+            def window(position: int, gram: str) -> List[Set[int]]:
+                """Keys holding `gram` at most `radius` positions away from `position`"""
+                by_position = self.postings.get(gram, {})
+                return [by_position[shifted] for shifted in range(position - radius, position + radius + 1)
+                        if shifted in by_position]
+
+            # ScanCount over the 3r + 1 rarest grams: a match has to keep one of them
+            prefix = len(grams) - required + 1
+            for position, gram in grams[:prefix]:
+                for ids in window(position, gram):
+                    counts.update(ids)
+            # The other grams only add to the counts of candidates that can still reach `required`
+            live = set(counts)
+            rest = grams[prefix:]
+            for index, (position, gram) in enumerate(rest):
+                # Candidates below `needed` cannot reach `required` with the grams left
+                needed = required - (len(rest) - index)
+                if needed > 1:
+                    live = {i for i in live if counts[i] >= needed}
+                    if not live:
+                        break
+                for ids in window(position, gram):
+                    counts.update(live.intersection(ids))
+            candidates = [self.keys[i] for i, count in counts.items() if count >= required]
+        else:
+            candidates = self.keys
+
+        matches = []
+        for candidate in candidates:
+            if abs(len(candidate) - len(key)) > radius:
+                continue
+            if required > 0 and counts[self.ids[candidate]] < max(len(candidate), len(key)) + 1 - 3 * radius:
+                continue
+            distance = levenshtein(key, candidate, radius)
+            if distance <= radius:
+                matches.append((distance, candidate, self.values[candidate]))
+        return sorted(matches, key=lambda m: (m[0], m[1]))
+
+
+def build_index(entries: Dict[str, List[Any]]) -> TrigramIndex:
+    """Build a trigram index from {key: [values]}"""
+    index = TrigramIndex()
+    for key in sorted(entries):
+        for value in entries[key]:
+            index.add(key, value)
+    return index
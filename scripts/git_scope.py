@@ -0,0 +1,189 @@
+"""
+Git Scope
+==========
+Batasi analisis ke file workspace yang berubah menurut git, supaya
+pre-commit hook tidak perlu menganalisis ulang seluruh workspace.
+
+Dipakai oleh document_health_analyzer.py dan auto_index_updater.py
+(--staged / --changed-since REV).
+
+Fitur:
+1. changed_paths() - Daftar file yang berubah dari `git diff --name-only`:
+   --staged membandingkan index dengan HEAD, --changed-since REV membandingkan
+   working tree dengan REV (ditambah file untracked)
+2. Rename dilaporkan sebagai hapus + tambah (--no-renames), jadi link ke
+   nama lama ikut diperiksa
+3. previous_contents() - Isi file di base revision (satu proses
+   `git cat-file --batch`), untuk link yang dihapus oleh perubahan
+4. BacklinkIndex - Link keluar per dokumen disimpan di
+   scripts/backlink_index.json dan di-refresh per file berdasarkan
+   mtime/size, jadi "siapa yang me-link file ini" dijawab tanpa parse
+   ulang seluruh workspace
+
+Isi dokumen tetap dibaca dari working tree.
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import json
+import subprocess
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from report_writer import open_output
+from workspace_fs import GitBlobReader
+
+# ============================================================
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BACKLINK_INDEX = os.path.join(SCRIPT_DIR, "backlink_index.json")
+BACKLINK_INDEX_VERSION = 1
+
+# Links are stored as [text, target] pairs, exactly as the analyzer parsed them
+Links = List[Tuple[str, str]]
+
+
+def add_scope_arguments(parser):
+    """Register --staged / --changed-since on an analyzer's argument parser"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--staged', action='store_true',
+                       help="Only analyze files staged for commit (pre-commit hook)")
+    group.add_argument('--changed-since', metavar='REV',
+                       help="Only analyze files changed since git revision REV (plus untracked files)")
+
+
+def scope_base(args) -> Optional[str]:
+    """Revision the scoped run compares against, or None for a full run"""
+    if args.staged:
+        return 'HEAD'
+    return args.changed_since
+
+
+def _git_paths(workspace: str, *args: str) -> List[str]:
+    output = subprocess.run(
+        ['git', '-C', workspace, *args], check=True, capture_output=True
+    ).stdout
+    return [p.decode('utf-8') for p in output.split(b'\0') if p]
+
+
+def changed_paths(workspace: str, staged: bool = False, since: Optional[str] = None) -> Set[str]:
+    """
+    Workspace-relative paths changed in git (added, modified or deleted).
+    Raises subprocess.CalledProcessError outside a git repository or for
+    an unknown revision.
+    """
+    diff = ['diff', '--name-only', '-z', '--no-renames', '--relative']
+    if staged:
+        paths = set(_git_paths(workspace, *diff, '--cached', '--', '.'))
+    else:
+        paths = set(_git_paths(workspace, *diff, since or 'HEAD', '--', '.'))
+        paths.update(_git_paths(workspace, 'ls-files', '--others', '--exclude-standard', '-z', '--', '.'))
+    return paths
+
+
+def previous_contents(workspace: str, base: str, rel_paths: Iterable[str]) -> Dict[str, str]:
+    """
+    Text of each path at revision `base` (paths missing there are skipped).
+    """
+    reader = GitBlobReader(workspace)
+    contents = {}
+    try:
+        for rel_path in rel_paths:
+            try:
+                contents[rel_path] = reader.read(f"{base}:./{rel_path}").decode('utf-8')
+            except (FileNotFoundError, UnicodeDecodeError):
+                continue
+    finally:
+        reader.close()
+    return contents
+
+
+# ============================================================
+class BacklinkIndex:
+    """
+    Persisted outgoing links per document, keyed by workspace-relative path.
+    Backlinks are looked up by target basename, the same way the health
+    rules resolve links.
+    """
+
+    def __init__(self, workspace: str, documents: Optional[Dict[str, Dict]] = None):
+        self.workspace = workspace
+        self.documents: Dict[str, Dict] = documents or {}
+        self.dirty = False
+        self._backlinks: Optional[Dict[str, Set[str]]] = None
+
+    @classmethod
+    def load(cls, path: str, workspace: str) -> 'BacklinkIndex':
+        """Load the index for `workspace` (empty if missing, outdated or for another workspace)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls(workspace)
+        if data.get("version") != BACKLINK_INDEX_VERSION or data.get("workspace") != workspace:
+            return cls(workspace)
+        return cls(workspace, data["documents"])
+
+    def save(self, path: str):
+        # json.dumps runs entirely in the C encoder; json.dump writes chunk by chunk
+        encoded = json.dumps({
+            "version": BACKLINK_INDEX_VERSION,
+            "workspace": self.workspace,
+            "documents": self.documents,
+        }, separators=(',', ':'), ensure_ascii=False)
+        with open_output(path, compress=False) as f:
+            f.write(encoded)
+        self.dirty = False
+
+    def refresh(self, all_files: Dict[str, str], extract: Callable[[str], Links]) -> Tuple[int, int]:
+        """
+        Re-parse documents whose size or mtime changed and drop deleted ones.
+        `extract` maps an absolute path to its links.
+        Returns: (updated, removed)
+        """
+        updated = 0
+        for rel_path, abs_path in all_files.items():
+            try:
+                stat = os.stat(abs_path)
+            except OSError:
+                continue
+            entry = self.documents.get(rel_path)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                continue
+            self.documents[rel_path] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "links": [list(link) for link in extract(abs_path)],
+            }
+            updated += 1
+
+        removed = [rel_path for rel_path in self.documents if rel_path not in all_files]
+        for rel_path in removed:
+            del self.documents[rel_path]
+
+        if updated or removed:
+            self.dirty = True
+            self._backlinks = None
+        return updated, len(removed)
+
+    def links(self, rel_path: str) -> Links:
+        entry = self.documents.get(rel_path)
+        return [tuple(link) for link in entry["links"]] if entry else []
+
+    def _backlink_map(self) -> Dict[str, Set[str]]:
+        """target basename -> linking documents (built on first use)"""
+        if self._backlinks is None:
+            self._backlinks = defaultdict(set)
+            for rel_path, entry in self.documents.items():
+                for _, target in entry["links"]:
+                    self._backlinks[os.path.basename(target)].add(rel_path)
+        return self._backlinks
+
+    def backlinks(self, basename: str) -> Set[str]:
+        """Documents with a link whose target basename is `basename`"""
+        return self._backlink_map().get(basename, set())
+
+    def referenced_basenames(self) -> Set[str]:
+        """Every link target basename in the workspace"""
+        return set(self._backlink_map())
@@ -0,0 +1,319 @@
+"""
+Health Approximate
+===================
+Mode --approximate untuk document_health_analyzer.py: estimasi health score
+dari sampel acak, untuk workspace yang terlalu besar untuk dianalisis penuh.
+
+Fitur:
+1. Stratified sampling - Strata = folder workspace, alokasi proporsional
+   (minimal 2 dokumen per stratum); sampel digandakan setiap round
+2. Index file selalu di-parse penuh (certainty stratum), jadi missing from
+   index dihitung exact
+3. Broken link - Exact untuk index file + estimasi stratified (dengan finite
+   population correction) untuk dokumen lainnya
+4. Orphan - Jumlah file yang direferensikan diestimasi dengan Good-Toulmin
+   (fraksi sampling diketahui, tidak bias seperti Chao2), dengan variance
+   yang melebar selama kurang dari separuh dokumen tersampel
+5. Berhenti saat confidence interval skor sudah dalam ±--precision, time
+   budget (--approx-budget-ms) habis, atau semua dokumen sudah di-parse
+6. Hasil berupa estimasi ± error per metrik (HealthReport.estimates)
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import time
+import random
+from collections import defaultdict
+from datetime import datetime
+from statistics import NormalDist
+from typing import Dict, List, Optional, Set, Tuple
+
+import document_health_analyzer as analyzer
+from document_health_analyzer import (
+    BrokenLinkRule, HealthReport, HealthRule, IndexCoverageRule, OrphanFileRule,
+    get_all_md_files, parse_document, run_rules
+)
+from stage_profiler import StageProfiler
+
+# ============================================================
+APPROX_INITIAL_SAMPLE = 200        # documents in the first round (doubles each round)
+APPROX_PRECISION = 2.0             # target ± half-width of the health score CI
+APPROX_CONFIDENCE = 0.95
+
+
+def add_approximate_arguments(parser):
+    """Register --approximate and its sampling options on the analyzer's argument parser"""
+    parser.add_argument('--approximate', action='store_true',
+                        help="Estimate the score from a growing stratified sample (for huge workspaces)")
+    parser.add_argument('--precision', type=float, default=APPROX_PRECISION, metavar='P',
+                        help=f"--approximate: stop once the score is within ±P points (default: {APPROX_PRECISION})")
+    parser.add_argument('--approx-budget-ms', type=float, metavar='MS',
+                        help="--approximate: stop sampling after MS milliseconds")
+    parser.add_argument('--seed', type=int, default=0, help="--approximate: sampling seed (default: 0)")
+
+
+class ReferenceSampleRule(HealthRule):
+    """Per-document set of referenced files (internal to --approximate)"""
+    name = "sampled_references"
+
+    def start(self, ctx):
+        self.references = defaultdict(set)
+
+    def on_document(self, doc, ctx):
+        self.references[doc.rel_path]  # documents without links still count
+
+    def on_link(self, doc, link_text, link_target, ctx):
+        # Same resolution as OrphanFileRule
+        target_basename = os.path.basename(link_target)
+        target = ctx.all_file_names.get(target_basename)
+        # Index files are never orphans, so they don't count as referenced
+        if target and 'index' not in os.path.basename(target).lower():
+            self.references[doc.rel_path].add(target)
+
+    def finish(self, ctx):
+        return dict(self.references)
+
+
+def stratified_total(strata: Dict[str, Tuple[int, List[float]]]) -> Tuple[float, float]:
+    """
+    Estimate a population total from a stratified random sample.
+    strata: {name: (population size N_h, sampled values)}
+    Returns: (total, variance) with finite population correction
+    """
+    total = 0.0
+    variance = 0.0
+    for size, values in strata.values():
+        n = len(values)
+        if n == 0:
+            continue
+        mean = sum(values) / n
+        total += size * mean
+        if n > 1 and n < size:
+            s2 = sum((v - mean) ** 2 for v in values) / (n - 1)
+            variance += size * size * (1 - n / size) * s2 / n
+    return total, variance
+
+
+def good_toulmin_richness(incidence: List[Set[str]], population: int) -> Tuple[float, float]:
+    """
+    Good-Toulmin estimate of how many distinct files are referenced by the
+    whole population of `population` documents, from the reference sets of
+    a random sample of them. With sampling fraction p, a file referenced by
+    K documents is missed with probability (1 - p)^K; for t = (1 - p) / p,
+    -sum((-t)^k * q_k) over the files seen in exactly k sampled documents is
+    an unbiased estimate of the files missed. Chao2 is a lower bound and
+    underestimates them, which inflated the orphan count.
+    The variance (sum(t^2k * q_k) + missed) is unbiased under independent
+    inclusion and conservative without replacement; it grows fast while less
+    than half of the documents are sampled (t > 1), so the interval stays wide
+    until the estimate can be trusted.
+    Returns: (estimate, variance)
+    """
+    m = len(incidence)
+    counts = defaultdict(int)
+    for refs in incidence:
+        for target in refs:
+            counts[target] += 1
+    observed = len(counts)
+    if m == 0 or m >= population:
+        return float(observed), 0.0
+
+    t = (population - m) / m
+    frequencies = defaultdict(int)
+    for count in counts.values():
+        frequencies[count] += 1
+    unseen = max(0.0, -sum((-t) ** k * q for k, q in frequencies.items()))
+    variance = sum(t ** (2 * k) * q for k, q in frequencies.items()) + unseen
+    return observed + unseen, variance
+
+
+def describe_estimate(value: float, variance: float, z: float, scale: float = 1.0) -> Dict[str, float]:
+    error = z * variance ** 0.5 * scale
+    value *= scale
+    return {
+        "estimate": round(value, 3),
+        "error": round(error, 3),
+        "low": round(value - error, 3),
+        "high": round(value + error, 3),
+    }
+
+
+def analyze_approximate_health(
+    precision: float = APPROX_PRECISION,
+    budget_ms: Optional[float] = None,
+    seed: int = 0,
+    confidence: float = APPROX_CONFIDENCE,
+    profiler: Optional[StageProfiler] = None
+) -> HealthReport:
+    """
+    Estimate the health score from a stratified random sample (strata =
+    TARGET_FOLDERS). The sample doubles each round until the score's
+    confidence interval is within ±precision, the time budget is spent,
+    or every document has been parsed.
+
+    Index files are few and link to most of their folder, so they are always
+    parsed in full (a certainty stratum) and only regular documents are sampled:
+
+    - missing from index: exact, it only needs index files and names
+    - broken links: exact for index files + stratified estimate for the rest
+    - orphans: files referenced from index files are known exactly; Good-Toulmin
+      estimates how many more are referenced from the regular documents
+    """
+    profiler = profiler or StageProfiler()
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    print("\n" + "="*60)
+    print("📋 DOCUMENT HEALTH ANALYZER (approximate)")
+    print("="*60)
+
+    profiler.start()
+    try:
+        print("\n1️⃣ Scanning workspace...")
+        with profiler.stage("scan"):
+            all_files = get_all_md_files(analyzer.WORKSPACE_DIR)
+            index_docs = [p for p in sorted(all_files) if 'index' in os.path.basename(p).lower()]
+            strata = defaultdict(list)
+            for rel_path in sorted(all_files):
+                if 'index' not in os.path.basename(rel_path).lower():
+                    strata[rel_path.split('/')[0]].append(rel_path)
+            for paths in strata.values():
+                rng.shuffle(paths)
+        population = len(all_files)
+        sample_population = population - len(index_docs)
+        print(f"   Found {population} markdown files, {len(index_docs)} index files + {len(strata)} strata")
+
+        print("\n2️⃣ Checking index files (exact)...")
+        with profiler.stage("index"):
+            rules = [IndexCoverageRule(), BrokenLinkRule(suggestions=0), ReferenceSampleRule()]
+            findings, _ = run_rules(all_files, rules, documents=index_docs)
+            missing_from_index = findings['missing_from_index']
+            sampled_broken: List[Dict] = list(findings['broken_links'])
+            index_broken = len(sampled_broken)
+            index_referenced = set().union(*findings['sampled_references'].values())
+        print(f"   {len(missing_from_index)} files missing from index, "
+              f"{index_broken} broken links, {len(index_referenced)} files referenced")
+
+        print(f"\n3️⃣ Sampling until ±{precision} score points ({confidence:.0%} confidence)...")
+        taken = {folder: 0 for folder in strata}
+        broken_by_doc: Dict[str, int] = {}
+        references: Dict[str, Set[str]] = {}
+        eligible = sample_population
+        target = min(APPROX_INITIAL_SAMPLE, sample_population)
+        rounds = 0
+        stop_reason = "complete"
+
+        while True:
+            rounds += 1
+            with profiler.stage(f"sample_{rounds}"):
+                batch = []
+                for folder, paths in strata.items():
+                    # Proportional allocation, at least 2 per stratum for a variance
+                    want = max(min(2, len(paths)), round(target * len(paths) / sample_population))
+                    batch.extend(paths[taken[folder]:want])
+                    taken[folder] = max(taken[folder], min(want, len(paths)))
+
+                rules = [BrokenLinkRule(suggestions=0), ReferenceSampleRule()]
+                findings, _ = run_rules(all_files, rules, profiler.track_files(parse_document, analyzer.WORKSPACE_DIR), batch)
+                for rel_path in batch:
+                    broken_by_doc[rel_path] = 0
+                for item in findings['broken_links']:
+                    broken_by_doc[item['source_file']] += 1
+                sampled_broken.extend(findings['broken_links'])
+                for rel_path, refs in findings['sampled_references'].items():
+                    references[rel_path] = refs - index_referenced
+
+                broken_total, broken_var = stratified_total({
+                    folder: (len(paths), [broken_by_doc[p] for p in paths[:taken[folder]]])
+                    for folder, paths in strata.items()
+                })
+                broken_total += index_broken
+                referenced, referenced_var = good_toulmin_richness(list(references.values()), sample_population)
+                referenced = min(referenced + len(index_referenced), eligible)
+                orphan_total = max(0.0, eligible - referenced)
+
+                rates = {
+                    "broken": min(broken_total / population, 1.0) if population else 0.0,
+                    "orphan": orphan_total / population if population else 0.0,
+                    "missing": len(missing_from_index) / population if population else 0.0,
+                }
+                score = 100 - 100 * (
+                    BrokenLinkRule.weight * rates["broken"]
+                    + OrphanFileRule.weight * rates["orphan"]
+                    + IndexCoverageRule.weight * rates["missing"]
+                )
+                score_var = (100 / population) ** 2 * (
+                    BrokenLinkRule.weight ** 2 * broken_var + OrphanFileRule.weight ** 2 * referenced_var
+                ) if population else 0.0
+                half_width = z * score_var ** 0.5
+
+            sampled = len(index_docs) + sum(taken.values())
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"   • round {rounds}: {sampled}/{population} docs, score {score:.1f} ± {half_width:.1f}")
+
+            if sampled >= population:
+                stop_reason = "complete"
+                break
+            if half_width <= precision:
+                stop_reason = "precision"
+                break
+            if budget_ms is not None and elapsed_ms >= budget_ms:
+                stop_reason = "budget"
+                break
+            target = min(target * 2, sample_population)
+    finally:
+        profiler.stop()
+
+    estimates = {
+        "confidence": confidence,
+        "population": population,
+        "sampled": sampled,
+        "rounds": rounds,
+        "stop_reason": stop_reason,
+        "health_score": describe_estimate(max(0.0, score), score_var, z),
+        "broken_links": describe_estimate(broken_total, broken_var, z),
+        "orphan_files": describe_estimate(orphan_total, referenced_var, z),
+        "broken_link_rate": describe_estimate(broken_total, broken_var, z, 1 / population if population else 0),
+        "orphan_rate": describe_estimate(orphan_total, referenced_var, z, 1 / population if population else 0),
+        "missing_index_rate": describe_estimate(len(missing_from_index), 0.0, z, 1 / population if population else 0),
+    }
+
+    summary = {
+        "total_files": population,
+        "sampled_files": sampled,
+        "broken_links": round(broken_total),
+        "orphan_files": round(orphan_total),
+        "missing_from_index": len(missing_from_index),
+    }
+    recommendations = [
+        f"📐 Estimated from {sampled}/{population} documents ({stop_reason}); "
+        f"run without --approximate for the exact lists"
+    ]
+    if broken_total >= 1:
+        recommendations.append(f"🔗 About {round(broken_total)} broken link(s) (±{estimates['broken_links']['error']:.0f})")
+    if orphan_total >= 1:
+        recommendations.append(f"📄 About {round(orphan_total)} orphan file(s) (±{estimates['orphan_files']['error']:.0f})")
+    if missing_from_index:
+        folders = set(m['folder'] for m in missing_from_index)
+        recommendations.append(
+            f"📋 Update index.md in {len(folders)} folder(s) - {len(missing_from_index)} file(s) not listed"
+        )
+
+    return HealthReport(
+        timestamp=datetime.now().isoformat(),
+        total_files=population,
+        broken_links=sampled_broken,
+        orphan_files=[],
+        missing_from_index=missing_from_index,
+        cross_references={},
+        health_score=round(max(0.0, score), 1),
+        summary=summary,
+        recommendations=recommendations,
+        timings=profiler.timings(),
+        mode="approximate",
+        skipped_checks=['orphan_files (list)', 'cross_references'],
+        estimates=estimates
+    )
@@ -0,0 +1,495 @@
+"""
+Health Budget
+==============
+Mode --budget-ms MS untuk document_health_analyzer.py: analisis yang
+berhenti setelah MS milidetik dengan report partial, lalu dilanjutkan oleh
+run berikutnya.
+
+Fitur:
+1. Urutan proses (budget_priority) - Dokumen yang baru diubah dulu, lalu
+   index file, lalu sisanya (terbaru dulu); semuanya dipotong oleh budget
+2. Checkpoint SQLite (scripts/health_checkpoint.db) - Finding, nama file
+   target link dan hasil cek link per dokumen; run berikutnya hanya memproses
+   dokumen yang belum tercakup atau yang hasil tersimpannya tidak berlaku lagi
+   (valid_entries), dan hanya baris yang berubah yang ditulis
+3. Hasil tersimpan berlaku selama mtime/size sama, tidak ada file bernama
+   sama dengan target link-nya yang muncul/hilang, target broken/external
+   link masih (tidak) ada, dan untuk index.md isi folder + manifest sama
+4. Biaya tetap (scan, stat, load, merge, simpan) dihitung dalam budget:
+   waktu merge + simpan run sebelumnya disisihkan dari waktu pemrosesan
+5. Orphan baru dilaporkan setelah coverage lengkap; near-duplicate dan
+   saran fix broken link dilewati supaya budget cukup
+6. Report ditandai partial + coverage (--restart membuang checkpoint)
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import json
+import time
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import document_health_analyzer as analyzer
+from document_health_analyzer import (
+    DEFAULT_RULES, SHARD_MANIFEST, TARGET_FOLDERS, HealthReport, RuleContext, build_rules, generate_recommendations,
+    get_all_md_files, link_status, normalize_path, parse_document, rule_context, run_rules, score_findings
+)
+from stage_profiler import StageProfiler
+
+# ============================================================
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CHECKPOINT = os.path.join(SCRIPT_DIR, "health_checkpoint.db")
+CHECKPOINT_VERSION = 3
+RECENT_HOURS = 24                  # documents modified this recently are processed first
+DEFAULT_MS_PER_MB = 120.0          # per-document time estimates until a run has measured them:
+DEFAULT_POST_MS_PER_MB = 20.0      # traversal, and rule finish + checkpoint entry afterwards
+RATE_MIN_BYTES = 64 * 1024         # a run must process this much to update the estimates
+MB = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS documents (
+    path     TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    names    TEXT NOT NULL,
+    refs     TEXT NOT NULL,
+    findings TEXT,
+    dirs     TEXT,
+    manifest TEXT
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    path     TEXT PRIMARY KEY,
+    mtime_ns INTEGER
+);
+"""
+
+
+def add_budget_arguments(parser):
+    """Register --budget-ms, --checkpoint and --restart on the analyzer's argument parser"""
+    parser.add_argument('--budget-ms', type=float, metavar='MS',
+                        help="Stop after MS milliseconds with a partial report (recently modified "
+                             "documents first); the next run resumes where this one stopped")
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, metavar='PATH',
+                        help=f"--budget-ms: per-document results kept between runs "
+                             f"(default: {os.path.relpath(DEFAULT_CHECKPOINT)})")
+    parser.add_argument('--restart', action='store_true',
+                        help="--budget-ms: discard the checkpoint and start from scratch")
+
+
+def finding_owner(item: Dict) -> Optional[str]:
+    """Document a per-document finding belongs to (index file for coverage findings)"""
+    return item.get('index_file') or item.get('source_file') or item.get('file')
+
+
+def is_folder_index(rel_path: str) -> bool:
+    """The index.md IndexCoverageRule checks its folder against"""
+    return rel_path == f"{rel_path.split('/')[0]}/index.md"
+
+
+def manifest_signature(folder: str) -> Optional[List[int]]:
+    """[mtime_ns, size] of a folder's shard manifest (None without one)"""
+    try:
+        stat = os.stat(os.path.join(analyzer.WORKSPACE_DIR, folder, SHARD_MANIFEST))
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def budget_priority(
+    all_files: Dict[str, str],
+    stats: Dict[str, os.stat_result],
+    covered: Set[str],
+    now: float
+) -> List[str]:
+    """
+    Processing order for a budgeted run: recently modified documents
+    (newest first), then index files, then the rest (newest first).
+    Documents covered by the checkpoint are left out.
+    """
+    def newest_first(paths):
+        return sorted(paths, key=lambda p: (-stats[p].st_mtime, p))
+
+    pending = [p for p in all_files if p not in covered]
+    recent = {p for p in pending if now - stats[p].st_mtime < RECENT_HOURS * 3600}
+    indexes = {p for p in pending if p not in recent and 'index' in os.path.basename(p).lower()}
+    rest = [p for p in pending if p not in recent and p not in indexes]
+    return newest_first(recent) + sorted(indexes) + newest_first(rest)
+
+
+# ============================================================
+@dataclass
+class CheckpointEntry:
+    """Stored results of one processed document"""
+    mtime_ns: int
+    size: int
+    names: str                                              # link target file names, '\n'-separated
+    refs: List[str]                                         # cross-references: documents the names resolve to
+    findings: Dict[str, List[Dict]] = field(default_factory=dict)
+    dirs: str = ""                                          # probe_dir() of broken / external links, '\n'-separated
+    manifest: Optional[List[int]] = None                    # folder index.md: shard manifest signature
+
+
+def probe_dir(target: str) -> Optional[str]:
+    """
+    Directory whose entries decide whether a broken or external link
+    target exists (its mtime changes when a file is added or removed).
+    None inside a scanned folder, whose files are listed on every run.
+    """
+    directory = os.path.dirname(target)
+    return None if directory in TARGET_FOLDERS else directory
+
+
+def dir_signature(directory: str) -> Optional[int]:
+    """mtime_ns of a workspace directory (None if it does not exist)"""
+    try:
+        return os.stat(os.path.join(analyzer.WORKSPACE_DIR, directory)).st_mtime_ns
+    except OSError:
+        return None
+
+
+class BudgetCheckpoint:
+    """
+    SQLite store of CheckpointEntry rows, the file list of the last run and
+    the signature of every probed directory. Rows are read once per run;
+    save() writes only what changed. A checkpoint made for another
+    workspace or rule set starts over.
+    """
+
+    def __init__(self, path: str, workspace: str, rule_key: str, restart: bool = False):
+        self.db = sqlite3.connect(path, isolation_level=None)
+        # A lost last run only means processing its documents again: commits need not wait for fsync
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        meta = dict(self.db.execute("SELECT key, value FROM meta"))
+        expected = {"version": str(CHECKPOINT_VERSION), "workspace": workspace, "rules": rule_key}
+        if restart or any(meta.get(key) != value for key, value in expected.items()):
+            self.db.execute("BEGIN IMMEDIATE")
+            for table in ('documents', 'dirs', 'meta'):
+                self.db.execute(f"DELETE FROM {table}")
+            self.db.executemany("INSERT INTO meta VALUES (?, ?)", list(expected.items()))
+            self.db.execute("COMMIT")
+            meta = expected
+        self.files: List[str] = json.loads(meta.get("files", "[]"))
+        self.finish_ms = float(meta.get("finish_ms", 0))
+        self.ms_per_mb = float(meta.get("ms_per_mb", DEFAULT_MS_PER_MB))
+        self.post_ms_per_mb = float(meta.get("post_ms_per_mb", DEFAULT_POST_MS_PER_MB))
+        self.dirs: Dict[str, Optional[int]] = dict(self.db.execute("SELECT path, mtime_ns FROM dirs"))
+        self.rows = {row[0]: row[1:] for row in self.db.execute("SELECT * FROM documents")}
+
+    def close(self):
+        self.db.close()
+
+    def save(self, entries: Dict[str, CheckpointEntry], written: Set[str], dir_states: Dict[str, Optional[int]],
+             files: Optional[List[str]], meta: Dict[str, float], finishing: float):
+        """
+        Write the `written` entries, drop rows not in `entries` any more,
+        keep the signatures of the directories entries still probe, and
+        store the file list (when given) and the `meta` values. finish_ms
+        is the time since `finishing` (perf_counter) up to the commit.
+        """
+        rows = [
+            (rel_path, entry.mtime_ns, entry.size, entry.names, "\n".join(entry.refs),
+             json.dumps(entry.findings, ensure_ascii=False) if entry.findings else None,
+             entry.dirs or None,
+             json.dumps(entry.manifest) if entry.manifest else None)
+            for rel_path, entry in ((p, entries[p]) for p in written)
+        ]
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.executemany("DELETE FROM documents WHERE path = ?",
+                                [(p,) for p in self.rows if p not in entries])
+            self.db.executemany("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.db.executemany("DELETE FROM dirs WHERE path = ?",
+                                [(d,) for d in self.dirs if d not in dir_states])
+            self.db.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?)",
+                                [(d, state) for d, state in dir_states.items()
+                                 if d not in self.dirs or self.dirs[d] != state])
+            if files is not None:
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('files', ?)",
+                                (json.dumps(files, ensure_ascii=False),))
+            meta = {**meta, "finish_ms": (time.perf_counter() - finishing) * 1000}
+            self.db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                                [(key, str(round(value, 3))) for key, value in meta.items()])
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+
+
+def valid_entries(
+    checkpoint: BudgetCheckpoint,
+    all_files: Dict[str, str],
+    stats: Dict[str, os.stat_result],
+    dir_states: Dict[str, Optional[int]]
+) -> Dict[str, CheckpointEntry]:
+    """
+    Checkpoint entries whose results still hold against the current
+    workspace. An entry is dropped when its document changed (mtime/size),
+    when a file named like one of its link targets was added or removed
+    since the last run, when a directory holding a broken or external link
+    target changed, and for a folder's index.md when the folder's files or
+    its shard manifest changed. `dir_states` gets the current signature
+    of every directory the valid entries probe.
+    """
+    changed = set(checkpoint.files).symmetric_difference(all_files)
+    changed_names = {os.path.basename(p) for p in changed}
+    changed_folders = {p.split('/')[0] for p in changed}
+    for directory in checkpoint.dirs:
+        dir_states[directory] = dir_signature(directory)
+    changed_dirs = {d for d, state in dir_states.items() if checkpoint.dirs[d] != state}
+
+    valid = {}
+    with_findings = []
+    for rel_path, (mtime_ns, size, names, refs, findings, dirs, manifest) in checkpoint.rows.items():
+        stat = stats.get(rel_path)
+        if stat is None or stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+            continue
+        if changed_names and names and not changed_names.isdisjoint(names.split("\n")):
+            continue
+        if changed_dirs and dirs and not changed_dirs.isdisjoint(dirs.split("\n")):
+            continue
+        if manifest or rel_path.endswith('/index.md'):
+            manifest = json.loads(manifest) if manifest else None
+            folder = rel_path.split('/')[0]
+            if is_folder_index(rel_path) and (folder in changed_folders or manifest_signature(folder) != manifest):
+                continue
+        valid[rel_path] = CheckpointEntry(mtime_ns, size, names, refs.split("\n") if refs else [],
+                                          dirs=dirs or "", manifest=manifest)
+        if findings:
+            with_findings.append((rel_path, findings))
+
+    # One json.loads() for every row: per call overhead dominates with thousands of small rows
+    decoded = json.loads("[" + ",".join(findings for _, findings in with_findings) + "]")
+    for (rel_path, _), findings in zip(with_findings, decoded):
+        valid[rel_path].findings = findings
+
+    if len(valid) < len(checkpoint.rows):
+        # Directories only dropped entries probed are not tracked any more
+        probed = {d for entry in valid.values() if entry.dirs for d in entry.dirs.split("\n")}
+        for directory in list(dir_states):
+            if directory not in probed:
+                del dir_states[directory]
+    return valid
+
+
+def new_entry(
+    rel_path: str,
+    links: List[Tuple[str, str]],
+    stat: os.stat_result,
+    ctx: RuleContext,
+    dir_states: Dict[str, Optional[int]]
+) -> CheckpointEntry:
+    """Entry for a document processed in this run (findings are added by the caller)"""
+    folder = rel_path.split('/')[0]
+    dirs = {}
+    for _, link_target in links:
+        if link_status(folder, link_target, ctx) in ('external', 'broken'):
+            directory = probe_dir(normalize_path(folder, link_target))
+            if directory is not None:
+                dirs[directory] = None
+                if directory not in dir_states:
+                    dir_states[directory] = dir_signature(directory)
+    names = list(dict.fromkeys(os.path.basename(link_target) for _, link_target in links))
+    return CheckpointEntry(
+        stat.st_mtime_ns, stat.st_size, "\n".join(names),
+        # Same resolution as CrossReferenceRule: basename -> last file with that name
+        [ctx.all_file_names[name] for name in names if name in ctx.all_file_names],
+        dirs="\n".join(dirs),
+        manifest=manifest_signature(folder) if is_folder_index(rel_path) else None
+    )
+
+
+# ============================================================
+def analyze_budgeted_health(
+    budget_ms: float,
+    profiler: Optional[StageProfiler] = None,
+    rule_names: Optional[List[str]] = None,
+    rule_options: Optional[Dict[str, Dict]] = None,
+    checkpoint_path: str = DEFAULT_CHECKPOINT,
+    restart: bool = False
+) -> HealthReport:
+    """
+    Health check that stops after `budget_ms` and resumes on the next run.
+    Documents are processed in budget_priority() order; each processed
+    document's findings, link target names and link checks go into the
+    checkpoint, so a later run only processes documents not covered yet
+    or whose stored results no longer hold (see valid_entries()).
+    Cross-references are resolved from the stored names against the
+    current file list. Orphans need every document's links and are
+    reported once coverage is complete. Near-duplicate detection and
+    broken-link suggestions are skipped to keep the budget.
+
+    The whole run counts against the budget: the previous run's merge and
+    save time is set aside, documents are processed until the rest is used
+    up. The first queued document is always processed so that repeated runs
+    make progress, even when the fixed costs alone exceed the budget.
+    """
+    profiler = profiler or StageProfiler()
+    started = time.perf_counter()
+    deadline = started + budget_ms / 1000
+    names = DEFAULT_RULES + [n for n in (rule_names or []) if n not in DEFAULT_RULES]
+    skipped = [n for n in names if n == 'near_duplicates']
+    names = [n for n in names if n not in ('orphan_files', 'near_duplicates')]
+    rule_options = dict(rule_options or {})
+    rule_options['broken_links'] = {**rule_options.get('broken_links', {}), 'suggestions': 0}
+    rules = build_rules(names, rule_options)
+    rule_key = json.dumps([names, {n: rule_options.get(n) for n in names}], sort_keys=True, default=str)
+
+    print("\n" + "="*60)
+    print(f"📋 DOCUMENT HEALTH ANALYZER (budget {budget_ms:g}ms)")
+    print("="*60)
+
+    checkpoint = BudgetCheckpoint(checkpoint_path, analyzer.WORKSPACE_DIR, rule_key, restart)
+    profiler.start()
+    try:
+        print("\n1️⃣ Scanning workspace...")
+        with profiler.stage("scan"):
+            all_files = get_all_md_files(analyzer.WORKSPACE_DIR)
+            ctx = rule_context(all_files)
+            stats = {rel_path: os.stat(abs_path) for rel_path, abs_path in all_files.items()}
+            dir_states: Dict[str, Optional[int]] = {}
+            entries = valid_entries(checkpoint, all_files, stats, dir_states)
+            order = budget_priority(all_files, stats, set(entries), time.time())
+        resumed = len(entries)
+        print(f"   Found {len(all_files)} markdown files, {resumed} covered by earlier runs, {len(order)} queued")
+
+        print(f"\n2️⃣ Running {len(rules)} health rules until the budget runs out...")
+        processed: Dict[str, List[Tuple[str, str]]] = {}   # rel_path -> links
+        # Leave the time the last run needed to merge and save; per document,
+        # estimate the processing and the rule/entry work after the traversal
+        documents_deadline = deadline - checkpoint.finish_ms / 1000
+        seconds_per_byte = checkpoint.ms_per_mb / 1000 / MB
+        post_seconds_per_byte = checkpoint.post_ms_per_mb / 1000 / MB
+        marks = {}
+
+        def budgeted():
+            marks["documents"] = time.perf_counter()
+            queued = 0
+            for rel_path in order:
+                left = documents_deadline - time.perf_counter() - queued * post_seconds_per_byte
+                if left <= 0:
+                    break
+                # A document too large for the time left waits; a smaller one may fit
+                size = stats[rel_path].st_size
+                if size * (seconds_per_byte + post_seconds_per_byte) <= left:
+                    queued += size
+                    yield rel_path
+            if order and not processed:
+                # Repeated runs make progress even when the fixed costs use up the budget
+                yield min(order, key=lambda p: stats[p].st_size)
+            marks["traversed"] = time.perf_counter()
+
+        def parse(abs_path: str, rel_path: str):
+            doc = parse_document(abs_path, rel_path)
+            processed[rel_path] = doc.links
+            return doc
+
+        with profiler.stage("rules"):
+            findings, rule_ms = run_rules(all_files, rules, profiler.track_files(parse, analyzer.WORKSPACE_DIR),
+                                          budgeted(), ctx)
+        profiler.record_rules(rule_ms)
+
+        with profiler.stage("merge"):
+            for rel_path, links in processed.items():
+                entries[rel_path] = new_entry(rel_path, links, stats[rel_path], ctx, dir_states)
+            for rule in rules:
+                if rule.name == 'cross_references':
+                    continue
+                for item in findings[rule.name]:
+                    owner = finding_owner(item)
+                    if owner in processed:
+                        entries[owner].findings.setdefault(rule.name, []).append(item)
+            marks["entries"] = time.perf_counter()
+
+            merged = {rule.name: [] for rule in rules}
+            cross_refs = {}
+            for rel_path in all_files:
+                entry = entries.get(rel_path)
+                if entry is None:
+                    continue
+                for name, items in entry.findings.items():
+                    merged[name].extend(items)
+                if entry.refs:
+                    cross_refs[rel_path] = entry.refs
+            merged['cross_references'] = cross_refs
+
+            covered = [p for p in all_files if p in entries]
+            complete = len(covered) == len(all_files)
+            orphan_files = []
+            if complete:
+                referenced = {target for targets in cross_refs.values() for target in targets}
+                orphan_files = sorted(
+                    p for p in all_files if 'index' not in os.path.basename(p).lower() and p not in referenced
+                )
+            merged['orphan_files'] = orphan_files
+
+            meta = {}
+            processed_mb = sum(stats[p].st_size for p in processed) / MB
+            if processed_mb * MB >= RATE_MIN_BYTES:
+                meta["ms_per_mb"] = (marks["traversed"] - marks["documents"]) * 1000 / processed_mb
+                meta["post_ms_per_mb"] = (marks["entries"] - marks["traversed"]) * 1000 / processed_mb
+            files_changed = set(checkpoint.files) != ctx.all_file_paths
+            checkpoint.save(entries, set(processed), dir_states, list(all_files) if files_changed else None,
+                            meta, marks["entries"])
+
+        with profiler.stage("score"):
+            health_score = score_findings(len(covered), rules, merged)
+    finally:
+        profiler.stop()
+        checkpoint.close()
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    coverage = {
+        "budget_ms": budget_ms,
+        "elapsed_ms": round(elapsed_ms, 1),
+        "documents": len(all_files),
+        "covered": len(covered),
+        "processed": len(processed),
+        "resumed": resumed,
+        "remaining": len(all_files) - len(covered),
+        # Rounded down: a partial run never shows 100%
+        "percent": int(len(covered) * 1000 / len(all_files)) / 10 if all_files else 100.0,
+    }
+    state = "complete" if complete else "partial"
+    print(f"   {len(processed)} processed in {elapsed_ms:.0f}ms - coverage {coverage['percent']}% ({state})")
+
+    broken_links = merged['broken_links']
+    missing_from_index = merged['missing_from_index']
+    rule_findings = {rule.name: merged[rule.name] for rule in rules if rule.name not in DEFAULT_RULES}
+    summary = {
+        "total_files": len(all_files),
+        "covered_files": len(covered),
+        "broken_links": len(broken_links),
+        "orphan_files": len(orphan_files),
+        "missing_from_index": len(missing_from_index),
+        "connected_files": len(cross_refs),
+    }
+    for name, items in rule_findings.items():
+        summary[name] = len(items)
+
+    return HealthReport(
+        timestamp=datetime.now().isoformat(),
+        total_files=len(all_files),
+        broken_links=broken_links,
+        orphan_files=orphan_files,
+        missing_from_index=missing_from_index,
+        cross_references=cross_refs,
+        health_score=health_score,
+        summary=summary,
+        recommendations=generate_recommendations(broken_links, orphan_files, missing_from_index, rule_findings),
+        timings=profiler.timings(),
+        rule_findings=rule_findings,
+        mode="budgeted",
+        skipped_checks=skipped + ([] if complete else ['orphan_files']),
+        partial=not complete,
+        coverage=coverage
+    )
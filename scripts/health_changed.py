@@ -0,0 +1,182 @@
+"""
+Health Changed
+===============
+Mode --staged / --changed-since REV untuk document_health_analyzer.py:
+pre-commit hook hanya menganalisis dokumen yang bisa terpengaruh oleh
+perubahan git, bukan seluruh workspace.
+
+Fitur:
+1. changed_scope() - Scope = dokumen yang berubah, file yang di-link-nya
+   (sebelum dan sesudah perubahan) dan dokumen yang me-link ke sana
+   (termasuk file yang dihapus / di-rename)
+2. Backlink index tersimpan (lihat git_scope.py) di-refresh per file
+   berdasarkan mtime/size, jadi hanya dokumen yang berubah yang di-parse ulang
+3. Orphan dijawab dari backlink index; index.md folder dibaca untuk check
+   coverage
+4. Finding dan skor hanya untuk scope; near-duplicate butuh semua dokumen
+   dan dilewati
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import document_health_analyzer as analyzer
+from document_health_analyzer import (
+    DEFAULT_RULES, TARGET_FOLDERS, HealthReport, build_rules, extract_links,
+    generate_recommendations, get_all_md_files, parse_document, run_rules, score_findings
+)
+from git_scope import DEFAULT_BACKLINK_INDEX, BacklinkIndex, add_scope_arguments, previous_contents
+from markdown_links import extract_links_from_content
+from stage_profiler import StageProfiler
+
+
+# ============================================================
+def add_changed_arguments(parser):
+    """Register --staged / --changed-since and --backlink-index on the analyzer's argument parser"""
+    add_scope_arguments(parser)
+    parser.add_argument('--backlink-index', default=DEFAULT_BACKLINK_INDEX, metavar='PATH',
+                        help="--staged / --changed-since: persisted backlink index "
+                             f"(default: {os.path.relpath(DEFAULT_BACKLINK_INDEX)})")
+
+
+def changed_scope(
+    changed: Set[str],
+    all_files: Dict[str, str],
+    backlinks: BacklinkIndex,
+    previous_links: Dict[str, List[Tuple[str, str]]]
+) -> Set[str]:
+    """
+    Documents whose findings a change can affect: the changed documents,
+    every file they link to (before and after the change) and every
+    document linking to them (deleted and renamed files included).
+    """
+    file_names = {os.path.basename(p): p for p in all_files}
+    scope = {p for p in changed if p in all_files}
+    for rel_path in changed:
+        for _, target in backlinks.links(rel_path) + previous_links.get(rel_path, []):
+            resolved = file_names.get(os.path.basename(target))
+            if resolved:
+                scope.add(resolved)
+        scope |= backlinks.backlinks(os.path.basename(rel_path))
+    return scope
+
+
+def analyze_changed_health(
+    base: str,
+    changed: Set[str],
+    profiler: Optional[StageProfiler] = None,
+    rule_names: Optional[List[str]] = None,
+    rule_options: Optional[Dict[str, Dict]] = None,
+    backlink_path: str = DEFAULT_BACKLINK_INDEX
+) -> HealthReport:
+    """
+    Health check limited to the documents a git change can affect
+    (see changed_scope). Orphans come from the persisted backlink index,
+    which is refreshed per file by mtime/size, so only changed documents
+    are re-parsed. Folder index.md files are read for the coverage check.
+    Findings and score cover the scope only; near-duplicate detection
+    needs every document and is skipped.
+    """
+    profiler = profiler or StageProfiler()
+    names = DEFAULT_RULES + [n for n in (rule_names or []) if n not in DEFAULT_RULES]
+    skipped = [n for n in names if n == 'near_duplicates']
+    names = [n for n in names if n not in ('orphan_files', 'near_duplicates')]
+    changed = {p for p in changed if p.endswith('.md') and p.split('/')[0] in TARGET_FOLDERS}
+
+    print("\n" + "="*60)
+    print(f"📋 DOCUMENT HEALTH ANALYZER (changed since {base})")
+    print("="*60)
+
+    profiler.start()
+    try:
+        print("\n1️⃣ Scanning workspace...")
+        with profiler.stage("scan"):
+            all_files = get_all_md_files(analyzer.WORKSPACE_DIR)
+        print(f"   {len(changed)} changed of {len(all_files)} markdown files")
+
+        scope: Set[str] = set()
+        backlinks = None
+        if changed:
+            print("\n2️⃣ Refreshing backlink index...")
+            with profiler.stage("backlinks"):
+                backlinks = BacklinkIndex.load(backlink_path, analyzer.WORKSPACE_DIR)
+                updated, removed = backlinks.refresh(all_files, extract_links)
+                previous = previous_contents(analyzer.WORKSPACE_DIR, base, sorted(changed))
+                previous_links = {p: extract_links_from_content(c) for p, c in previous.items()}
+                scope = changed_scope(changed, all_files, backlinks, previous_links)
+            print(f"   {updated} re-parsed, {removed} removed; {len(scope)} documents in scope")
+
+        rules = build_rules(names, dict(rule_options or {}, missing_from_index={"only": scope}))
+        print(f"\n3️⃣ Running {len(rules)} health rules on the scope...")
+        folder_indexes = {f"{p.split('/')[0]}/index.md" for p in scope} & set(all_files)
+        parse = profiler.track_files(parse_document, analyzer.WORKSPACE_DIR)
+        with profiler.stage("rules"):
+            findings, rule_ms = run_rules(all_files, rules, parse, sorted(scope | folder_indexes))
+        profiler.record_rules(rule_ms)
+
+        orphan_files = []
+        if backlinks:
+            with profiler.stage("orphans"):
+                # Same resolution as OrphanFileRule: basename -> last file with that name
+                file_names = {os.path.basename(p): p for p in all_files}
+                referenced = {file_names[name] for name in backlinks.referenced_basenames() if name in file_names}
+                orphan_files = sorted(
+                    p for p in scope if 'index' not in os.path.basename(p).lower() and p not in referenced
+                )
+            if backlinks.dirty:
+                backlinks.save(backlink_path)
+
+        in_scope = {(p.split('/')[0], os.path.basename(p)) for p in scope}
+        broken_links = [item for item in findings['broken_links'] if item['source_file'] in scope]
+        missing_from_index = [
+            item for item in findings['missing_from_index'] if (item['folder'], item['file']) in in_scope
+        ]
+        cross_refs = {source: targets for source, targets in findings['cross_references'].items() if source in scope}
+        rule_findings = {
+            rule.name: [
+                item for item in findings[rule.name] if item.get('file', item.get('source_file')) in scope
+            ]
+            for rule in rules if rule.name not in DEFAULT_RULES
+        }
+        for name, items in [('broken_links', broken_links), ('orphan_files', orphan_files),
+                            ('missing_from_index', missing_from_index)] + list(rule_findings.items()):
+            print(f"   • {name}: {len(items)} found")
+
+        with profiler.stage("score"):
+            scoped = dict(findings, broken_links=broken_links, orphan_files=orphan_files,
+                          missing_from_index=missing_from_index, **rule_findings)
+            health_score = score_findings(len(scope), rules, scoped)
+    finally:
+        profiler.stop()
+
+    summary = {
+        "total_files": len(scope),
+        "changed_files": len(changed),
+        "broken_links": len(broken_links),
+        "orphan_files": len(orphan_files),
+        "missing_from_index": len(missing_from_index),
+        "connected_files": len([f for f in cross_refs if cross_refs[f]]),
+    }
+    for name, items in rule_findings.items():
+        summary[name] = len(items)
+
+    return HealthReport(
+        timestamp=datetime.now().isoformat(),
+        total_files=len(scope),
+        broken_links=broken_links,
+        orphan_files=orphan_files,
+        missing_from_index=missing_from_index,
+        cross_references=cross_refs,
+        health_score=health_score,
+        summary=summary,
+        recommendations=generate_recommendations(broken_links, orphan_files, missing_from_index, rule_findings),
+        timings=profiler.timings(),
+        rule_findings=rule_findings,
+        mode="changed",
+        skipped_checks=skipped,
+        scope={"base": base, "changed": sorted(changed), "documents": sorted(scope)}
+    )
@@ -0,0 +1,186 @@
+"""
+Health History
+===============
+Mode --history N untuk document_health_analyzer.py: health score dan jumlah
+failure untuk N commit terakhir yang menyentuh workspace (time series),
+dibaca langsung dari git tanpa checkout.
+
+Fitur:
+1. Tree setiap commit dari `git ls-tree`, isi blob lewat satu proses
+   `git cat-file --batch` yang dipakai bersama (GitTreeFS di workspace_fs.py)
+2. Dokumen hasil parse di-cache per blob hash; cache hanya menyimpan blob
+   dari tree terakhir, jadi memori terbatas satu tree sementara file yang
+   tidak berubah antar commit tetap di-parse sekali
+3. Jumlah failure (dan yang belum punya pattern) dari Log/failures.md
+   setiap commit
+4. Output JSON atau NDJSON (satu record per commit)
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import document_health_analyzer as analyzer
+from document_health_analyzer import (
+    DEFAULT_RULES, ParsedDocument, build_rules, get_all_md_files, read_document, run_rules, score_findings
+)
+from markdown_links import extract_links_from_content
+from report_writer import NDJSON_FORMAT_VERSION, report_path, write_json, write_ndjson
+from stage_profiler import StageProfiler
+from workspace_fs import GitBlobReader, GitTreeFS, git_output
+
+
+# ============================================================
+def add_history_arguments(parser):
+    """Register --history on the analyzer's argument parser"""
+    parser.add_argument('--history', type=int, metavar='N',
+                        help="Score the last N commits that touched the workspace (read from git, no checkout)")
+
+
+@dataclass
+class HistoryReport:
+    """Health score and failure counts per commit (oldest first)"""
+    timestamp: str
+    workspace: str
+    commits: List[Dict]
+    documents_parsed: int
+    documents_reused: int
+    blob_reads: int
+    timings: Optional[Dict] = None
+
+
+def workspace_commits(repo: str, workspace_prefix: str, count: int) -> List[Dict]:
+    """Last `count` commits touching the workspace, oldest first"""
+    log = git_output(repo, 'log', f'-n{count}', '--format=%H%x09%ct%x09%s', '--', workspace_prefix)
+    commits = []
+    for line in log.splitlines():
+        sha, commit_time, subject = line.split('\t', 2)
+        commits.append({"commit": sha, "time": int(commit_time), "subject": subject})
+    return list(reversed(commits))
+
+
+def analyze_history(
+    count: int,
+    profiler: Optional[StageProfiler] = None,
+    rule_names: Optional[List[str]] = None,
+    rule_options: Optional[Dict[str, Dict]] = None
+) -> HistoryReport:
+    """
+    Score the workspace at each of the last `count` commits that touched it.
+    Trees come from `git ls-tree`, contents from one shared
+    `git cat-file --batch` process. Parsed documents are cached by blob
+    hash, so a file unchanged across commits is read and parsed once; the
+    cache only keeps the blobs of the last analyzed tree.
+    """
+    from failure_analyzer import parse_failure_entries
+
+    profiler = profiler or StageProfiler()
+    names = DEFAULT_RULES + [n for n in (rule_names or []) if n not in DEFAULT_RULES]
+    repo = git_output(analyzer.WORKSPACE_DIR, 'rev-parse', '--show-toplevel').strip()
+    workspace_prefix = os.path.relpath(analyzer.WORKSPACE_DIR, repo).replace(os.sep, '/')
+
+    print("\n" + "="*60)
+    print("📋 DOCUMENT HEALTH HISTORY")
+    print("="*60)
+
+    commits = workspace_commits(repo, workspace_prefix, count)
+    print(f"\n🕰️ {len(commits)} commit(s) touching {workspace_prefix}/")
+
+    reader = GitBlobReader(repo)
+    parsed_by_blob: Dict[str, Tuple[str, List[Tuple[str, str]], Dict]] = {}
+    failures_by_blob: Dict[str, Tuple[int, int]] = {}
+    current_fs = analyzer.WORKSPACE_FS
+    series = []
+    stats = {"parsed": 0, "reused": 0}
+
+    # Only counts go into the time series, so skip fix suggestions
+    rule_options = dict(rule_options or {})
+    rule_options['broken_links'] = {**rule_options.get('broken_links', {}), 'suggestions': 0}
+
+    def parse_cached(abs_path: str, rel_path: str) -> ParsedDocument:
+        sha = analyzer.WORKSPACE_FS.blob_hash(abs_path)
+        if sha not in parsed_by_blob:
+            content = read_document(abs_path)
+            parsed_by_blob[sha] = (content, extract_links_from_content(content), {})
+            stats["parsed"] += 1
+        else:
+            stats["reused"] += 1
+        content, links, derived = parsed_by_blob[sha]
+        return ParsedDocument(rel_path, abs_path, rel_path.split('/')[0], content, links, derived)
+
+    profiler.start()
+    try:
+        for commit in commits:
+            with profiler.stage(commit["commit"][:10]):
+                analyzer.WORKSPACE_FS = GitTreeFS(analyzer.WORKSPACE_DIR, repo, commit["commit"], reader, commit["time"])
+                all_files = get_all_md_files(analyzer.WORKSPACE_DIR)
+                rules = build_rules(names, rule_options)
+                findings, _ = run_rules(all_files, rules, parse_cached)
+                health_score = score_findings(len(all_files), rules, findings)
+
+                # Consecutive commits share most blobs: keep this tree's documents only
+                live = set(analyzer.WORKSPACE_FS.blobs.values())
+                for sha in [sha for sha in parsed_by_blob if sha not in live]:
+                    del parsed_by_blob[sha]
+
+                failures_path = os.path.join(analyzer.WORKSPACE_DIR, 'Log', 'failures.md')
+                failures_sha = analyzer.WORKSPACE_FS.blob_hash(failures_path)
+                if failures_sha and failures_sha not in failures_by_blob:
+                    entries = parse_failure_entries(analyzer.WORKSPACE_FS.read_text(failures_path))
+                    failures_by_blob[failures_sha] = (len(entries), len([e for e in entries if not e.pattern_id]))
+                failures, unpatterned = failures_by_blob.get(failures_sha, (0, 0))
+
+            point = {
+                "commit": commit["commit"],
+                "date": datetime.fromtimestamp(commit["time"]).isoformat(),
+                "subject": commit["subject"],
+                "health_score": health_score,
+                "total_files": len(all_files),
+                "broken_links": len(findings['broken_links']),
+                "orphan_files": len(findings['orphan_files']),
+                "missing_from_index": len(findings['missing_from_index']),
+                "failures": failures,
+                "unpatterned_failures": unpatterned,
+            }
+            series.append(point)
+            print(f"   • {commit['commit'][:10]} {point['date'][:10]} score {health_score:>5}  "
+                  f"files {len(all_files):>5}  failures {failures:>4}  {commit['subject'][:40]}")
+    finally:
+        profiler.stop()
+        analyzer.WORKSPACE_FS = current_fs
+        reader.close()
+
+    print(f"\n📦 Documents: {stats['parsed']} parsed, {stats['reused']} reused by blob hash; "
+          f"{reader.requests} blob(s) read via cat-file")
+
+    return HistoryReport(
+        timestamp=datetime.now().isoformat(),
+        workspace=workspace_prefix,
+        commits=series,
+        documents_parsed=stats["parsed"],
+        documents_reused=stats["reused"],
+        blob_reads=reader.requests,
+        timings=profiler.timings()
+    )
+
+
+def save_history_report(report: HistoryReport, output_format: str = 'json', compress: bool = False, compact: bool = False):
+    """Save the history time series (NDJSON: one record per commit)"""
+    output_path = report_path(analyzer.OUTPUT_DIR, "document_health_history", output_format, compress)
+    if output_format == 'ndjson':
+        records = [{"type": "meta", "report": "document_health_history",
+                    "format_version": NDJSON_FORMAT_VERSION, "timestamp": report.timestamp,
+                    "workspace": report.workspace}]
+        records += [{"type": "commit", **point} for point in report.commits]
+        records.append({"type": "summary", "commits": len(report.commits),
+                        "documents_parsed": report.documents_parsed,
+                        "documents_reused": report.documents_reused,
+                        "blob_reads": report.blob_reads})
+        write_ndjson(output_path, records, compress)
+    else:
+        write_json(output_path, asdict(report), compress, compact)
+    print(f"\n💾 History saved to: {output_path}")
@@ -0,0 +1,193 @@
+"""
+Job Lock
+=========
+Koordinasi lock-file (fcntl) supaya beberapa agent yang menjalankan script
+yang sama secara bersamaan berbagi satu run.
+
+Cara kerja (per job + workspace):
+1. Setiap pemanggil menaikkan counter `requested` di state file
+2. Pemanggil yang mendapat run lock menjadi runner; setelah selesai ia cek
+   apakah ada request baru selama ia berjalan - jika ya, run ulang SEKALI
+   untuk semua request tersebut
+3. Pemanggil lain:
+   - mode "wait":  tunggu sampai run yang mencakup request-nya selesai,
+                   lalu pakai hasilnya
+   - mode "dirty": tandai run "dirty" dan langsung keluar; runner akan
+                   run ulang setelah selesai
+
+N request bersamaan = maksimal 2 scan. Semua keputusan diambil di bawah
+state lock, dan fcntl lock otomatis lepas jika runner crash.
+
+workspace_lock() - lock eksklusif biasa per workspace + nama, untuk writer
+yang harus bergantian (mis. append_failure() di failure_analyzer.py).
+
+Di platform tanpa fcntl (Windows) job langsung dijalankan tanpa koordinasi.
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, Optional, Tuple, Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# ============================================================
+LOCK_MODES = ['wait', 'dirty', 'off']
+POLL_INTERVAL = 0.05
+
+
+def lock_dir_for(workspace: str) -> str:
+    """Per-workspace lock directory shared by every process on this machine"""
+    key = hashlib.sha1(os.path.realpath(workspace).encode('utf-8')).hexdigest()[:16]
+    path = os.path.join(tempfile.gettempdir(), 'agent-workspace-locks', key)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+@contextmanager
+def _flock(path: str):
+    with open(path, 'a+') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def workspace_lock(workspace: str, name: str):
+    """Exclusive machine-wide lock `name` for `workspace` (no-op without fcntl)"""
+    if fcntl is None:
+        yield
+        return
+    with _flock(os.path.join(lock_dir_for(workspace), name + '.lock')):
+        yield
+
+
+class CoalescingJob:
+    """A named job whose concurrent invocations are coalesced"""
+
+    def __init__(self, name: str, workspace: str):
+        base = os.path.join(lock_dir_for(workspace), name)
+        self.state_path = base + '.state.json'
+        self.state_lock_path = base + '.state.lock'
+        self.run_lock_path = base + '.run.lock'
+        self._run_file = None
+
+    # --------------------------------------------------------
+    def _read_state(self) -> dict:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"requested": 0, "completed": 0}
+
+    def _write_state(self, state: dict):
+        temp_path = f"{self.state_path}.tmp-{os.getpid()}"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_path)
+
+    def _try_run_lock(self) -> bool:
+        f = open(self.run_lock_path, 'a+')
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.close()
+            return False
+        self._run_file = f
+        return True
+
+    def _release_run_lock(self):
+        if self._run_file:
+            fcntl.flock(self._run_file.fileno(), fcntl.LOCK_UN)
+            self._run_file.close()
+            self._run_file = None
+
+    # --------------------------------------------------------
+    def run(self, job: Callable[[], Any], mode: str = 'wait') -> Tuple[str, Optional[Any]]:
+        """
+        Run `job` unless a concurrent run already covers this request.
+        Returns: (outcome, result) where outcome is
+            "ran"      - this process ran the job (result = last job result)
+            "reused"   - a concurrent run covered this request (result = None)
+            "deferred" - mode "dirty": the active runner will re-run (result = None)
+        """
+        if mode == 'off' or fcntl is None:
+            return "ran", job()
+
+        with _flock(self.state_lock_path):
+            state = self._read_state()
+            state["requested"] += 1
+            ticket = state["requested"]
+            self._write_state(state)
+            is_runner = self._try_run_lock()
+
+        if not is_runner:
+            if mode == 'dirty':
+                return "deferred", None
+            while True:
+                time.sleep(POLL_INTERVAL)
+                with _flock(self.state_lock_path):
+                    if self._read_state()["completed"] >= ticket:
+                        return "reused", None
+                    # Runner finished (or died) without covering us: take over
+                    if self._try_run_lock():
+                        break
+
+        return "ran", self._run_as_runner(job)
+
+    def _run_as_runner(self, job: Callable[[], Any]) -> Any:
+        result = None
+        try:
+            while True:
+                with _flock(self.state_lock_path):
+                    target = self._read_state()["requested"]
+                result = job()
+                with _flock(self.state_lock_path):
+                    state = self._read_state()
+                    state["completed"] = max(state["completed"], target)
+                    self._write_state(state)
+                    if state["requested"] <= target:
+                        # Release while holding the state lock so a new
+                        # request either sees us running or gets the lock
+                        self._release_run_lock()
+                        return result
+                # Requests arrived while running: one more pass covers all
+        finally:
+            self._release_run_lock()
+
+
+def job_name_for(tool: str, args, *extra: str) -> str:
+    """
+    Job name for a run of `tool`: a hash of every parsed argument (except
+    --lock) plus `extra` inputs such as the changed-file set, so only runs
+    that would produce the same output are coalesced.
+    """
+    settings = {name: value for name, value in vars(args).items() if name != 'lock'}
+    key = json.dumps([settings, list(extra)], sort_keys=True, default=str)
+    return f"{tool}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}"
+
+
+def add_lock_arguments(parser):
+    """Register --lock on a script's argument parser"""
+    parser.add_argument('--lock', choices=LOCK_MODES, default='wait',
+                        help="Concurrent runs: wait and reuse the active run (default), "
+                             "mark it dirty and exit, or run without coordination")
+
+
+def describe_outcome(outcome: str) -> Optional[str]:
+    if outcome == "reused":
+        return "♻️ A concurrent run already covered this request - reusing its output"
+    if outcome == "deferred":
+        return "🔁 A run is in progress - marked dirty, it will re-run once when finished"
+    return None
@@ -0,0 +1,146 @@
+"""
+Latency Benchmark
+==================
+Script untuk mengukur speedup --io-concurrency (lihat async_scan.py) di
+filesystem dengan latency tinggi, tanpa butuh network mount sungguhan.
+
+Fitur:
+1. Workspace dibungkus LatencyFS (workspace_fs.py): setiap exists / listdir /
+   read menunggu --latency-ms dulu, seperti round-trip ke NFS / FUSE
+2. Stage yang diukur = stage I/O document_health_analyzer.py: listing folder
+   (get_all_md_files) + baca dan parse link setiap dokumen (parse_document)
+3. Serial (concurrency 1) dibandingkan dengan setiap nilai --concurrency;
+   catat wall time, jumlah panggilan filesystem dan speedup
+4. Hasil setiap mode dibandingkan (path, isi dan link harus identik)
+
+Jalankan:
+    python latency_benchmark.py                      # workspace sintetis, 2 ms
+    python latency_benchmark.py --latency-ms 5 --concurrency 4 16 64
+    python latency_benchmark.py --workspace /path/to/Agent-0
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import argparse
+from typing import Dict, List
+
+from synthetic_workspace_generator import GeneratorConfig, generate_workspace
+
+# ============================================================
+DEFAULT_LATENCY_MS = 2.0
+DEFAULT_CONCURRENCY = [4, 16, 32]
+
+
+def run_scan(analyzer, workspace: str, concurrency: int) -> Dict:
+    """List and parse every document once through the analyzer's WORKSPACE_FS"""
+    from async_scan import AsyncScanner
+
+    fs = analyzer.WORKSPACE_FS
+    fs.calls = 0
+    fingerprint = hashlib.sha1()
+    start = time.perf_counter()
+
+    scanner = AsyncScanner(concurrency) if concurrency > 1 else None
+    try:
+        files = analyzer.get_all_md_files(workspace, scanner)
+        parse = lambda item: analyzer.parse_document(item[1], item[0])
+        run = scanner.map if scanner else map
+        for doc in run(parse, files.items()):
+            fingerprint.update(json.dumps([doc.rel_path, doc.content, doc.links]).encode('utf-8'))
+    finally:
+        if scanner:
+            scanner.close()
+
+    return {
+        "concurrency": concurrency,
+        "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+        "fs_calls": fs.calls,
+        "documents": len(files),
+        "fingerprint": fingerprint.hexdigest(),
+    }
+
+
+def print_results(results: List[Dict], latency_ms: float):
+    print("\n" + "="*60)
+    print(f"📊 LATENCY BENCHMARK RESULTS ({latency_ms:g} ms per call)")
+    print("="*60)
+
+    serial = results[0]
+    print(f"\n   {'concurrency':>11} {'wall ms':>10} {'fs calls':>9} {'docs':>6} {'speedup':>8}")
+    for run in results:
+        print(
+            f"   {run['concurrency']:>11} {run['wall_ms']:>10.1f} {run['fs_calls']:>9} "
+            f"{run['documents']:>6} {serial['wall_ms'] / run['wall_ms']:>7.1f}x"
+        )
+
+
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark --io-concurrency on a simulated high-latency filesystem")
+    parser.add_argument('--workspace', help="Existing workspace to scan (default: generate a synthetic one)")
+    parser.add_argument('--latency-ms', type=float, default=DEFAULT_LATENCY_MS,
+                        help=f"Delay injected before every filesystem call (default: {DEFAULT_LATENCY_MS:g})")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=DEFAULT_CONCURRENCY,
+                        help="Concurrency levels compared against the serial scan")
+    parser.add_argument('--scale', type=int, default=5, help="Synthetic workspace size multiplier")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+    if any(c < 1 for c in args.concurrency):
+        parser.error("--concurrency values must be at least 1")
+
+    print("\n" + "="*60)
+    print("🏁 LATENCY BENCHMARK")
+    print("="*60)
+
+    tmp_root = None
+    workspace = args.workspace and os.path.abspath(args.workspace)
+    if not workspace:
+        tmp_root = tempfile.mkdtemp(prefix="latency_bench_")
+        workspace = os.path.join(tmp_root, "Agent-0")
+        config = GeneratorConfig(
+            topics=20 * args.scale, plans=40 * args.scale, finds=10 * args.scale,
+            research=5 * args.scale, knowledge_files=10 * args.scale
+        )
+        print(f"\n🧪 Generating synthetic workspace (scale {args.scale})...")
+        generate_workspace(workspace, config)
+
+    try:
+        # The analyzer resolves its workspace at import time
+        os.environ['AGENT_WORKSPACE'] = workspace
+        import document_health_analyzer as analyzer
+        from workspace_fs import DirectoryFS, LatencyFS
+        analyzer.WORKSPACE_FS = LatencyFS(DirectoryFS(workspace), args.latency_ms)
+
+        results = []
+        for concurrency in [1] + [c for c in args.concurrency if c != 1]:
+            print(f"▶️ concurrency {concurrency}...")
+            results.append(run_scan(analyzer, workspace, concurrency))
+    finally:
+        if tmp_root:
+            shutil.rmtree(tmp_root, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps({"latency_ms": args.latency_ms, "results": results}, indent=2))
+    else:
+        print_results(results, args.latency_ms)
+
+    exit_code = 0
+    for run in results[1:]:
+        if run['fingerprint'] != results[0]['fingerprint']:
+            print(f"\n🔴 concurrency {run['concurrency']}: documents differ from the serial scan")
+            exit_code = 1
+
+    print("\n" + "="*60)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
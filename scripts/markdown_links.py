@@ -0,0 +1,55 @@
+"""
+Markdown Links
+===============
+Ekstraksi link/referensi dari teks markdown, dipakai bersama oleh
+document_health_analyzer.py (rule engine, backlink index, --history) dan
+workspace_snapshot.py (link adjacency di snapshot).
+
+Fitur:
+1. Markdown link [text](path) - URL http(s) dan anchor (#...) dilewati
+2. Referensi backtick: `File:` / `Related:` / `See:` / `Ref:` / panah `→`
+3. Item list berisi path .md dalam backtick
+4. Konten boleh str atau file yang di-memory-map (lihat mmap_scan.py)
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import re
+from typing import List, Tuple
+
+from mmap_scan import Content, compiled_pattern, span_text
+
+
+# ============================================================
+def extract_links_from_content(content: Content) -> List[Tuple[str, str]]:
+    """
+    Extract all links/references from markdown text.
+    `content` may also be a memory-mapped UTF-8 file (see mmap_scan.py):
+    the same patterns then run over bytes and only matched groups are decoded.
+    Returns: [(link_text, link_target), ...]
+    """
+    links = []
+
+    # Pattern 1: Markdown links [text](path)
+    for match in compiled_pattern(r'\[([^\]]+)\]\(([^)]+)\)', content).finditer(content):
+        text, target = map(span_text, match.groups())
+        if not target.startswith(('http://', 'https://', '#')):
+            links.append((text, target))
+
+    # Pattern 2: Backtick references
+    for pattern in [
+        r'(?:File|Related|See|Ref):\s*`([^`]+\.md)`',
+        r'- (?:File|Related):\s*`([^`]+\.md)`',
+        r'(?:→|->)\s*`([^`]+\.md)`',
+    ]:
+        for match in compiled_pattern(pattern, content, re.IGNORECASE).finditer(content):
+            target = span_text(match.group(1))
+            links.append((target, target))
+
+    # Pattern 3: Direct file references in lists
+    for match in compiled_pattern(r'^\s*-\s+`([^`]+\.md)`', content, re.MULTILINE).finditer(content):
+        target = span_text(match.group(1))
+        links.append((target, target))
+
+    return links
@@ -0,0 +1,109 @@
+"""
+Mmap Scan
+==========
+Scan file markdown besar di level bytes tanpa decode seluruh file ke str.
+
+Dipakai oleh document_health_analyzer.py (extract_links) dan
+failure_analyzer.py (parse failures.md) lewat WORKSPACE_FS.map_text().
+
+Fitur:
+1. File di-memory-map (read-only); halaman diambil dari page cache sesuai
+   kebutuhan regex, bukan di-copy ke buffer Python
+2. Pola regex ditulis sekali sebagai str lalu di-compile juga sebagai bytes
+   (UTF-8); compiled_pattern() memilih versi yang cocok dengan tipe konten,
+   jadi parser yang sama bisa jalan di atas str maupun mmap
+3. Hanya span yang match yang di-decode (span_text)
+4. Validasi UTF-8 per chunk (memori konstan); file non-UTF-8 jatuh kembali
+   ke path teks lama supaya perilaku error tetap sama
+5. Catatan: di pola bytes, \\s \\w \\d dan IGNORECASE hanya ASCII
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import re
+import codecs
+import mmap
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Pattern, Union
+
+# ============================================================
+# Bytes-like (mmap/bytes) or already-decoded text
+Content = Union[str, bytes, mmap.mmap]
+
+# Validation chunk: large enough for the ASCII fast path, small enough
+# that the transient copy does not show up in peak RSS
+VALIDATE_CHUNK = 1 << 20
+
+
+@lru_cache(maxsize=None)
+def _compile(pattern: str, flags: int, as_bytes: bool) -> Pattern:
+    return re.compile(pattern.encode('utf-8') if as_bytes else pattern, flags)
+
+
+def compiled_pattern(pattern: str, content: Content, flags: int = 0) -> Pattern:
+    """`pattern` compiled for the type of `content` (str, or UTF-8 bytes for mmap/bytes)"""
+    return _compile(pattern, flags, not isinstance(content, str))
+
+
+def span_text(value) -> str:
+    """Decode one matched group (no-op for str content)"""
+    if value is None or isinstance(value, str):
+        return value
+    return value.decode('utf-8')
+
+
+def is_utf8(buffer) -> bool:
+    """
+    True when the whole buffer is valid UTF-8.
+    Pure-ASCII chunks are accepted without decoding; only chunks with
+    multi-byte sequences go through an incremental decoder, whose output
+    is discarded right away.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        for offset in range(0, len(buffer), VALIDATE_CHUNK):
+            chunk = buffer[offset:offset + VALIDATE_CHUNK]
+            if chunk.isascii() and not decoder.getstate()[0]:
+                continue
+            decoder.decode(chunk)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+@contextmanager
+def map_file(path: str) -> Iterator[Content]:
+    """
+    Memory-map a file read-only. Empty files cannot be mapped and yield b''.
+    The map is closed on exit, so decoded spans must not be lazy views into it.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b''
+            return
+        if hasattr(mapped, 'madvise'):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+@contextmanager
+def map_text(path: str) -> Iterator[Content]:
+    """
+    Mapped UTF-8 file ready for bytes-level scanning.
+    Files that are not valid UTF-8 are read through the text path instead,
+    so they raise UnicodeDecodeError exactly like open(..., encoding='utf-8').
+    """
+    with map_file(path) as mapped:
+        if is_utf8(mapped):
+            yield mapped
+            return
+    with open(path, 'r', encoding='utf-8') as f:
+        yield f.read()
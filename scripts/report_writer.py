@@ -0,0 +1,95 @@
+"""
+Report Writer
+==============
+Helper untuk menyimpan report analyzer sebagai JSON atau NDJSON (opsional gzip).
+
+Fitur:
+1. JSON (default) - satu dokumen, sama seperti sebelumnya
+2. NDJSON - satu record per baris, ditulis satu per satu tanpa membangun
+   string JSON seluruh report di memory; consumer bisa membaca dengan memory
+   konstan. Report-nya sendiri tetap dibangun penuh oleh analyzer dulu
+3. --gzip untuk kompresi, --compact untuk separator tanpa spasi
+
+Setiap record NDJSON punya field "type". Record pertama selalu "meta",
+record terakhir selalu "summary".
+
+Report ditulis ke temp file lalu di-rename, jadi pembaca (atau run lain
+yang berjalan bersamaan) tidak pernah melihat report setengah jadi.
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import io
+import json
+import gzip
+from contextlib import contextmanager
+from typing import Dict, Iterable
+
+# ============================================================
+NDJSON_FORMAT_VERSION = 1
+
+OUTPUT_FORMATS = ['json', 'ndjson']
+
+
+def report_path(output_dir: str, basename: str, output_format: str, compress: bool) -> str:
+    """Build the output path, e.g. document_health_report.ndjson.gz"""
+    extension = '.ndjson' if output_format == 'ndjson' else '.json'
+    if compress:
+        extension += '.gz'
+    return os.path.join(output_dir, basename + extension)
+
+
+@contextmanager
+def open_output(path: str, compress: bool):
+    """Open a text stream that atomically replaces `path` on success"""
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    raw = open(temp_path, 'wb')
+    try:
+        if compress:
+            # mtime=0 keeps compressed output reproducible for identical reports
+            stream = gzip.GzipFile(fileobj=raw, mode='wb', mtime=0)
+        else:
+            stream = raw
+        with io.TextIOWrapper(stream, encoding='utf-8') as f:
+            yield f
+    except BaseException:
+        raw.close()
+        os.remove(temp_path)
+        raise
+    raw.close()
+    os.replace(temp_path, path)
+
+
+def write_json(path: str, data: Dict, compress: bool = False, compact: bool = False):
+    """Write a single JSON document"""
+    with open_output(path, compress) as f:
+        if compact:
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+        else:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def write_ndjson(path: str, records: Iterable[Dict], compress: bool = False) -> int:
+    """
+    Stream records to an NDJSON file, one compact JSON object per line.
+    Returns: number of records written
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    count = 0
+    with open_output(path, compress) as f:
+        for record in records:
+            f.write(encoder.encode(record))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def add_output_arguments(parser):
+    """Register report output options on an analyzer's argument parser"""
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default='json',
+                        help="Report format: single JSON document or streamed NDJSON records")
+    parser.add_argument('--gzip', action='store_true', help="Compress the report with gzip")
+    parser.add_argument('--compact', action='store_true',
+                        help="Use compact separators for JSON (NDJSON is always compact)")
@@ -0,0 +1,229 @@
+"""
+Scan Benchmark
+===============
+Script untuk membandingkan path teks (decode seluruh file ke str) dengan
+path mmap + pola bytes (lihat mmap_scan.py) pada file markdown besar.
+
+Fitur:
+1. Generate dokumen besar penuh link dan failures.md besar secara
+   deterministik (memakai synthetic_workspace_generator.py)
+2. Setiap kombinasi workload x mode dijalankan di proses terpisah, jadi
+   peak RSS satu mode tidak terbawa ke mode lain
+3. Catat wall time, throughput (MB/s) dan kenaikan peak RSS di atas
+   interpreter kosong; yang terbaik dari --repeat run disimpan
+4. Hasil kedua mode dibandingkan (jumlah link / entry harus identik)
+
+Catatan: halaman yang di-mmap ikut terhitung di RSS, tapi itu halaman
+page cache yang bersih (bisa dibuang kernel kapan saja), bukan heap Python.
+
+Jalankan:
+    python scan_benchmark.py                 # 64 MB per workload
+    python scan_benchmark.py --size-mb 256 --repeat 5
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import tempfile
+import argparse
+import resource
+import subprocess
+from typing import Dict, List
+
+from synthetic_workspace_generator import (
+    GeneratorConfig, format_link, plan_documents, render_document, render_failures
+)
+
+# ============================================================
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+WORKLOADS = ['links', 'failures']
+MODES = ['text', 'mmap']
+
+# Average bytes per generated failure entry, used to size failures.md
+FAILURE_ENTRY_BYTES = 330
+
+# ============================================================
+# Input generation
+# ============================================================
+def write_link_document(path: str, size_mb: float, seed: int):
+    """Concatenate linked synthetic documents into one file of ~size_mb"""
+    rng = random.Random(seed)
+    docs = plan_documents(GeneratorConfig(), rng)
+    target = int(size_mb * 1024 * 1024)
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        while written < target:
+            rel_path, doc_id, title = rng.choice(docs)
+            links = [format_link(rng, rel_path, rng.choice(docs)[0]) for _ in range(rng.randint(2, 8))]
+            chunk = render_document(rng, rel_path, doc_id, title, links)
+            f.write(chunk)
+            written += len(chunk.encode('utf-8'))
+
+
+def write_failure_log(path: str, size_mb: float, seed: int):
+    """Render a failures.md of ~size_mb"""
+    rng = random.Random(seed)
+    entries = max(1, int(size_mb * 1024 * 1024 / FAILURE_ENTRY_BYTES))
+    config = GeneratorConfig(failures=entries, patterns=40)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(render_failures(config, rng))
+
+
+# ============================================================
+# Child side: one workload/mode per fresh interpreter
+# ============================================================
+def _peak_rss_kb() -> int:
+    """
+    Peak RSS of this process. On Linux VmHWM is read instead of ru_maxrss:
+    ru_maxrss survives fork+exec, so it would include the parent's peak
+    from generating the input.
+    """
+    try:
+        with open('/proc/self/status', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_child(workload: str, mode: str, path: str) -> Dict:
+    """Scan `path` once and report time, peak RSS growth and a result fingerprint"""
+    sys.path.insert(0, SCRIPT_DIR)
+    from mmap_scan import map_text
+    from document_health_analyzer import extract_links_from_content
+    from failure_analyzer import parse_failure_entries, parse_existing_patterns
+
+    def scan(content) -> List[int]:
+        if workload == 'links':
+            return [len(extract_links_from_content(content))]
+        return [len(parse_failure_entries(content)), len(parse_existing_patterns(content))]
+
+    baseline_kb = _peak_rss_kb()
+    start = time.perf_counter()
+    if mode == 'text':
+        with open(path, 'r', encoding='utf-8') as f:
+            result = scan(f.read())
+    else:
+        with map_text(path) as content:
+            result = scan(content)
+    wall_s = time.perf_counter() - start
+
+    return {
+        "wall_ms": round(wall_s * 1000, 1),
+        "mb_per_s": round(os.path.getsize(path) / 1024 / 1024 / wall_s, 1),
+        "peak_rss_kb": _peak_rss_kb() - baseline_kb,
+        "result": result,
+    }
+
+
+# ============================================================
+# Parent side
+# ============================================================
+def run_mode(workload: str, mode: str, path: str, repeat: int) -> Dict:
+    """Run one workload/mode `repeat` times; keep the fastest time and lowest RSS"""
+    # The analyzers resolve a workspace at import time; point them at the input folder
+    env = dict(os.environ, AGENT_WORKSPACE=os.path.dirname(path))
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', workload, mode, path],
+            env=env, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{workload}/{mode} failed:\n{proc.stderr}")
+        run = json.loads(proc.stdout)
+        if best is None:
+            best = run
+        else:
+            best['wall_ms'] = min(best['wall_ms'], run['wall_ms'])
+            best['mb_per_s'] = max(best['mb_per_s'], run['mb_per_s'])
+            best['peak_rss_kb'] = min(best['peak_rss_kb'], run['peak_rss_kb'])
+    return best
+
+
+def print_results(results: Dict[str, Dict[str, Dict]], sizes: Dict[str, int]):
+    print("\n" + "="*60)
+    print("📊 SCAN BENCHMARK RESULTS")
+    print("="*60)
+
+    for workload, modes in results.items():
+        print(f"\n⏱️ {workload} ({sizes[workload] / 1024 / 1024:.1f} MB)")
+        print(f"   {'mode':<8} {'wall ms':>10} {'MB/s':>8} {'peak RSS KB':>12}  result")
+        for mode, run in modes.items():
+            print(
+                f"   {mode:<8} {run['wall_ms']:>10.1f} {run['mb_per_s']:>8.1f} "
+                f"{run['peak_rss_kb']:>12}  {run['result']}"
+            )
+        text, mapped = modes['text'], modes['mmap']
+        if mapped['peak_rss_kb'] > 0:
+            print(f"   → peak RSS x{text['peak_rss_kb'] / mapped['peak_rss_kb']:.1f} lower with mmap, "
+                  f"throughput x{mapped['mb_per_s'] / text['mb_per_s']:.2f}")
+
+
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text vs mmap scanning of large markdown files")
+    parser.add_argument('--size-mb', type=float, default=64.0, help="Size of each generated file")
+    parser.add_argument('--workloads', nargs='+', choices=WORKLOADS, default=WORKLOADS)
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per mode (best is kept)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(*args.child)))
+        return 0
+
+    print("\n" + "="*60)
+    print("🏁 SCAN BENCHMARK")
+    print("="*60)
+
+    tmp_root = tempfile.mkdtemp(prefix="scan_bench_")
+    try:
+        results: Dict[str, Dict[str, Dict]] = {}
+        sizes: Dict[str, int] = {}
+        for workload in args.workloads:
+            path = os.path.join(tmp_root, f"{workload}.md")
+            print(f"\n🧪 Generating {workload} input ({args.size_mb:g} MB)...")
+            if workload == 'links':
+                write_link_document(path, args.size_mb, args.seed)
+            else:
+                write_failure_log(path, args.size_mb, args.seed)
+            sizes[workload] = os.path.getsize(path)
+
+            results[workload] = {}
+            for mode in MODES:
+                print(f"▶️ {workload}/{mode} (x{args.repeat})...")
+                results[workload][mode] = run_mode(workload, mode, path, args.repeat)
+    finally:
+        shutil.rmtree(tmp_root, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps({"sizes": sizes, "results": results}, indent=2))
+    else:
+        print_results(results, sizes)
+
+    exit_code = 0
+    for workload, modes in results.items():
+        if modes['text']['result'] != modes['mmap']['result']:
+            print(f"\n🔴 {workload}: text and mmap results differ")
+            exit_code = 1
+
+    print("\n" + "="*60)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,401 @@
+"""
+Search Index
+=============
+Inverted index full-text (BM25) atas dokumen markdown di workspace Agent-0,
+disimpan compact di disk di samping workspace_index.json.
+
+Fitur:
+1. Tokenisasi sederhana (huruf/angka, lowercase); nama file ikut di-index
+2. Posting list per term disimpan sebagai array doc-id yang di-delta-encode
+   + array term frequency; tipe array (8/16/32 bit) dipilih per term sesuai
+   nilai terbesarnya, jadi decode cukup array.frombytes + accumulate (C speed)
+3. Ranking BM25 (k1=1.2, b=0.75) dengan MaxScore pruning: term diproses dari
+   batas skor tertinggi; begitu sisa term tidak bisa lagi membawa dokumen baru
+   ke top-k, term sisanya hanya dihitung untuk kandidat yang masih mungkin
+   masuk. --folder dipetakan ke rentang doc id (path disimpan terurut)
+4. Update incremental - hanya file yang mtime/size-nya berubah yang dibaca
+   dan di-tokenize ulang; file yang dihapus dibuang dari posting list
+5. CLI: `python search_index.py search "query" [-k N] [--folder Plan]`
+   dan `python search_index.py update [--workspace PATH]`
+
+Format file (little-endian):
+    MAGIC | u32 panjang header | header JSON (docs + vocabulary) | postings
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import heapq
+import struct
+import argparse
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import List, Dict, Tuple, Optional
+
+# ============================================================
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INDEX = os.path.join(SCRIPT_DIR, "workspace_search.idx")
+
+MAGIC = b"BM25IDX1"
+HEADER_LENGTH = struct.Struct("<I")
+
+# Folders indexed (recursively, so nested Knowledge domains are included)
+SEARCH_FOLDERS = ['Topic', 'Find', 'Plan', 'Knowledge', 'Research']
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 40
+
+
+# ============================================================
+def tokenize(text: str) -> List[str]:
+    return [
+        t for t in TOKEN_PATTERN.findall(text.lower())
+        if MIN_TOKEN_LENGTH <= len(t) <= MAX_TOKEN_LENGTH
+    ]
+
+
+def document_title(content: str, default: str) -> str:
+    for line in content.splitlines():
+        if line.startswith('# '):
+            return line[2:].strip()
+    return default
+
+
+def smallest_typecode(largest: int) -> str:
+    if largest < 1 << 8:
+        return 'B'
+    if largest < 1 << 16:
+        return 'H'
+    return 'I'
+
+
+def encode_array(values: List[int], typecode: str) -> bytes:
+    packed = array(typecode, values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def decode_array(data: bytes, typecode: str) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def scan_workspace(workspace: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Stat every markdown file under SEARCH_FOLDERS without opening it.
+    Returns: {relative_path: (mtime_ns, size)}
+    """
+    files = {}
+    stack = [os.path.join(workspace, folder) for folder in SEARCH_FOLDERS]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        for entry in entries:
+            if entry.is_dir():
+                stack.append(entry.path)
+            elif entry.name.endswith('.md'):
+                stat = entry.stat()
+                rel_path = os.path.relpath(entry.path, workspace).replace(os.sep, '/')
+                files[rel_path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+# ============================================================
+@dataclass
+class SearchHit:
+    path: str
+    title: str
+    score: float
+
+
+@dataclass
+class SearchIndex:
+    """Loaded index; postings stay encoded until a query needs them"""
+    workspace: str = ""
+    paths: List[str] = field(default_factory=list)
+    titles: List[str] = field(default_factory=list)
+    lengths: List[int] = field(default_factory=list)
+    stats: List[Tuple[int, int]] = field(default_factory=list)
+    # term -> (offset, df, id code, tf code, max tf)
+    vocabulary: Dict[str, Tuple[int, int, str, str, int]] = field(default_factory=dict)
+    postings: bytes = b""
+    _norms: Optional[List[float]] = None
+    _shortest: float = BM25_K1
+
+    @property
+    def average_length(self) -> float:
+        return sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+
+    def term_postings(self, term: str) -> Tuple[List[int], array]:
+        """Decoded (doc ids, term frequencies) for one term"""
+        offset, df, id_code, tf_code, _ = self.vocabulary[term]
+        id_bytes = df * array(id_code).itemsize
+        tf_bytes = df * array(tf_code).itemsize
+        deltas = decode_array(self.postings[offset:offset + id_bytes], id_code)
+        tfs = decode_array(self.postings[offset + id_bytes:offset + id_bytes + tf_bytes], tf_code)
+        return list(accumulate(deltas)), tfs
+
+    def folder_range(self, folder: Optional[str]) -> Tuple[int, int]:
+        """Doc id range [low, high) of a folder; paths are sorted"""
+        if not folder:
+            return 0, len(self.paths)
+        prefix = folder.strip('/') + '/'
+        return bisect_left(self.paths, prefix), bisect_left(self.paths, prefix + '\U0010ffff')
+
+    def document_norms(self) -> List[float]:
+        """Per-document BM25 length normalization, computed once per load"""
+        if self._norms is None:
+            average = self.average_length or 1.0
+            self._norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / average) for length in self.lengths]
+            self._shortest = min(self._norms, default=BM25_K1)
+        return self._norms
+
+    def search(self, query: str, limit: int = 10, folder: Optional[str] = None) -> List[SearchHit]:
+        """Rank documents for `query` with BM25 (exact top-k, MaxScore pruning)"""
+        norms = self.document_norms()
+        shortest = self._shortest
+        total = len(self.paths)
+        low, high = self.folder_range(folder)
+
+        # (upper bound, weight, term): best possible contribution of each term
+        terms = []
+        for term in set(tokenize(query)):
+            if term in self.vocabulary:
+                df, max_tf = self.vocabulary[term][1], self.vocabulary[term][4]
+                weight = math.log(1 + (total - df + 0.5) / (df + 0.5)) * (BM25_K1 + 1)
+                terms.append((weight * max_tf / (max_tf + shortest), weight, term))
+        terms.sort(reverse=True)
+        remaining = [sum(t[0] for t in terms[i:]) for i in range(len(terms))]
+
+        scores: Dict[int, float] = {}
+        for i, (_, weight, term) in enumerate(terms):
+            doc_ids, tfs = self.term_postings(term)
+            if low or high < total:
+                start, end = bisect_left(doc_ids, low), bisect_left(doc_ids, high)
+                doc_ids, tfs = doc_ids[start:end], tfs[start:end]
+
+            threshold = heapq.nlargest(limit, scores.values())[-1] if len(scores) >= limit else 0.0
+            if len(scores) >= limit and remaining[i] <= threshold:
+                # No unseen document can reach the top-k any more
+                frequencies = dict(zip(doc_ids, tfs))
+                for doc_id in [d for d, s in scores.items() if s + remaining[i] > threshold]:
+                    tf = frequencies.get(doc_id)
+                    if tf:
+                        scores[doc_id] += weight * tf / (tf + norms[doc_id])
+                continue
+
+            get = scores.get
+            for doc_id, tf in zip(doc_ids, tfs):
+                scores[doc_id] = get(doc_id, 0.0) + weight * tf / (tf + norms[doc_id])
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [SearchHit(self.paths[d], self.titles[d], round(s, 4)) for d, s in best]
+
+
+def load_index(path: str = DEFAULT_INDEX) -> SearchIndex:
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"Not a search index: {path}")
+    start = len(MAGIC) + HEADER_LENGTH.size
+    (header_length,) = HEADER_LENGTH.unpack_from(data, len(MAGIC))
+    header = json.loads(data[start:start + header_length].decode('utf-8'))
+    index = SearchIndex(
+        workspace=header["workspace"],
+        paths=header["paths"],
+        titles=header["titles"],
+        lengths=header["lengths"],
+        stats=[tuple(s) for s in header["stats"]],
+        vocabulary={term: tuple(entry) for term, entry in header["vocabulary"].items()},
+        postings=memoryview(data)[start + header_length:],
+    )
+    index.document_norms()
+    return index
+
+
+def write_index(path: str, workspace: str, documents: Dict[str, Dict], postings: Dict[str, Dict[str, int]]):
+    """
+    Encode and atomically write an index.
+    documents: {rel_path: {"title", "length", "stat"}}; postings: {term: {rel_path: tf}}
+    """
+    paths = sorted(documents)
+    doc_ids = {p: i for i, p in enumerate(paths)}
+
+    vocabulary = {}
+    chunks = []
+    offset = 0
+    for term in sorted(postings):
+        entries = sorted((doc_ids[p], tf) for p, tf in postings[term].items())
+        ids = [doc_id for doc_id, _ in entries]
+        deltas = [ids[0]] + [b - a for a, b in zip(ids, ids[1:])]
+        tfs = [tf for _, tf in entries]
+        id_code, tf_code = smallest_typecode(max(deltas)), smallest_typecode(max(tfs))
+        chunk = encode_array(deltas, id_code) + encode_array(tfs, tf_code)
+        vocabulary[term] = [offset, len(entries), id_code, tf_code, max(tfs)]
+        chunks.append(chunk)
+        offset += len(chunk)
+
+    header = json.dumps({
+        "workspace": workspace,
+        "paths": paths,
+        "titles": [documents[p]["title"] for p in paths],
+        "lengths": [documents[p]["length"] for p in paths],
+        "stats": [list(documents[p]["stat"]) for p in paths],
+        "vocabulary": vocabulary,
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    with open(temp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(temp_path, path)
+
+
+def update_index(workspace: str, path: str = DEFAULT_INDEX) -> Dict[str, int]:
+    """
+    Bring the on-disk index up to date with the workspace. Only files whose
+    (mtime, size) changed are read and tokenized; postings of unchanged
+    files are carried over from the existing index.
+    Returns: counts of added / updated / removed / unchanged documents
+    """
+    current = scan_workspace(workspace)
+
+    try:
+        old = load_index(path)
+        if old.workspace != workspace:
+            old = SearchIndex()
+    except (FileNotFoundError, ValueError):
+        old = SearchIndex()
+    old_stats = dict(zip(old.paths, old.stats))
+
+    changed = [p for p, stat in current.items() if old_stats.get(p) != stat]
+    removed = [p for p in old_stats if p not in current]
+    result = {
+        "added": sum(1 for p in changed if p not in old_stats),
+        "updated": sum(1 for p in changed if p in old_stats),
+        "removed": len(removed),
+        "unchanged": len(current) - len(changed),
+        "documents": len(current),
+    }
+    if not changed and not removed and os.path.exists(path):
+        return result
+
+    # Carry over unchanged documents straight from the encoded postings
+    dropped = set(changed) | set(removed)
+    documents = {}
+    for doc_id, rel_path in enumerate(old.paths):
+        if rel_path not in dropped:
+            documents[rel_path] = {
+                "title": old.titles[doc_id], "length": old.lengths[doc_id], "stat": old.stats[doc_id]
+            }
+    postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+    for term in old.vocabulary:
+        doc_ids, tfs = old.term_postings(term)
+        for doc_id, tf in zip(doc_ids, tfs):
+            rel_path = old.paths[doc_id]
+            if rel_path not in dropped:
+                postings[term][rel_path] = tf
+
+    for rel_path in changed:
+        try:
+            with open(os.path.join(workspace, rel_path), 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        name = os.path.splitext(os.path.basename(rel_path))[0]
+        tokens = tokenize(name) + tokenize(content)
+        documents[rel_path] = {
+            "title": document_title(content, os.path.basename(rel_path)),
+            "length": len(tokens),
+            "stat": current[rel_path],
+        }
+        for term, tf in Counter(tokens).items():
+            postings[term][rel_path] = tf
+
+    write_index(path, workspace, documents, postings)
+    return result
+
+
+def describe_update(result: Dict[str, int]) -> str:
+    return (f"{result['documents']} docs ({result['added']} added, {result['updated']} updated, "
+            f"{result['removed']} removed, {result['unchanged']} unchanged)")
+
+
+# ============================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BM25 full-text search over the Agent-0 workspace")
+    parser.add_argument('--index', default=DEFAULT_INDEX, metavar='PATH',
+                        help=f"Index file (default: {os.path.basename(DEFAULT_INDEX)})")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    search_parser = subcommands.add_parser('search', help="Rank documents for a query")
+    search_parser.add_argument('query', nargs='+')
+    search_parser.add_argument('-k', '--limit', type=int, default=10, help="Results to show (default: 10)")
+    search_parser.add_argument('--folder', help="Only documents under this folder (e.g. Plan)")
+    search_parser.add_argument('--json', action='store_true', help="Print results as JSON")
+
+    update_parser = subcommands.add_parser('update', help="Build or incrementally update the index")
+    update_parser.add_argument('--workspace', metavar='PATH',
+                               help="Workspace folder (default: AGENT_WORKSPACE, else the one the index was built from)")
+    args = parser.parse_args()
+    if args.command == 'search' and args.limit < 1:
+        parser.error("--limit must be at least 1")
+
+    if args.command == 'update':
+        workspace = args.workspace or os.environ.get('AGENT_WORKSPACE')
+        if not workspace and os.path.exists(args.index):
+            workspace = load_index(args.index).workspace
+        if not workspace:
+            parser.error("no workspace: pass --workspace or run analyze_workspace.py first")
+        start = time.perf_counter()
+        result = update_index(os.path.abspath(workspace), args.index)
+        print(f"🔎 Search index: {describe_update(result)} in {(time.perf_counter() - start) * 1000:.0f}ms")
+        print(f"💾 Saved to: {args.index}")
+        exit(0)
+
+    try:
+        start = time.perf_counter()
+        index = load_index(args.index)
+        load_ms = (time.perf_counter() - start) * 1000
+    except FileNotFoundError:
+        print(f"⚠️ Search index not found: {args.index}")
+        print("   Tip: run analyze_workspace.py (or `search_index.py update`) first")
+        exit(1)
+
+    query = " ".join(args.query)
+    start = time.perf_counter()
+    hits = index.search(query, args.limit, args.folder)
+    query_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps([hit.__dict__ for hit in hits], indent=2, ensure_ascii=False))
+        exit(0)
+
+    print(f"\n🔎 {query!r}: {len(hits)} result(s) in {query_ms:.2f}ms "
+          f"(index of {len(index.paths)} docs loaded in {load_ms:.1f}ms)\n")
+    for rank, hit in enumerate(hits, 1):
+        print(f"  {rank:>2}. {hit.score:>7.3f}  {hit.path}")
+        print(f"      {hit.title}")
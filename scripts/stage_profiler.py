@@ -0,0 +1,223 @@
+"""
+Stage Profiler
+===============
+Helper untuk mencatat timing per stage di document_health_analyzer.py dan failure_analyzer.py.
+
+Fitur:
+1. Wall time dan CPU time per stage
+2. Bytes read dan jumlah file yang dibuka per stage (via audit hook)
+3. Daftar N file paling lambat di-parse
+4. Export ke cProfile stats atau Chrome trace-event JSON (chrome://tracing, Perfetto)
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+import threading
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import List, Dict, Optional, Callable
+
+# ============================================================
+# Audit hooks cannot be removed once installed, so a single hook
+# forwards to whichever profiler is currently active.
+_active_profiler = None
+_hook_installed = False
+
+
+def _audit_hook(event: str, args):
+    profiler = _active_profiler
+    if profiler is None or event != 'open':
+        return
+    path, mode = args[0], args[1]
+    profiler._files_opened += 1
+    if isinstance(path, str) and (mode is None or 'r' in mode):
+        try:
+            profiler._bytes_read += os.path.getsize(path)
+        except OSError:
+            pass
+
+
+# ============================================================
+class StageProfiler:
+    """
+    Collects per-stage metrics. When disabled every method is a no-op,
+    so analyzers can call it unconditionally.
+    """
+
+    def __init__(self, enabled: bool = False, slowest: int = 10, cprofile: bool = False):
+        self.enabled = enabled
+        self.slowest = slowest
+        self.stages: List[Dict] = []
+        self.file_times: Dict[str, Dict] = {}
+        self.trace_events: List[Dict] = []
+        self.rule_times: Dict[str, float] = {}
+        self._files_opened = 0
+        self._bytes_read = 0
+        self._origin = time.perf_counter()
+        self._cprofile = cProfile.Profile() if enabled and cprofile else None
+
+    # --------------------------------------------------------
+    def start(self):
+        global _active_profiler, _hook_installed
+        if not self.enabled:
+            return
+        if not _hook_installed:
+            sys.addaudithook(_audit_hook)
+            _hook_installed = True
+        _active_profiler = self
+        self._origin = time.perf_counter()
+        if self._cprofile:
+            self._cprofile.enable()
+
+    def stop(self):
+        global _active_profiler
+        if not self.enabled:
+            return
+        if self._cprofile:
+            self._cprofile.disable()
+        if _active_profiler is self:
+            _active_profiler = None
+
+    def _trace(self, name: str, category: str, start: float, end: float, args: Optional[Dict] = None):
+        self.trace_events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args or {},
+        })
+
+    # --------------------------------------------------------
+    def stage(self, name: str):
+        """Context manager measuring one analysis stage"""
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name: str):
+        opened_before = self._files_opened
+        read_before = self._bytes_read
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            record = {
+                "stage": name,
+                "wall_ms": round((end - start) * 1000, 3),
+                "cpu_ms": round((time.process_time() - cpu_start) * 1000, 3),
+                "bytes_read": self._bytes_read - read_before,
+                "files_opened": self._files_opened - opened_before,
+            }
+            self.stages.append(record)
+            self._trace(name, "stage", start, end, record)
+
+    def track_files(self, func: Callable, root: Optional[str] = None) -> Callable:
+        """
+        Wrap a per-file parse function whose first argument is the file path.
+        Time is accumulated per path (relative to root) across calls.
+        """
+        if not self.enabled:
+            return func
+
+        @wraps(func)
+        def wrapper(file_path, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(file_path, *args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                key = os.path.relpath(file_path, root) if root else file_path
+                entry = self.file_times.setdefault(key, {"ms": 0.0, "calls": 0})
+                entry["ms"] += (end - start) * 1000
+                entry["calls"] += 1
+                self._trace(key, "file", start, end)
+
+        return wrapper
+
+    def record_rules(self, elapsed_ms: Dict[str, float]):
+        """Store per-rule time (ms) measured by a rule engine"""
+        if self.enabled:
+            self.rule_times.update(elapsed_ms)
+
+    # --------------------------------------------------------
+    def timings(self) -> Optional[Dict]:
+        """Build the `timings` section of a report (None when disabled)"""
+        if not self.enabled:
+            return None
+        slowest = sorted(self.file_times.items(), key=lambda item: item[1]["ms"], reverse=True)
+        return {
+            "stages": self.stages,
+            "total_wall_ms": round(sum(s["wall_ms"] for s in self.stages), 3),
+            "total_cpu_ms": round(sum(s["cpu_ms"] for s in self.stages), 3),
+            "rules": self.rule_times,
+            "slowest_files": [
+                {"file": path, "ms": round(data["ms"], 3), "calls": data["calls"]}
+                for path, data in slowest[:self.slowest]
+            ],
+        }
+
+    def dump_cprofile(self, output_path: str):
+        if self._cprofile:
+            self._cprofile.dump_stats(output_path)
+
+    def dump_trace(self, output_path: str):
+        """Write Chrome trace-event JSON"""
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": self.trace_events, "displayTimeUnit": "ms"}, f)
+
+
+def add_profile_arguments(parser):
+    """Register --profile options on an analyzer's argument parser"""
+    parser.add_argument('--profile', action='store_true',
+                        help="Record per-stage timings into the report")
+    parser.add_argument('--profile-slowest', type=int, default=10, metavar='N',
+                        help="Number of slowest files to list (default: 10)")
+    parser.add_argument('--profile-stats', metavar='PATH',
+                        help="Also dump cProfile stats to PATH (implies --profile)")
+    parser.add_argument('--profile-trace', metavar='PATH',
+                        help="Also dump Chrome trace-event JSON to PATH (implies --profile)")
+
+
+def profiler_from_args(args) -> StageProfiler:
+    enabled = bool(args.profile or args.profile_stats or args.profile_trace)
+    return StageProfiler(enabled=enabled, slowest=args.profile_slowest, cprofile=bool(args.profile_stats))
+
+
+def print_timings(timings: Optional[Dict]):
+    """Print the timings section of a report"""
+    if not timings:
+        return
+    print(f"\n⏱️ Timings (total {timings['total_wall_ms']:.1f}ms wall, {timings['total_cpu_ms']:.1f}ms CPU):")
+    for s in timings['stages']:
+        print(
+            f"   • {s['stage']:<18} {s['wall_ms']:>9.1f}ms wall {s['cpu_ms']:>9.1f}ms cpu "
+            f"{s['files_opened']:>6} files {s['bytes_read'] / 1024:>10.1f}KB"
+        )
+    for name, ms in timings.get('rules', {}).items():
+        print(f"     ↳ rule {name:<18} {ms:>9.1f}ms")
+    if timings['slowest_files']:
+        print(f"\n🐢 Slowest files:")
+        for item in timings['slowest_files']:
+            print(f"   • {item['ms']:>8.1f}ms ({item['calls']}x) {item['file']}")
+
+
+def finish_profiling(profiler: StageProfiler, args):
+    """Write optional profiler artifacts requested on the command line"""
+    if args.profile_stats:
+        profiler.dump_cprofile(args.profile_stats)
+        print(f"💾 cProfile stats saved to: {args.profile_stats}")
+    if args.profile_trace:
+        profiler.dump_trace(args.profile_trace)
+        print(f"💾 Trace saved to: {args.profile_trace}")
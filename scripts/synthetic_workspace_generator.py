@@ -0,0 +1,405 @@
+"""
+Synthetic Workspace Generator
+==============================
+Script untuk membuat workspace tiruan berbentuk Agent-0 secara deterministik.
+
+Fitur:
+1. Generate Topic/Plan/Find/Research/Knowledge dengan jumlah file yang bisa diatur
+2. Link antar dokumen dengan density, rasio broken link dan orphan yang bisa diatur
+3. Index.md per folder (dengan rasio file yang sengaja tidak terdaftar)
+4. Dokumen besar (multi-MB) untuk stress test parser
+5. Log/failures.md dengan N entry dan P pattern
+6. Near-duplicate copies (--duplicate-ratio) dengan sebagian kecil kata diubah
+
+Seed yang sama selalu menghasilkan workspace yang identik (byte-for-byte),
+sehingga hasil benchmark bisa dibandingkan antar run.
+
+Jalankan: python synthetic_workspace_generator.py OUTPUT_DIR [--scale medium]
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import random
+import argparse
+from datetime import date, timedelta
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Tuple
+
+# ============================================================
+# Document kinds: folder -> ID prefix
+DOC_KINDS = {
+    'Topic': 'TOPIC',
+    'Plan': 'PLAN',
+    'Find': 'FIND',
+    'Research': 'RESEARCH',
+}
+
+# Fixed epoch so generated dates never depend on the clock
+BASE_DATE = date(2025, 1, 1)
+
+WORDS = (
+    "agent workspace index plan topic finding research knowledge domain "
+    "cli framework install config template security audit build release "
+    "prompt flow error message container usecase service validation path "
+    "spinner banner gradient theme logger executor filesystem doctor create "
+    "list command option default strict type export module bundle test"
+).split()
+
+FAILURE_TOOLS = ['write_to_file', 'run_command', 'replace_file_content', 'view_file', 'Config']
+
+# Error templates per group; {x} is replaced to make entries distinct
+# while keeping the same normalized group key in failure_analyzer.py
+FAILURE_ERRORS = [
+    "Command stuck after `{x}` for 120s",
+    "File `{x}` not found",
+    "Permission denied on `{x}`",
+    "File `{x}` was not deleted after cleanup",
+    "Type mismatch in `{x}` with exactOptionalPropertyTypes",
+    "Unexpected token in `{x}`",
+    "Module `{x}` cannot be resolved",
+]
+
+# Named presets for quick use
+SCALES = {
+    'small': dict(topics=20, plans=40, finds=10, research=5,
+                  knowledge_domains=3, knowledge_files=10,
+                  large_docs=0, failures=30, patterns=3),
+    'medium': dict(topics=200, plans=400, finds=100, research=50,
+                   knowledge_domains=10, knowledge_files=50,
+                   large_docs=2, failures=500, patterns=10),
+    'large': dict(topics=2000, plans=4000, finds=1000, research=500,
+                  knowledge_domains=40, knowledge_files=150,
+                  large_docs=5, failures=5000, patterns=40),
+}
+
+
+@dataclass
+class GeneratorConfig:
+    """Parameters that fully determine a generated workspace"""
+    seed: int = 42
+    topics: int = 20
+    plans: int = 40
+    finds: int = 10
+    research: int = 5
+    knowledge_domains: int = 3
+    knowledge_files: int = 10
+    knowledge_depth: int = 1       # nesting levels inside each Knowledge domain
+    link_density: float = 3.0      # average outgoing links per document
+    broken_ratio: float = 0.05     # fraction of links pointing to missing files
+    orphan_ratio: float = 0.10     # fraction of documents never linked to
+    unindexed_ratio: float = 0.05  # fraction of documents left out of index.md
+    duplicate_ratio: float = 0.0   # fraction of documents that get a near-duplicate copy
+    duplicate_noise: float = 0.01  # fraction of words changed in each copy
+    large_docs: int = 0
+    large_doc_mb: float = 2.0
+    failures: int = 30
+    patterns: int = 3
+
+
+# ============================================================
+def make_words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def make_slug(rng: random.Random) -> str:
+    return "_".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+
+
+def plan_documents(config: GeneratorConfig, rng: random.Random) -> List[Tuple[str, str, str]]:
+    """
+    Decide every document up front.
+    Returns: [(rel_path, doc_id, title), ...] in a stable order
+    """
+    docs = []
+    counts = {
+        'Topic': config.topics,
+        'Plan': config.plans,
+        'Find': config.finds,
+        'Research': config.research,
+    }
+    for folder, prefix in DOC_KINDS.items():
+        for n in range(1, counts[folder] + 1):
+            doc_id = f"{prefix}_{n:03d}"
+            slug = make_slug(rng)
+            docs.append((f"{folder}/{doc_id}_{slug}.md", doc_id, slug.replace('_', ' ').title()))
+
+    for d in range(1, config.knowledge_domains + 1):
+        domain = f"domain_{d:02d}"
+        for n in range(1, config.knowledge_files + 1):
+            doc_id = f"KNOW_{d:02d}_{n:03d}"
+            slug = make_slug(rng)
+            # Spread files evenly over the nesting levels of the domain
+            level = n % max(config.knowledge_depth, 1)
+            folder = "/".join([domain] + [f"level_{k}" for k in range(1, level + 1)])
+            docs.append((f"Knowledge/{folder}/{doc_id}_{slug}.md", doc_id, slug.replace('_', ' ').title()))
+
+    return docs
+
+
+def format_link(rng: random.Random, source: str, target: str) -> str:
+    """Render a reference in one of the styles document_health_analyzer.py understands"""
+    source_folder = source.split('/')[0]
+    target_folder = target.split('/')[0]
+    filename = os.path.basename(target)
+
+    if source_folder == target_folder and target.count('/') == 1:
+        href = filename
+    elif target.count('/') == 1:
+        href = f"../{target}" if rng.random() < 0.3 else target
+    else:
+        href = f"../{target}"
+
+    style = rng.randint(0, 3)
+    if style == 0:
+        return f"- [{filename[:-3]}]({href})"
+    if style == 1:
+        return f"- File: `{target}`"
+    if style == 2:
+        return f"→ `{filename}`"
+    return f"- `{filename}`"
+
+
+def render_document(
+    rng: random.Random,
+    rel_path: str,
+    doc_id: str,
+    title: str,
+    links: List[str],
+    target_bytes: int = 0
+) -> str:
+    created = BASE_DATE + timedelta(days=rng.randint(0, 365))
+    parts = [
+        f"# {title}\n\n",
+        f"{make_words(rng, rng.randint(10, 30)).capitalize()}.\n\n",
+        f"**ID:** {doc_id} | **Status:** ✅ Done\n",
+        f"**Dibuat:** {created.isoformat()}\n\n",
+        "---\n\n",
+        "## 🎯 Tujuan\n\n",
+        f"{make_words(rng, rng.randint(30, 80)).capitalize()}.\n\n",
+        "## 🔗 Related\n\n",
+    ]
+    for link in links:
+        parts.append(f"{link}\n")
+    parts.append("\n## 📋 Detail\n\n")
+    for _ in range(rng.randint(2, 6)):
+        parts.append(f"{make_words(rng, rng.randint(20, 60)).capitalize()}.\n\n")
+
+    content = "".join(parts)
+
+    if target_bytes > len(content):
+        # Pad with deterministic filler sections until the size is reached
+        filler = []
+        size = len(content.encode('utf-8'))
+        section = 0
+        while size < target_bytes:
+            section += 1
+            chunk = f"### Section {section}\n\n{make_words(rng, 200).capitalize()}.\n\n"
+            filler.append(chunk)
+            size += len(chunk.encode('utf-8'))
+        content += "".join(filler)
+
+    return content
+
+
+def mutate_words(rng: random.Random, content: str, noise: float) -> str:
+    """Replace roughly `noise` of the plain words, keeping markdown lines intact"""
+    lines = []
+    for line in content.split('\n'):
+        tokens = line.split(' ')
+        for i, token in enumerate(tokens):
+            if token.isalpha() and rng.random() < noise:
+                tokens[i] = rng.choice(WORDS)
+        lines.append(' '.join(tokens))
+    return '\n'.join(lines)
+
+
+def render_index(folder_name: str, entries: List[Tuple[str, str]]) -> str:
+    """Render an index.md table like the hand-written ones in Agent-0"""
+    content = f"# Index {folder_name}\n\n"
+    content += "| File | Judul |\n"
+    content += "| :--- | :---- |\n"
+    for filename, title in entries:
+        content += f"| `{filename}` | {title} |\n"
+    return content
+
+
+def render_failures(config: GeneratorConfig, rng: random.Random) -> str:
+    """Render Log/failures.md with N entries spread over groups, P of them patterned"""
+    groups = [(tool, error) for tool in FAILURE_TOOLS for error in FAILURE_ERRORS]
+    rng.shuffle(groups)
+    patterned_groups = groups[:config.patterns]
+
+    parts = [
+        "# Failure Log\n\n",
+        "Log kegagalan tool/command untuk pembelajaran Agent.\n\n",
+        "---\n\n",
+        "## 📝 Log Entries\n\n",
+    ]
+    for n in range(1, config.failures + 1):
+        # Bias toward the first groups so some cross PATTERN_THRESHOLD
+        index = min(int(rng.expovariate(0.15)), len(groups) - 1)
+        tool, error = groups[index]
+        day = BASE_DATE + timedelta(days=rng.randint(0, 365))
+        pattern_id = "-"
+        if (tool, error) in patterned_groups and rng.random() < 0.7:
+            pattern_id = f"P-{patterned_groups.index((tool, error)) + 1:03d}"
+        parts.append(f"### F-{n:03d} | {tool} | {day.isoformat()}\n\n")
+        parts.append(f"- **Command/Params:** src/{make_slug(rng)}.ts - {make_words(rng, 4)}\n")
+        parts.append(f"- **Error:** {error.format(x=make_slug(rng) + '.ts')}\n")
+        parts.append(f"- **Context:** {make_words(rng, 8)}\n")
+        parts.append(f"- **Workaround:** {make_words(rng, 10)}\n")
+        parts.append(f"- **Pattern ID:** {pattern_id}\n\n")
+        parts.append("---\n\n")
+
+    parts.append("## 🔍 Identified Patterns\n\n")
+    for i, (tool, error) in enumerate(patterned_groups, 1):
+        occurrences = rng.randint(3, 12)
+        name = error.split('`')[0].strip().title()
+        parts.append(f"### P-{i:03d}: {tool} {name}\n\n")
+        parts.append(f"- **Description:** {make_words(rng, 12)}\n")
+        parts.append(f"- **Occurrences:** {occurrences}\n")
+        parts.append(f"- **Created:** {BASE_DATE.isoformat()}\n\n")
+
+    parts.append("---\n\n## 📦 Archived Patterns\n\n_Belum ada._\n")
+    return "".join(parts)
+
+
+# ============================================================
+def generate_workspace(output_dir: str, config: GeneratorConfig) -> Dict[str, int]:
+    """
+    Write a synthetic workspace to output_dir.
+    Returns: summary counts
+    """
+    rng = random.Random(config.seed)
+    docs = plan_documents(config, rng)
+    paths = [d[0] for d in docs]
+
+    # Orphans are never chosen as link targets
+    orphan_count = int(len(docs) * config.orphan_ratio)
+    orphans = set(rng.sample(paths, orphan_count)) if orphan_count else set()
+    linkable = [p for p in paths if p not in orphans]
+
+    # Large documents
+    large = set(rng.sample(paths, min(config.large_docs, len(paths))))
+    large_bytes = int(config.large_doc_mb * 1024 * 1024)
+
+    total_links = 0
+    broken_links = 0
+    index_entries: Dict[str, List[Tuple[str, str]]] = {}
+
+    for rel_path, doc_id, title in docs:
+        # Poisson-like link count around link_density
+        link_count = max(0, int(rng.gauss(config.link_density, config.link_density / 2) + 0.5))
+        links = []
+        for _ in range(link_count):
+            if rng.random() < config.broken_ratio or not linkable:
+                folder = rng.choice(list(DOC_KINDS))
+                missing = f"{folder}/{DOC_KINDS[folder]}_{rng.randint(9000, 9999)}_missing.md"
+                links.append(format_link(rng, rel_path, missing))
+                broken_links += 1
+            else:
+                target = rng.choice(linkable)
+                if target == rel_path:
+                    continue
+                links.append(format_link(rng, rel_path, target))
+            total_links += 1
+
+        target_bytes = large_bytes if rel_path in large else 0
+        content = render_document(rng, rel_path, doc_id, title, links, target_bytes)
+
+        abs_path = os.path.join(output_dir, rel_path)
+        os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+        with open(abs_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        if rng.random() >= config.unindexed_ratio:
+            folder = os.path.dirname(rel_path)
+            index_entries.setdefault(folder, []).append((os.path.basename(rel_path), title))
+
+    # Near-duplicate copies (rng only consumed when enabled so other output stays stable)
+    duplicate_count = int(len(docs) * config.duplicate_ratio)
+    duplicates = rng.sample(docs, duplicate_count) if duplicate_count else []
+    for rel_path, doc_id, title in duplicates:
+        with open(os.path.join(output_dir, rel_path), 'r', encoding='utf-8') as f:
+            original = f.read()
+        copy_path = rel_path[:-len('.md')] + '_copy.md'
+        with open(os.path.join(output_dir, copy_path), 'w', encoding='utf-8') as f:
+            f.write(mutate_words(rng, original, config.duplicate_noise))
+        folder = os.path.dirname(copy_path)
+        index_entries.setdefault(folder, []).append((os.path.basename(copy_path), f"{title} (copy)"))
+
+    # Every content folder gets an index.md (even if empty)
+    folders = set(DOC_KINDS) | {os.path.dirname(p) for p in paths}
+    for folder in sorted(folders):
+        folder_path = os.path.join(output_dir, folder)
+        os.makedirs(folder_path, exist_ok=True)
+        with open(os.path.join(folder_path, 'index.md'), 'w', encoding='utf-8') as f:
+            f.write(render_index(folder, index_entries.get(folder, [])))
+
+    knowledge_dir = os.path.join(output_dir, 'Knowledge')
+    os.makedirs(knowledge_dir, exist_ok=True)
+    if not os.path.exists(os.path.join(knowledge_dir, 'index.md')):
+        with open(os.path.join(knowledge_dir, 'index.md'), 'w', encoding='utf-8') as f:
+            f.write(render_index('Knowledge', []))
+
+    log_dir = os.path.join(output_dir, 'Log')
+    os.makedirs(log_dir, exist_ok=True)
+    with open(os.path.join(log_dir, 'failures.md'), 'w', encoding='utf-8') as f:
+        f.write(render_failures(config, rng))
+
+    return {
+        "documents": len(docs),
+        "links": total_links,
+        "broken_links": broken_links,
+        "orphans": len(orphans),
+        "large_docs": len(large),
+        "duplicates": len(duplicates),
+        "failures": config.failures,
+        "patterns": config.patterns,
+    }
+
+
+def build_config(args: argparse.Namespace) -> GeneratorConfig:
+    """Merge --scale preset with explicit overrides"""
+    values = asdict(GeneratorConfig())
+    if args.scale:
+        values.update(SCALES[args.scale])
+    for key in values:
+        override = getattr(args, key, None)
+        if override is not None:
+            values[key] = override
+    return GeneratorConfig(**values)
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser):
+    """Register generator options (shared with workspace_benchmark.py)"""
+    parser.add_argument('--scale', choices=sorted(SCALES), help="Preset size")
+    for key, value in asdict(GeneratorConfig()).items():
+        parser.add_argument(f"--{key.replace('_', '-')}", dest=key, type=type(value), default=None)
+
+
+# ============================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic Agent-0 workspace")
+    parser.add_argument('output_dir', help="Target directory (created if missing)")
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    config = build_config(args)
+
+    print("\n" + "="*60)
+    print("🧪 SYNTHETIC WORKSPACE GENERATOR")
+    print("="*60)
+
+    if os.path.exists(args.output_dir) and os.listdir(args.output_dir):
+        print(f"\n⚠️ Output directory is not empty: {args.output_dir}")
+        exit(1)
+
+    summary = generate_workspace(args.output_dir, config)
+
+    print(f"\n📂 Workspace: {os.path.abspath(args.output_dir)}")
+    for key, value in summary.items():
+        print(f"   • {key}: {value}")
+    print("\n" + "="*60)
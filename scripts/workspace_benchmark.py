@@ -0,0 +1,384 @@
+"""
+Workspace Script Benchmark
+===========================
+Script untuk mengukur performa semua workspace script pada skala besar.
+
+Fitur:
+1. Generate workspace sintetis (lihat synthetic_workspace_generator.py) atau pakai workspace yang ada
+2. Jalankan setiap stage dari analyze_workspace, auto_index_updater,
+   document_health_analyzer dan failure_analyzer di proses terpisah
+3. Catat wall time, RSS setelah stage + selisihnya terhadap sebelum stage
+   (/proc/self/statm), peak RSS proses sejauh ini dan jumlah file yang dibuka
+   per stage
+4. Bandingkan dengan baseline yang tersimpan dan laporkan regresi
+
+Jalankan:
+    python workspace_benchmark.py --scale medium                 # compare vs baseline
+    python workspace_benchmark.py --scale medium --save-baseline # record baseline
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import resource
+import subprocess
+from datetime import datetime
+from dataclasses import asdict
+from typing import List, Dict, Optional
+
+from synthetic_workspace_generator import (
+    GeneratorConfig, generate_workspace, build_config, add_generator_arguments
+)
+
+# ============================================================
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(SCRIPT_DIR, "benchmark_baseline.json")
+
+SCRIPTS = ['analyze_workspace', 'auto_index_updater', 'document_health_analyzer', 'failure_analyzer']
+
+# A stage is a regression when it is slower than baseline by more than
+# the tolerance AND by more than the absolute floor (filters timer noise)
+DEFAULT_TOLERANCE = 0.25
+WALL_FLOOR_MS = 20.0
+RSS_FLOOR_KB = 4096
+
+# ============================================================
+# Child side: runs inside a fresh interpreter per script
+# ============================================================
+_open_count = 0
+
+
+def _audit_hook(event: str, args):
+    global _open_count
+    if event == 'open':
+        _open_count += 1
+
+
+def _peak_rss_kb() -> int:
+    """
+    Peak RSS of the whole process so far, not of one stage (it never goes
+    down). On Linux VmHWM is read instead of ru_maxrss, which survives
+    fork+exec and would include the parent's peak.
+    """
+    try:
+        with open('/proc/self/status', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _current_rss_kb() -> Optional[int]:
+    """Resident set size right now (/proc/self/statm; None where it does not exist)"""
+    try:
+        with open('/proc/self/statm', 'r', encoding='utf-8') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+def build_stages(script: str, output_dir: str) -> List[tuple]:
+    """
+    Import a workspace script and describe its stages.
+    Individual stages are followed by 'full_run' (the script's own
+    entry point, end to end) so both breakdown and total are visible.
+    Returns: [(stage_name, callable), ...] - each callable receives the
+    previous stage results dict and stores its own result in it.
+    """
+    module = __import__(script)
+    if hasattr(module, 'OUTPUT_DIR'):
+        module.OUTPUT_DIR = output_dir
+
+    if script == 'analyze_workspace':
+        def save(state):
+            with open(os.path.join(output_dir, "workspace_index.json"), "w", encoding='utf-8') as f:
+                json.dump(state['structure'], f, indent=4, ensure_ascii=False)
+        return [
+            ('scan', lambda s: s.update(structure=module.analyze_workspace(module.WORKSPACE_DIR))),
+            ('save', save),
+        ]
+
+    if script == 'auto_index_updater':
+        def standard(state):
+            for folder in module.TARGET_FOLDERS:
+                folder_path = os.path.join(module.WORKSPACE_DIR, folder)
+                if os.path.exists(folder_path):
+                    module.update_folder_index(folder_path, folder)
+        return [
+            ('standard_indexes', standard),
+            ('knowledge_indexes', lambda s: module.update_knowledge_indexes()),
+        ]
+
+    if script == 'document_health_analyzer':
+        def score(state):
+            findings = state['findings']
+            state['score'] = module.calculate_health_score(
+                len(state['files']), len(findings['broken_links']),
+                len(findings['orphan_files']), len(findings['missing_from_index'])
+            )
+            module.generate_recommendations(
+                findings['broken_links'], findings['orphan_files'], findings['missing_from_index']
+            )
+        return [
+            ('scan', lambda s: s.update(files=module.get_all_md_files(module.WORKSPACE_DIR))),
+            ('rules', lambda s: s.update(findings=module.run_rules(
+                s['files'], module.build_rules(module.DEFAULT_RULES))[0])),
+            ('score', score),
+            ('full_run', lambda s: s.update(report=module.analyze_document_health())),
+            ('save', lambda s: module.save_report(s['report'])),
+        ]
+
+    if script == 'failure_analyzer':
+        def read(state):
+            with open(module.FAILURES_FILE, 'r', encoding='utf-8') as f:
+                state['content'] = f.read()
+        return [
+            ('read', read),
+            ('parse_entries', lambda s: s.update(entries=module.parse_failure_entries(s['content']))),
+            ('parse_patterns', lambda s: s.update(patterns=module.parse_existing_patterns(s['content']))),
+            ('group', lambda s: s.update(groups=module.group_failures(s['entries']))),
+            ('candidates', lambda s: module.find_new_pattern_candidates(s['entries'], s['groups'])),
+            ('full_run', lambda s: s.update(report=module.analyze_failures())),
+            ('save', lambda s: module.save_report(s['report'])),
+        ]
+
+    raise ValueError(f"Unknown script: {script}")
+
+
+def run_child(script: str, output_dir: str) -> Dict:
+    """Measure every stage of one script (called in the child process)"""
+    sys.addaudithook(_audit_hook)
+    sys.path.insert(0, SCRIPT_DIR)
+
+    devnull = open(os.devnull, 'w', encoding='utf-8')
+    real_stdout = sys.stdout
+    sys.stdout = devnull
+    try:
+        stages = build_stages(script, output_dir)
+        state: Dict = {}
+        results = []
+        for name, func in stages:
+            # Read outside the counted window: /proc reads go through the audit hook too
+            rss_before = _current_rss_kb()
+            opens_before = _open_count
+            start = time.perf_counter()
+            func(state)
+            wall_ms = (time.perf_counter() - start) * 1000
+            files_opened = _open_count - opens_before
+            rss_after = _current_rss_kb()
+            results.append({
+                "stage": name,
+                "wall_ms": round(wall_ms, 2),
+                "rss_kb": rss_after,
+                "rss_delta_kb": rss_after - rss_before if rss_after is not None and rss_before is not None else None,
+                "process_peak_rss_kb": _peak_rss_kb(),
+                "files_opened": files_opened,
+            })
+    finally:
+        sys.stdout = real_stdout
+        devnull.close()
+
+    return {"script": script, "stages": results}
+
+
+# ============================================================
+# Parent side
+# ============================================================
+def run_script(script: str, workspace: str, repeat: int) -> Dict:
+    """
+    Run one script `repeat` times in fresh interpreters.
+    Keeps the fastest wall time and the lowest RSS figures per stage.
+    """
+    best: Dict[str, Dict] = {}
+    order: List[str] = []
+
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+            target = workspace
+            if script == 'auto_index_updater':
+                # The updater writes index.md files; keep every run identical
+                target = os.path.join(tmp, "workspace")
+                shutil.copytree(workspace, target)
+
+            env = dict(os.environ, AGENT_WORKSPACE=target)
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', script, '--child-output', tmp],
+                env=env, capture_output=True, text=True
+            )
+            if proc.returncode != 0:
+                raise RuntimeError(f"{script} failed:\n{proc.stderr}")
+            result = json.loads(proc.stdout)
+
+        for stage in result['stages']:
+            name = stage['stage']
+            if name not in best:
+                best[name] = stage
+                order.append(name)
+            else:
+                best[name]['wall_ms'] = min(best[name]['wall_ms'], stage['wall_ms'])
+                for key in ('rss_kb', 'rss_delta_kb', 'process_peak_rss_kb'):
+                    if stage[key] is not None and best[name][key] is not None:
+                        best[name][key] = min(best[name][key], stage[key])
+
+    return {name: best[name] for name in order}
+
+
+def compare_with_baseline(
+    results: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    tolerance: float
+) -> List[str]:
+    """
+    Compare results against a baseline.
+    Returns: list of regression messages
+    """
+    regressions = []
+    for script, stages in results.items():
+        for name, current in stages.items():
+            previous = baseline.get(script, {}).get(name)
+            if not previous:
+                continue
+
+            wall_delta = current['wall_ms'] - previous['wall_ms']
+            if wall_delta > WALL_FLOOR_MS and current['wall_ms'] > previous['wall_ms'] * (1 + tolerance):
+                regressions.append(
+                    f"{script}/{name}: wall {previous['wall_ms']:.1f}ms → {current['wall_ms']:.1f}ms"
+                )
+
+            # Memory the stage itself adds; the process peak also carries earlier stages
+            growth, previous_growth = current.get('rss_delta_kb'), previous.get('rss_delta_kb')
+            if growth is not None and previous_growth is not None:
+                if growth - previous_growth > RSS_FLOOR_KB and growth > max(previous_growth, 0) * (1 + tolerance):
+                    regressions.append(
+                        f"{script}/{name}: RSS growth {previous_growth}KB → {growth}KB"
+                    )
+
+            if current['files_opened'] > previous['files_opened']:
+                regressions.append(
+                    f"{script}/{name}: files opened {previous['files_opened']} → {current['files_opened']}"
+                )
+
+    return regressions
+
+
+def print_results(results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]]):
+    print("\n" + "="*60)
+    print("📊 BENCHMARK RESULTS")
+    print("="*60)
+
+    for script, stages in results.items():
+        print(f"\n⏱️ {script}")
+        print(f"   {'stage':<20} {'wall ms':>10} {'RSS KB':>10} {'Δ RSS KB':>10} "
+              f"{'proc peak KB':>13} {'opens':>7} {'vs base':>9}")
+        for name, stage in stages.items():
+            previous = (baseline or {}).get(script, {}).get(name)
+            if previous and previous['wall_ms'] > 0:
+                change = f"{(stage['wall_ms'] / previous['wall_ms'] - 1) * 100:+.0f}%"
+            else:
+                change = "-"
+            rss, delta = stage['rss_kb'], stage['rss_delta_kb']
+            print(
+                f"   {name:<20} {stage['wall_ms']:>10.1f} {'-' if rss is None else rss:>10} "
+                f"{'-' if delta is None else f'{delta:+d}':>10} {stage['process_peak_rss_kb']:>13} "
+                f"{stage['files_opened']:>7} {change:>9}"
+            )
+
+
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark workspace scripts per stage")
+    parser.add_argument('--workspace', help="Existing workspace to benchmark (skips generation)")
+    parser.add_argument('--scripts', nargs='+', choices=SCRIPTS, default=SCRIPTS)
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per script (best is kept)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument('--save-baseline', action='store_true', help="Store results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative slowdown before flagging a regression")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--child-output', help=argparse.SUPPRESS)
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.child_output)))
+        return 0
+
+    print("\n" + "="*60)
+    print("🏁 WORKSPACE BENCHMARK")
+    print("="*60)
+
+    config: Optional[GeneratorConfig] = None
+    tmp_root = None
+    if args.workspace:
+        workspace = os.path.abspath(args.workspace)
+        print(f"\n📂 Using workspace: {workspace}")
+    else:
+        config = build_config(args)
+        tmp_root = tempfile.mkdtemp(prefix="bench_ws_")
+        workspace = os.path.join(tmp_root, "Agent-0")
+        print("\n🧪 Generating synthetic workspace...")
+        summary = generate_workspace(workspace, config)
+        print(f"   {summary['documents']} documents, {summary['links']} links, {summary['failures']} failures")
+
+    try:
+        results = {}
+        for script in args.scripts:
+            print(f"\n▶️ Running {script} (x{args.repeat})...")
+            results[script] = run_script(script, workspace, args.repeat)
+    finally:
+        if tmp_root:
+            shutil.rmtree(tmp_root, ignore_errors=True)
+
+    baseline_data = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline_data = json.load(f)
+
+    workload = asdict(config) if config else {"workspace": workspace}
+    baseline = None
+    if baseline_data:
+        if baseline_data.get('workload') == workload:
+            baseline = baseline_data['results']
+        else:
+            print("\n⚠️ Baseline was recorded with a different workload - skipping comparison")
+
+    print_results(results, baseline)
+
+    exit_code = 0
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                "timestamp": datetime.now().isoformat(),
+                "python": sys.version.split()[0],
+                "workload": workload,
+                "results": results,
+            }, f, indent=2)
+        print(f"\n💾 Baseline saved to: {args.baseline}")
+    elif baseline:
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n🔴 Regressions ({len(regressions)}):")
+            for r in regressions:
+                print(f"   • {r}")
+            exit_code = 1
+        else:
+            print("\n🟢 No regressions against baseline")
+
+    print("\n" + "="*60)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,512 @@
+"""
+Workspace Catalog
+==================
+Katalog SQLite untuk dokumen, judul, ringkasan, link, heading dan failure
+entry di workspace Agent-0, supaya pertanyaan seperti "Plan mana yang link
+ke TOPIC_004" bisa dijawab dengan query ber-index dalam hitungan milidetik.
+
+Fitur:
+1. Scanner mengisi katalog lewat --catalog:
+   - analyze_workspace.py:        dokumen, judul, ringkasan, heading
+   - document_health_analyzer.py: + link keluar dari setiap dokumen
+   - failure_analyzer.py:         failure entry dari Log/failures.md
+2. Update incremental - satu transaksi per scan; dokumen yang content hash-nya
+   tidak berubah tidak ditulis ulang, dokumen yang hilang dihapus
+3. Query CLI: `python workspace_catalog.py query NAME [ARG] [--folder F]`
+   untuk canned query, atau `query sql "SELECT ..."` untuk ad-hoc (read-only)
+4. Target link di-resolve lewat nama file (sama seperti orphan detection
+   di document_health_analyzer.py)
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import argparse
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import unquote
+from typing import List, Dict, Tuple, Optional, Callable, Iterable
+
+# ============================================================
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CATALOG = os.path.join(SCRIPT_DIR, "workspace_catalog.db")
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS documents (
+    path          TEXT PRIMARY KEY,
+    folder        TEXT NOT NULL,
+    name          TEXT NOT NULL,
+    title         TEXT,
+    summary       TEXT,
+    size          INTEGER,
+    content_hash  TEXT,
+    links_indexed INTEGER NOT NULL DEFAULT 0,
+    updated_at    TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_folder ON documents(folder);
+CREATE INDEX IF NOT EXISTS documents_name ON documents(name);
+
+CREATE TABLE IF NOT EXISTS links (
+    source      TEXT NOT NULL REFERENCES documents(path) ON DELETE CASCADE,
+    position    INTEGER NOT NULL,
+    text        TEXT,
+    target      TEXT NOT NULL,
+    target_name TEXT NOT NULL,
+    PRIMARY KEY (source, position)
+);
+CREATE INDEX IF NOT EXISTS links_target_name ON links(target_name);
+
+CREATE TABLE IF NOT EXISTS headings (
+    path     TEXT NOT NULL REFERENCES documents(path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    level    INTEGER NOT NULL,
+    text     TEXT NOT NULL,
+    line     INTEGER NOT NULL,
+    PRIMARY KEY (path, position)
+);
+CREATE INDEX IF NOT EXISTS headings_text ON headings(text);
+
+CREATE TABLE IF NOT EXISTS failures (
+    id         TEXT PRIMARY KEY,
+    tool       TEXT NOT NULL,
+    date       TEXT NOT NULL,
+    command    TEXT,
+    error      TEXT,
+    context    TEXT,
+    workaround TEXT,
+    pattern_id TEXT
+);
+CREATE INDEX IF NOT EXISTS failures_tool ON failures(tool);
+CREATE INDEX IF NOT EXISTS failures_date ON failures(date);
+CREATE INDEX IF NOT EXISTS failures_pattern ON failures(pattern_id);
+"""
+
+FAILURE_COLUMNS = ['id', 'tool', 'date', 'command', 'error', 'context', 'workaround', 'pattern_id']
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+
+SUMMARY_LENGTH = 150
+
+
+# ============================================================
+def extract_title_summary(content: str, default_title: str) -> Tuple[str, str]:
+    """
+    First H1 as title, next non-empty non-heading line as summary
+    (same rules as analyze_workspace.extract_info).
+    """
+    lines = content.splitlines()
+    for i, line in enumerate(lines):
+        if line.startswith('# '):
+            title = line.replace('# ', '').strip()
+            for next_line in lines[i + 1:]:
+                clean_line = next_line.strip()
+                if clean_line and not clean_line.startswith('#'):
+                    summary = clean_line[:SUMMARY_LENGTH] + "..." if len(clean_line) > SUMMARY_LENGTH else clean_line
+                    return title, summary
+            return title, ""
+    return default_title, ""
+
+
+def extract_headings(content: str) -> List[Tuple[int, str, int]]:
+    """
+    Markdown ATX headings outside fenced code blocks.
+    Returns: [(level, text, line_number), ...]
+    """
+    headings = []
+    in_fence = False
+    for number, line in enumerate(content.splitlines(), 1):
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        match = HEADING_PATTERN.match(line)
+        if match:
+            headings.append((len(match.group(1)), match.group(2), number))
+    return headings
+
+
+def link_target_name(target: str) -> str:
+    """File name a link resolves to: anchor and query dropped, URL-decoded"""
+    target = target.strip().split('#', 1)[0].split('?', 1)[0]
+    return os.path.basename(unquote(target).replace('\\', '/'))
+
+
+def glob_prefix(value: str) -> str:
+    """GLOB pattern matching names that start with `value` (literal)"""
+    escaped = re.sub(r'([*?\[])', r'[\1]', value)
+    return escaped + '*'
+
+
+# ============================================================
+class WorkspaceCatalog:
+    """
+    SQLite catalog of one workspace. Writers wrap a scan in `transaction()`;
+    everything inside commits together or not at all.
+    """
+
+    def __init__(self, path: str = DEFAULT_CATALOG, read_only: bool = False):
+        self.path = path
+        if read_only:
+            if not os.path.exists(path):
+                raise FileNotFoundError(path)
+            self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, isolation_level=None)
+        else:
+            self.db = sqlite3.connect(path, isolation_level=None)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.db.execute("PRAGMA foreign_keys=ON")
+        self.known: Dict[str, Tuple[str, int]] = {}
+        self.stats = {"inserted": 0, "updated": 0, "unchanged": 0, "removed": 0, "failures": 0}
+
+    def close(self):
+        self.db.close()
+
+    # --------------------------------------------------------
+    @contextmanager
+    def transaction(self, workspace: str):
+        """
+        One write transaction per scan. A catalog mirrors a single workspace:
+        syncing a different one starts it over (inside the same transaction).
+        """
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'workspace'").fetchone()
+            if row and row[0] != workspace:
+                print(f"   ⚠️ Catalog was built for {row[0]}, rebuilding for {workspace}")
+                for table in ('links', 'headings', 'documents', 'failures'):
+                    self.db.execute(f"DELETE FROM {table}")
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('workspace', ?)", (workspace,))
+            self.known = {
+                path: (content_hash, links_indexed)
+                for path, content_hash, links_indexed
+                in self.db.execute("SELECT path, content_hash, links_indexed FROM documents")
+            }
+            yield self
+            self.db.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('synced_at', ?)", (datetime.now().isoformat(),)
+            )
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+
+    def upsert_document(
+        self,
+        rel_path: str,
+        content: str,
+        links: Optional[List[Tuple[str, str]]] = None,
+        title: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> str:
+        """
+        Insert or update one document. Links are replaced only when given,
+        so scanners that don't parse links keep the ones already stored.
+        Returns: 'inserted', 'updated' or 'unchanged'
+        """
+        content_hash = hashlib.sha1(content.encode('utf-8')).hexdigest()
+        previous = self.known.get(rel_path)
+        if previous and previous[0] == content_hash and (links is None or previous[1]):
+            self.stats["unchanged"] += 1
+            return "unchanged"
+
+        if title is None:
+            title, summary = extract_title_summary(content, os.path.basename(rel_path))
+        # Unchanged content keeps its links when this scanner doesn't parse them
+        links_indexed = links is not None or bool(previous and previous[0] == content_hash and previous[1])
+
+        self.db.execute(
+            """
+            INSERT INTO documents (path, folder, name, title, summary, size, content_hash, links_indexed, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                title = excluded.title, summary = excluded.summary, size = excluded.size,
+                content_hash = excluded.content_hash, links_indexed = excluded.links_indexed,
+                updated_at = excluded.updated_at
+            """,
+            (rel_path, rel_path.split('/')[0], os.path.basename(rel_path), title, summary or "",
+             len(content.encode('utf-8')), content_hash, int(links_indexed), datetime.now().isoformat())
+        )
+        if not previous or previous[0] != content_hash:
+            self.db.execute("DELETE FROM headings WHERE path = ?", (rel_path,))
+            self.db.executemany(
+                "INSERT INTO headings VALUES (?, ?, ?, ?, ?)",
+                [(rel_path, i, level, text, line) for i, (level, text, line) in enumerate(extract_headings(content))]
+            )
+            if links is None:
+                self.db.execute("DELETE FROM links WHERE source = ?", (rel_path,))
+        if links is not None:
+            self.db.execute("DELETE FROM links WHERE source = ?", (rel_path,))
+            self.db.executemany(
+                "INSERT INTO links VALUES (?, ?, ?, ?, ?)",
+                [(rel_path, i, text, target, link_target_name(target)) for i, (text, target) in enumerate(links)]
+            )
+
+        self.known[rel_path] = (content_hash, int(links_indexed))
+        outcome = "updated" if previous else "inserted"
+        self.stats[outcome] += 1
+        return outcome
+
+    def prune(self, seen: Iterable[str], folders: Iterable[str]):
+        """Remove documents in the scanned `folders` that the scan didn't see"""
+        seen = set(seen)
+        folders = set(folders)
+        gone = [p for p in self.known if p.split('/')[0] in folders and p not in seen]
+        self.db.executemany("DELETE FROM documents WHERE path = ?", [(p,) for p in gone])
+        for path in gone:
+            del self.known[path]
+        self.stats["removed"] += len(gone)
+
+    def replace_failures(self, entries: Iterable[Dict]):
+        """Upsert failure entries by ID; IDs no longer in the log are removed"""
+        rows = [tuple(entry.get(column) for column in FAILURE_COLUMNS) for entry in entries]
+        placeholders = ", ".join("?" for _ in FAILURE_COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in FAILURE_COLUMNS[1:])
+        changed = " OR ".join(f"{c} IS NOT excluded.{c}" for c in FAILURE_COLUMNS[1:])
+        self.db.executemany(
+            f"INSERT INTO failures VALUES ({placeholders}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates} WHERE {changed}",
+            rows
+        )
+        ids = {row[0] for row in rows}
+        stale = [(i,) for (i,) in self.db.execute("SELECT id FROM failures") if i not in ids]
+        self.db.executemany("DELETE FROM failures WHERE id = ?", stale)
+        self.stats["failures"] = len(rows)
+
+    def track_documents(self, parse: Callable) -> Callable:
+        """
+        Wrap a parse function returning a ParsedDocument so every parsed
+        document (with its links) is upserted as a side effect.
+        """
+        def wrapper(abs_path, rel_path, *args, **kwargs):
+            doc = parse(abs_path, rel_path, *args, **kwargs)
+            self.upsert_document(doc.rel_path, doc.content, doc.links)
+            return doc
+
+        return wrapper
+
+    def describe_stats(self) -> str:
+        s = self.stats
+        text = f"{s['inserted']} inserted, {s['updated']} updated, {s['unchanged']} unchanged, {s['removed']} removed"
+        if s['failures']:
+            text += f", {s['failures']} failures"
+        return text
+
+    # --------------------------------------------------------
+    def query(self, sql: str, params=()) -> Tuple[List[str], List[tuple]]:
+        cursor = self.db.execute(sql, params)
+        columns = [d[0] for d in cursor.description] if cursor.description else []
+        return columns, cursor.fetchall()
+
+
+def add_catalog_arguments(parser):
+    """Register --catalog on a scanner's argument parser"""
+    parser.add_argument('--catalog', nargs='?', const=DEFAULT_CATALOG, metavar='PATH',
+                        help=f"Also upsert results into the SQLite catalog (default: {os.path.basename(DEFAULT_CATALOG)})")
+
+
+def print_catalog_stats(catalog: WorkspaceCatalog):
+    print(f"\n🗃️ Catalog: {catalog.describe_stats()} ({catalog.path})")
+
+
+# ============================================================
+# Canned queries. `target` arguments are file names or name prefixes
+# (TOPIC_004 matches TOPIC_004_agent_flow.md); `folder` is optional.
+# ============================================================
+CANNED_QUERIES = {
+    "backlinks": (
+        "Documents linking to TARGET",
+        """
+        SELECT DISTINCT l.source AS document, d.title, l.target_name AS links_to
+        FROM links l JOIN documents d ON d.path = l.source
+        WHERE l.target_name GLOB :target AND (:folder IS NULL OR d.folder = :folder)
+        ORDER BY l.source
+        """,
+    ),
+    "outlinks": (
+        "Links going out of TARGET",
+        """
+        SELECT l.source AS document, l.text, l.target, t.path AS resolved
+        FROM documents d JOIN links l ON l.source = d.path
+        LEFT JOIN documents t ON t.name = l.target_name
+        WHERE d.name GLOB :target AND (:folder IS NULL OR d.folder = :folder)
+        ORDER BY l.source, l.position
+        """,
+    ),
+    "no-outlinks": (
+        "Documents without outgoing links",
+        """
+        SELECT d.path AS document, d.title
+        FROM documents d
+        WHERE d.links_indexed AND (:folder IS NULL OR d.folder = :folder)
+          AND NOT EXISTS (SELECT 1 FROM links l WHERE l.source = d.path)
+        ORDER BY d.path
+        """,
+    ),
+    "orphans": (
+        "Documents no other document links to (index files excluded)",
+        """
+        SELECT d.path AS document, d.title
+        FROM documents d
+        WHERE (:folder IS NULL OR d.folder = :folder) AND d.name NOT LIKE '%index%'
+          AND NOT EXISTS (SELECT 1 FROM links l WHERE l.target_name = d.name AND l.source != d.path)
+        ORDER BY d.path
+        """,
+    ),
+    "unresolved": (
+        "Links whose target file name is not in the catalog",
+        """
+        SELECT l.source AS document, l.target
+        FROM links l JOIN documents d ON d.path = l.source
+        WHERE (:folder IS NULL OR d.folder = :folder) AND l.target_name LIKE '%.md'
+          AND NOT EXISTS (SELECT 1 FROM documents t WHERE t.name = l.target_name)
+        ORDER BY l.source, l.position
+        """,
+    ),
+    "headings": (
+        "Headings containing TARGET",
+        """
+        SELECT h.path AS document, h.line, h.level, h.text
+        FROM headings h JOIN documents d ON d.path = h.path
+        WHERE h.text LIKE '%' || :text || '%' AND (:folder IS NULL OR d.folder = :folder)
+        ORDER BY h.path, h.line
+        """,
+    ),
+    "titles": (
+        "Documents whose title contains TARGET",
+        """
+        SELECT d.path AS document, d.title, d.summary
+        FROM documents d
+        WHERE d.title LIKE '%' || :text || '%' AND (:folder IS NULL OR d.folder = :folder)
+        ORDER BY d.path
+        """,
+    ),
+    "folders": (
+        "Document and link counts per folder",
+        """
+        SELECT d.folder, COUNT(*) AS documents,
+               (SELECT COUNT(*) FROM links l JOIN documents s ON s.path = l.source
+                WHERE s.folder = d.folder) AS links
+        FROM documents d
+        WHERE (:folder IS NULL OR d.folder = :folder)
+        GROUP BY d.folder ORDER BY d.folder
+        """,
+    ),
+    "failures": (
+        "Failure entries, optionally for tool TARGET",
+        """
+        SELECT id, tool, date, pattern_id, error
+        FROM failures
+        WHERE (:text IS NULL OR tool = :text)
+        ORDER BY date DESC, id DESC
+        """,
+    ),
+    "failure-tools": (
+        "Failure counts per tool",
+        """
+        SELECT tool, COUNT(*) AS failures, COUNT(pattern_id) AS patterned, MAX(date) AS latest
+        FROM failures GROUP BY tool ORDER BY failures DESC
+        """,
+    ),
+}
+
+# Queries that need a TARGET argument
+TARGET_QUERIES = {"backlinks", "outlinks", "headings", "titles"}
+
+
+def run_canned_query(catalog: WorkspaceCatalog, name: str, target: Optional[str], folder: Optional[str]):
+    _, sql = CANNED_QUERIES[name]
+    params = {
+        "target": glob_prefix(os.path.basename(target)) if target else None,
+        "text": target,
+        "folder": folder,
+    }
+    return catalog.query(sql, params)
+
+
+def print_rows(columns: List[str], rows: List[tuple], limit: Optional[int]):
+    """Print query results as an aligned text table"""
+    shown = rows if limit is None else rows[:limit]
+    cells = [[("" if v is None else str(v)) for v in row] for row in shown]
+    widths = [min(max([len(c)] + [len(r[i]) for r in cells]), 60) for i, c in enumerate(columns)]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in cells:
+        print("  ".join((v if len(v) <= w else v[:w - 3] + "...").ljust(w) for v, w in zip(row, widths)))
+    if len(shown) < len(rows):
+        print(f"... and {len(rows) - len(shown)} more (use --limit 0 for all)")
+
+
+# ============================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the SQLite workspace catalog")
+    parser.add_argument('--catalog', default=DEFAULT_CATALOG, metavar='PATH',
+                        help=f"Catalog database (default: {os.path.basename(DEFAULT_CATALOG)})")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    query_parser = subcommands.add_parser(
+        'query', help="Run a canned query, or `sql` for an ad-hoc read-only query",
+        description="Canned queries:\n" + "\n".join(
+            f"  {name:<14} {description}" for name, (description, _) in CANNED_QUERIES.items()
+        ) + "\n  sql            Ad-hoc SQL (read-only)",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    query_parser.add_argument('name', choices=list(CANNED_QUERIES) + ['sql'])
+    query_parser.add_argument('target', nargs='?', help="File name / prefix, search text, tool, or SQL")
+    query_parser.add_argument('--folder', help="Limit to one top-level folder (e.g. Plan)")
+    query_parser.add_argument('--limit', type=int, default=50, help="Rows to print, 0 = all (default: 50)")
+    query_parser.add_argument('--json', action='store_true', help="Print rows as JSON")
+
+    subcommands.add_parser('stats', help="Show what the catalog contains")
+    args = parser.parse_args()
+
+    try:
+        catalog = WorkspaceCatalog(args.catalog, read_only=True)
+    except FileNotFoundError:
+        print(f"⚠️ Catalog not found: {args.catalog}")
+        print("   Tip: run analyze_workspace.py / document_health_analyzer.py / failure_analyzer.py with --catalog")
+        exit(1)
+
+    if args.command == 'stats':
+        meta = dict(catalog.query("SELECT key, value FROM meta")[1])
+        print(f"🗃️ {args.catalog}")
+        print(f"   Workspace: {meta.get('workspace', '-')}")
+        print(f"   Synced:    {meta.get('synced_at', '-')}")
+        for table in ('documents', 'links', 'headings', 'failures'):
+            count = catalog.query(f"SELECT COUNT(*) FROM {table}")[1][0][0]
+            print(f"   {table:<10} {count}")
+        exit(0)
+
+    if args.name in TARGET_QUERIES | {'sql'} and not args.target:
+        parser.error(f"query {args.name} needs a TARGET argument")
+
+    start = time.perf_counter()
+    try:
+        if args.name == 'sql':
+            columns, rows = catalog.query(args.target)
+        else:
+            columns, rows = run_canned_query(catalog, args.name, args.target, args.folder)
+    except sqlite3.Error as e:
+        print(f"⚠️ Query failed: {e}")
+        exit(1)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps([dict(zip(columns, row)) for row in rows], indent=2, ensure_ascii=False))
+    else:
+        print_rows(columns, rows, args.limit or None)
+        print(f"\n📊 {len(rows)} row(s) in {elapsed_ms:.1f}ms")
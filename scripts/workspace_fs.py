@@ -0,0 +1,428 @@
+"""
+Workspace FS
+=============
+Lapisan filesystem virtual supaya analyzer bisa membaca workspace langsung
+dari folder, arsip .zip, atau arsip .tar / .tar.gz / .tar.bz2 / .tar.xz
+tanpa ekstraksi ke disk.
+
+Fitur:
+1. API kecil mirip os/os.path: exists, isdir, listdir, scandir, read_text
+2. Path tetap "absolut" (WORKSPACE_DIR + relatif), jadi kode analyzer yang
+   memakai os.path.join(WORKSPACE_DIR, ...) tidak perlu diubah
+3. Zip: index dari central directory, member dibaca langsung saat dibutuhkan
+4. Tar: index dibangun dalam satu pass atas header, isi baru dibaca saat
+   dokumen dibaca (jadi --fast tidak membaca isi sama sekali). Tar biasa
+   di-seek per member; tar terkompresi tidak bisa seek mundur dengan murah,
+   jadi isi member .md di dalam workspace diambil sekalian pada pass index
+   (dekompresi sekali, member lain tidak di-buffer)
+5. Root workspace di dalam arsip dideteksi otomatis (mis. Agent-0/ di
+   dalam artifact CI)
+6. Arsip selalu read-only
+7. Git tree (GitTreeFS) - Workspace pada commit tertentu, isi blob dibaca
+   lewat satu proses `git cat-file --batch` yang dipakai bersama (untuk
+   --history; cache hasil parse ada di analyzer, bukan di sini)
+8. map_text - Konten untuk scanning level bytes: file di folder di-mmap
+   (lihat mmap_scan.py), member arsip dikembalikan sebagai str
+9. LatencyFS - Pembungkus dengan latency tiruan per operasi, untuk meniru
+   network mount / FUSE di benchmark (lihat latency_benchmark.py)
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import sys
+import time
+import threading
+import argparse
+import subprocess
+import tarfile
+import zipfile
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from mmap_scan import map_text
+
+# ============================================================
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+# Compressed tars keep these members in memory from the indexing pass
+CACHED_SUFFIX = '.md'
+
+# A directory containing one of these is treated as the workspace root
+WORKSPACE_MARKERS = ('Topic', 'Plan', 'Log', 'Knowledge', 'Find', 'Research')
+
+
+def is_archive(path: str) -> bool:
+    return path.lower().endswith(ARCHIVE_SUFFIXES) and os.path.isfile(path)
+
+
+def workspace_override() -> Optional[str]:
+    """
+    Workspace given explicitly via --workspace PATH or AGENT_WORKSPACE
+    (or the first workspace of --fleet).
+    Analyzers resolve their workspace at import time, so this peeks at
+    sys.argv before their own argument parsing runs.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--workspace')
+    parser.add_argument('--fleet', nargs='+')
+    known, _ = parser.parse_known_args(sys.argv[1:])
+    path = known.workspace or os.environ.get('AGENT_WORKSPACE') or (known.fleet or [None])[0]
+    return os.path.abspath(path) if path else None
+
+
+def add_workspace_arguments(parser):
+    """Register --workspace on an analyzer's argument parser"""
+    parser.add_argument('--workspace', metavar='PATH',
+                        help="Workspace folder or archive (.zip, .tar, .tar.gz, ...) to analyze "
+                             "without extraction (default: auto-detect)")
+
+
+# ============================================================
+@dataclass
+class ArchiveStat:
+    st_size: int
+    st_mtime: float
+
+
+@dataclass
+class ArchiveEntry:
+    """Minimal os.DirEntry stand-in for archive members"""
+    name: str
+    path: str
+    _is_dir: bool
+    _stat: ArchiveStat
+
+    def is_file(self) -> bool:
+        return not self._is_dir
+
+    def is_dir(self) -> bool:
+        return self._is_dir
+
+    def stat(self) -> ArchiveStat:
+        return self._stat
+
+
+class DirectoryFS:
+    """Plain on-disk workspace; every call goes straight to os"""
+    read_only = False
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def isdir(self, path: str) -> bool:
+        return os.path.isdir(path)
+
+    def listdir(self, path: str) -> List[str]:
+        return os.listdir(path)
+
+    def scandir(self, path: str):
+        return os.scandir(path)
+
+    def read_text(self, path: str) -> str:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def map_text(self, path: str):
+        """Context manager yielding the file memory-mapped (str if not UTF-8)"""
+        return map_text(path)
+
+    def close(self):
+        pass
+
+
+class LatencyFS:
+    """
+    Stand-in for a network or FUSE mount: every call to the wrapped FS
+    first sleeps `latency_ms` (per stat, listing, open). The sleep releases
+    the GIL, so concurrent callers overlap like real remote I/O would.
+    """
+
+    def __init__(self, inner, latency_ms: float):
+        self.inner = inner
+        self.root = inner.root
+        self.read_only = inner.read_only
+        self.latency = latency_ms / 1000
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+
+    def exists(self, path: str) -> bool:
+        self._wait()
+        return self.inner.exists(path)
+
+    def isdir(self, path: str) -> bool:
+        self._wait()
+        return self.inner.isdir(path)
+
+    def listdir(self, path: str) -> List[str]:
+        self._wait()
+        return self.inner.listdir(path)
+
+    def scandir(self, path: str):
+        self._wait()
+        return self.inner.scandir(path)
+
+    def read_text(self, path: str) -> str:
+        self._wait()
+        return self.inner.read_text(path)
+
+    def map_text(self, path: str):
+        self._wait()
+        return self.inner.map_text(path)
+
+    def close(self):
+        self.inner.close()
+
+
+class ArchiveFS(ABC):
+    """
+    Read-only view of a workspace inside an archive. `root` is the archive
+    path itself; members are addressed as root + '/' + workspace-relative path.
+    """
+    read_only = True
+
+    def __init__(self, root: str):
+        self.root = root
+        self.files: Dict[str, ArchiveStat] = {}     # workspace-relative path -> stat
+        self.dirs: Dict[str, Dict[str, bool]] = {}  # dir -> {child name: is_dir}
+        self.prefix = ''
+
+    # --------------------------------------------------------
+    def _index(self, members: Dict[str, ArchiveStat], prefix: Optional[str] = None):
+        """
+        Build the directory tree. Without an explicit `prefix` the workspace
+        root is located inside the archive from WORKSPACE_MARKERS.
+        """
+        if prefix is not None:
+            self.prefix = prefix
+        else:
+            all_dirs = set()
+            for name in members:
+                parts = name.split('/')
+                for i in range(1, len(parts)):
+                    all_dirs.add('/'.join(parts[:i]))
+
+            roots = [d for d in all_dirs if d.rsplit('/', 1)[-1] in WORKSPACE_MARKERS]
+            if roots:
+                shallowest = min(roots, key=lambda d: (d.count('/'), d))
+                self.prefix = shallowest.rsplit('/', 1)[0] + '/' if '/' in shallowest else ''
+
+        self.dirs = {'': {}}
+        for name, stat in members.items():
+            if not name.startswith(self.prefix):
+                continue
+            rel = name[len(self.prefix):]
+            self.files[rel] = stat
+            parts = rel.split('/')
+            for i in range(len(parts)):
+                parent = '/'.join(parts[:i])
+                self.dirs.setdefault(parent, {})[parts[i]] = i < len(parts) - 1
+
+    def _rel(self, path: str) -> Optional[str]:
+        if path == self.root:
+            return ''
+        if path.startswith(self.root + '/'):
+            return os.path.normpath(path[len(self.root) + 1:]).replace(os.sep, '/').strip('/')
+        return None
+
+    # --------------------------------------------------------
+    def exists(self, path: str) -> bool:
+        rel = self._rel(path)
+        return rel is not None and (rel in self.files or rel in self.dirs)
+
+    def isdir(self, path: str) -> bool:
+        rel = self._rel(path)
+        return rel is not None and rel in self.dirs
+
+    def listdir(self, path: str) -> List[str]:
+        rel = self._rel(path)
+        if rel is None or rel not in self.dirs:
+            raise FileNotFoundError(path)
+        return sorted(self.dirs[rel])
+
+    def scandir(self, path: str) -> List[ArchiveEntry]:
+        rel = self._rel(path)
+        if rel is None or rel not in self.dirs:
+            raise FileNotFoundError(path)
+        entries = []
+        for name, child_is_dir in sorted(self.dirs[rel].items()):
+            child = f"{rel}/{name}" if rel else name
+            stat = ArchiveStat(0, 0.0) if child_is_dir else self.files[child]
+            entries.append(ArchiveEntry(name, f"{path}/{name}", child_is_dir, stat))
+        return entries
+
+    def read_text(self, path: str) -> str:
+        rel = self._rel(path)
+        if rel is None or rel not in self.files:
+            raise FileNotFoundError(path)
+        return self._read_bytes(self.prefix + rel).decode('utf-8')
+
+    def map_text(self, path: str):
+        """Members are read into memory anyway, so this is just read_text"""
+        return nullcontext(self.read_text(path))
+
+    @abstractmethod
+    def _read_bytes(self, member: str) -> bytes:
+        """Raw contents of `member` (full name inside the archive)"""
+
+
+class ZipFS(ArchiveFS):
+    """Zip archive: the central directory is the index, members are read on demand"""
+
+    def __init__(self, root: str):
+        super().__init__(root)
+        self.archive = zipfile.ZipFile(root)
+        members = {}
+        for info in self.archive.infolist():
+            if info.is_dir():
+                continue
+            mtime = datetime(*info.date_time).timestamp()
+            members[info.filename] = ArchiveStat(info.file_size, mtime)
+        self._index(members)
+
+    def _read_bytes(self, member: str) -> bytes:
+        return self.archive.read(member)
+
+    def close(self):
+        self.archive.close()
+
+
+class TarFS(ArchiveFS):
+    """
+    Tar archive indexed in one pass over the member headers; contents are
+    only read when a document is. Uncompressed tars seek straight to the
+    member. Compressed tars cannot seek back cheaply: the indexing pass,
+    which decompresses everything anyway, keeps the contents of the .md
+    members inside the workspace. Other members are read on demand by
+    seeking (re-decompressing up to them).
+    """
+
+    def __init__(self, root: str):
+        super().__init__(root)
+        self.infos: Dict[str, tarfile.TarInfo] = {}
+        self.data: Dict[str, bytes] = {}
+        self.lock = threading.Lock()
+        try:
+            self.archive = tarfile.open(root, 'r:')
+            self.seekable = True
+        except tarfile.ReadError:
+            self.archive = tarfile.open(root, 'r:*')
+            self.seekable = False
+
+        members = {}
+        for member in self.archive:
+            if not member.isfile():
+                continue
+            name = member.name[2:] if member.name.startswith('./') else member.name
+            members[name] = ArchiveStat(member.size, float(member.mtime))
+            self.infos[name] = member
+            if not self.seekable and name.endswith(CACHED_SUFFIX):
+                # The stream is at this member's data: a forward read, no second decompression
+                self.data[name] = self.archive.extractfile(member).read()
+        self._index(members)
+        # The workspace root is only known now: drop documents outside it
+        self.data = {name: data for name, data in self.data.items() if name.startswith(self.prefix)}
+
+    def _read_bytes(self, member: str) -> bytes:
+        if member in self.data:
+            return self.data[member]
+        with self.lock:
+            return self.archive.extractfile(self.infos[member]).read()
+
+    def close(self):
+        self.archive.close()
+        self.data = {}
+
+
+class GitBlobReader:
+    """
+    One long-lived `git cat-file --batch` process shared by every commit.
+    Nothing is cached here: callers keep whatever form of the content they
+    need (e.g. --history keeps parsed documents by blob hash).
+    """
+
+    def __init__(self, repo: str):
+        self.process = subprocess.Popen(
+            ['git', '-C', repo, 'cat-file', '--batch'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        self.requests = 0
+
+    def read(self, sha: str) -> bytes:
+        self.requests += 1
+        self.process.stdin.write(sha.encode('utf-8') + b'\n')
+        self.process.stdin.flush()
+        header = self.process.stdout.readline().split()
+        if len(header) < 3 or header[1] == b'missing':
+            raise FileNotFoundError(sha)
+        data = self.process.stdout.read(int(header[2]))
+        self.process.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+
+def git_output(repo: str, *args: str) -> str:
+    return subprocess.run(
+        ['git', '-C', repo, *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+class GitTreeFS(ArchiveFS):
+    """
+    Read-only view of the workspace as it was at `commit`, addressed with
+    the same paths as the on-disk workspace (`root`). The tree listing comes
+    from one `git ls-tree`; contents from a shared GitBlobReader.
+    """
+
+    def __init__(self, root: str, repo: str, commit: str, reader: GitBlobReader, commit_time: float = 0.0):
+        super().__init__(root)
+        self.reader = reader
+        self.blobs: Dict[str, str] = {}   # workspace-relative path -> blob hash
+        workspace_prefix = os.path.relpath(root, repo).replace(os.sep, '/')
+        workspace_prefix = '' if workspace_prefix == '.' else workspace_prefix + '/'
+
+        members = {}
+        listing = git_output(repo, 'ls-tree', '-r', '-l', '-z', commit, '--', workspace_prefix or '.')
+        for record in listing.split('\0'):
+            if not record:
+                continue
+            meta, name = record.split('\t', 1)
+            _, kind, sha, size = meta.split()
+            if kind != 'blob' or not name.startswith(workspace_prefix):
+                continue
+            rel = name[len(workspace_prefix):]
+            members[rel] = ArchiveStat(int(size), commit_time)
+            self.blobs[rel] = sha
+        self._index(members, prefix='')
+
+    def blob_hash(self, path: str) -> Optional[str]:
+        rel = self._rel(path)
+        return self.blobs.get(rel) if rel is not None else None
+
+    def _read_bytes(self, member: str) -> bytes:
+        return self.reader.read(self.blobs[member])
+
+
+def open_workspace(path: str):
+    """Return the filesystem view for a workspace folder or archive"""
+    if is_archive(path):
+        if path.lower().endswith('.zip'):
+            return ZipFS(path)
+        return TarFS(path)
+    return DirectoryFS(path)
@@ -0,0 +1,484 @@
+"""
+Workspace Snapshot
+===================
+Snapshot biner (versioned) dari hasil parse workspace Agent-0: path, judul,
+ringkasan, heading dan link keluar setiap dokumen. Ditulis oleh
+analyze_workspace.py setiap scan, lalu di-mmap oleh analyze_workspace.py,
+document_health_analyzer.py dan auto_index_updater.py, jadi dokumen yang
+tidak berubah tidak perlu di-parse ulang dan tidak ada JSON yang di-decode.
+
+Fitur:
+1. String table - setiap string (path, judul, ringkasan, teks heading, teks
+   dan target link) disimpan sekali dan dirujuk lewat ID integer
+2. Record dokumen berukuran tetap, urut per path: mtime_ns + size untuk cek
+   freshness, ID judul/ringkasan, dan range ke tabel link dan heading
+3. Link adjacency array dan heading table sebagai array record (text_id, target_id)
+   / (level, text_id, line)
+4. Lazy loading - hanya header dan section table yang dibaca saat open; section
+   lain (dan string individual) di-decode saat pertama dipakai, langsung dari mmap
+5. Refresh incremental - dokumen yang mtime/size-nya sama diambil dari snapshot
+   lama, hanya yang berubah yang di-parse; ditulis atomic (temp file + rename)
+6. CLI: `python workspace_snapshot.py stats|doc PATH|backlinks NAME`
+
+Ringkasan disimpan dalam dua varian karena dua tool memakai aturan berbeda:
+`summary` (workspace_index.json, 150 karakter) dan `index_summary` (tabel
+index.md, 100 karakter, baris blockquote dilewati).
+
+Format (little-endian):
+    header   8s magic | u16 version | u16 section count | u32 workspace string ID
+    sections 8s name | u64 offset | u64 length           (satu per section)
+    strings  u32 count | u32 offsets[count + 1] | blob UTF-8
+    docs     u32 path | i64 mtime_ns | i64 size | u32 title | u32 summary |
+             u32 index_summary | u32 link start | u32 link count |
+             u32 heading start | u32 heading count
+    links    u32 text | u32 target
+    headings u32 level | u32 text | u32 line
+
+Author: Created via Antigravity AI
+Date: 2024-12-22
+"""
+
+import os
+import sys
+import mmap
+import struct
+import argparse
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from markdown_links import extract_links_from_content
+from workspace_catalog import extract_headings
+
+if TYPE_CHECKING:
+    from async_scan import AsyncScanner
+
+# ============================================================
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SNAPSHOT = os.path.join(SCRIPT_DIR, "workspace_snapshot.bin")
+
+SNAPSHOT_MAGIC = b'AGSNAP\r\n'
+SNAPSHOT_VERSION = 1
+
+# Folders in the snapshot; Knowledge domains are nested, the others are flat
+SNAPSHOT_FOLDERS = ['Topic', 'Find', 'Plan', 'Knowledge', 'Research']
+RECURSIVE_FOLDERS = {'Knowledge'}
+
+SUMMARY_LENGTH = 150               # workspace_index.json summaries (analyze_workspace.py)
+INDEX_SUMMARY_LENGTH = 100         # index.md table summaries (auto_index_updater.py)
+
+NO_STRING = 0xFFFFFFFF             # string ID of a missing title
+
+HEADER = struct.Struct('<8sHHI')
+SECTION = struct.Struct('<8sQQ')
+DOC = struct.Struct('<IqqIIIIIII')
+LINK = struct.Struct('<II')
+HEADING = struct.Struct('<III')
+U32 = struct.Struct('<I')
+SPAN = struct.Struct('<II')
+
+SECTION_NAMES = [b'strings', b'docs', b'links', b'headings']
+
+
+@dataclass
+class SnapshotDocument:
+    """Parse results of one document, as stored in the snapshot"""
+    path: str                           # workspace-relative
+    mtime_ns: int
+    size: int
+    title: Optional[str] = None         # text after "# " on the first H1 line (unstripped)
+    summary: str = ""
+    index_summary: str = ""
+    links: List[Tuple[str, str]] = field(default_factory=list)
+    headings: List[Tuple[int, str, int]] = field(default_factory=list)
+
+
+# ============================================================
+# Parsing
+# ============================================================
+def lead_summaries(lines: List[str]) -> Tuple[Optional[str], str, str]:
+    """
+    First H1 and both summary variants from the lines of a document.
+    Same rules as analyze_workspace.extract_info_from_lines() and
+    auto_index_updater.extract_title() / extract_summary().
+    Returns: (title, summary, index_summary)
+    """
+    title = None
+    summary = ""
+    index_summary = ""
+    for i, line in enumerate(lines):
+        if not line.startswith('# '):
+            continue
+        title = line[2:]
+        for next_line in lines[i + 1:]:
+            clean_line = next_line.strip()
+            if clean_line and not clean_line.startswith('#'):
+                summary = clean_line[:SUMMARY_LENGTH] + "..." if len(clean_line) > SUMMARY_LENGTH else clean_line
+                break
+        break
+
+    found_title = False
+    for line in lines:
+        if line.startswith('# '):
+            found_title = True
+            continue
+        if found_title:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('#') and not stripped.startswith('>'):
+                if len(stripped) > INDEX_SUMMARY_LENGTH:
+                    index_summary = stripped[:INDEX_SUMMARY_LENGTH - 3] + "..."
+                else:
+                    index_summary = stripped
+                break
+
+    return title, summary, index_summary
+
+
+def parse_snapshot_document(abs_path: str, rel_path: str, stat: os.stat_result) -> SnapshotDocument:
+    """Read one document and parse everything the snapshot stores"""
+    doc = SnapshotDocument(rel_path, stat.st_mtime_ns, stat.st_size)
+    try:
+        with open(abs_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError):
+        # Stored empty: the tools fall back to their defaults for unreadable files
+        return doc
+    doc.title, doc.summary, doc.index_summary = lead_summaries(content.split('\n'))
+    doc.links = extract_links_from_content(content)
+    doc.headings = extract_headings(content)
+    return doc
+
+
+def scan_snapshot_files(
+    workspace: str,
+    scanner: Optional['AsyncScanner'] = None
+) -> Dict[str, Tuple[str, os.stat_result]]:
+    """
+    Markdown files covered by the snapshot (top-level folders are scanned
+    concurrently through `scanner` when given).
+    Returns: {rel_path: (abs_path, stat)}
+    """
+    def scan(abs_dir: str, rel_dir: str, recursive: bool, files: Dict):
+        try:
+            entries = list(os.scandir(abs_dir))
+        except OSError:
+            return files
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir():
+                if recursive:
+                    scan(entry.path, f"{rel_dir}/{entry.name}", True, files)
+            elif entry.name.endswith('.md'):
+                files[f"{rel_dir}/{entry.name}"] = (entry.path, entry.stat())
+        return files
+
+    run = scanner.map if scanner else map
+    files = {}
+    for found in run(lambda folder: scan(os.path.join(workspace, folder), folder, folder in RECURSIVE_FOLDERS, {}),
+                     SNAPSHOT_FOLDERS):
+        files.update(found)
+    return files
+
+
+# ============================================================
+# Reading
+# ============================================================
+class WorkspaceSnapshot:
+    """
+    Read-only view of a snapshot file through mmap. Opening reads only
+    the header and the section table; strings and records are decoded
+    on access.
+    """
+
+    def __init__(self, path: str, mapped: mmap.mmap, sections: Dict[bytes, Tuple[int, int]], workspace: str):
+        self.path = path
+        self._map = mapped
+        self._sections = sections
+        self.workspace = workspace
+        self._index: Optional[Dict[str, int]] = None
+        self._strings: Optional[Tuple[int, int]] = None
+
+    @classmethod
+    def open(cls, path: str, workspace: Optional[str]) -> Optional['WorkspaceSnapshot']:
+        """
+        Map the snapshot of `workspace` (None if missing, another version or
+        another workspace; workspace=None accepts any).
+        """
+        try:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            magic, version, count, workspace_id = HEADER.unpack_from(mapped, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError("not a workspace snapshot")
+            sections = {}
+            for i in range(count):
+                name, offset, length = SECTION.unpack_from(mapped, HEADER.size + i * SECTION.size)
+                if offset + length > len(mapped):
+                    raise ValueError("truncated snapshot")
+                sections[name.rstrip(b'\0')] = (offset, length)
+            if any(name not in sections for name in SECTION_NAMES):
+                raise ValueError("missing section")
+            snapshot = cls(path, mapped, sections, "")
+            snapshot.workspace = snapshot.string(workspace_id)
+        except (struct.error, ValueError, UnicodeDecodeError):
+            mapped.close()
+            return None
+        if workspace is not None and snapshot.workspace != workspace:
+            snapshot.close()
+            return None
+        return snapshot
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._sections[b'docs'][1] // DOC.size
+
+    def _string_table(self) -> Tuple[int, int]:
+        """(offsets array position, blob position) of the string section, read once"""
+        if self._strings is None:
+            offset = self._sections[b'strings'][0]
+            count = U32.unpack_from(self._map, offset)[0]
+            self._strings = (offset + 4, offset + 4 + (count + 1) * 4)
+        return self._strings
+
+    def string(self, string_id: int) -> Optional[str]:
+        if string_id == NO_STRING:
+            return None
+        offsets, blob = self._strings or self._string_table()
+        start, end = SPAN.unpack_from(self._map, offsets + string_id * 4)
+        return self._map[blob + start:blob + end].decode('utf-8')
+
+    def _doc(self, i: int) -> tuple:
+        return DOC.unpack_from(self._map, self._sections[b'docs'][0] + i * DOC.size)
+
+    def paths(self) -> Iterator[str]:
+        """Document paths in sorted order"""
+        for i in range(len(self)):
+            yield self.string(self._doc(i)[0])
+
+    def lookup(self, rel_path: str) -> int:
+        """Record number of `rel_path` (-1 if not in the snapshot)"""
+        if self._index is None:
+            # Built once on first lookup; concurrent builders produce the same dict
+            self._index = {path: i for i, path in enumerate(self.paths())}
+        return self._index.get(rel_path, -1)
+
+    def unchanged(self, rel_path: str, stat: os.stat_result) -> bool:
+        """True when `rel_path` is stored with the same mtime and size as `stat`"""
+        i = self.lookup(rel_path)
+        return i >= 0 and self._doc(i)[1:3] == (stat.st_mtime_ns, stat.st_size)
+
+    def fresh(self, rel_path: str, abs_path: str) -> int:
+        """Record number of `rel_path` if the file still has the stored mtime and size, else -1"""
+        try:
+            stat = os.stat(abs_path)
+        except OSError:
+            return -1
+        return self.lookup(rel_path) if self.unchanged(rel_path, stat) else -1
+
+    def title(self, i: int) -> Optional[str]:
+        return self.string(self._doc(i)[3])
+
+    def summary(self, i: int) -> str:
+        return self.string(self._doc(i)[4])
+
+    def index_summary(self, i: int) -> str:
+        return self.string(self._doc(i)[5])
+
+    def links(self, i: int) -> List[Tuple[str, str]]:
+        start, count = self._doc(i)[6:8]
+        base = self._sections[b'links'][0] + start * LINK.size
+        return [
+            (self.string(text), self.string(target))
+            for text, target in (LINK.unpack_from(self._map, base + n * LINK.size) for n in range(count))
+        ]
+
+    def headings(self, i: int) -> List[Tuple[int, str, int]]:
+        start, count = self._doc(i)[8:10]
+        base = self._sections[b'headings'][0] + start * HEADING.size
+        return [
+            (level, self.string(text), line)
+            for level, text, line in (HEADING.unpack_from(self._map, base + n * HEADING.size) for n in range(count))
+        ]
+
+    def document(self, i: int) -> SnapshotDocument:
+        path, mtime_ns, size, *_ = self._doc(i)
+        return SnapshotDocument(
+            self.string(path), mtime_ns, size, self.title(i), self.summary(i), self.index_summary(i),
+            self.links(i), self.headings(i)
+        )
+
+
+# ============================================================
+# Writing
+# ============================================================
+def write_snapshot(path: str, workspace: str, documents: List[SnapshotDocument]):
+    """Write `documents` (any order) as a snapshot, atomically replacing `path`"""
+    strings: Dict[str, int] = {}
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        string_id = strings.get(value)
+        if string_id is None:
+            string_id = strings[value] = len(strings)
+        return string_id
+
+    workspace_id = intern(workspace)
+    docs = bytearray()
+    links = bytearray()
+    headings = bytearray()
+    link_count = heading_count = 0
+    for doc in sorted(documents, key=lambda d: d.path):
+        docs += DOC.pack(
+            intern(doc.path), doc.mtime_ns, doc.size, intern(doc.title), intern(doc.summary),
+            intern(doc.index_summary), link_count, len(doc.links), heading_count, len(doc.headings)
+        )
+        for text, target in doc.links:
+            links += LINK.pack(intern(text), intern(target))
+        for level, text, line in doc.headings:
+            headings += HEADING.pack(level, intern(text), line)
+        link_count += len(doc.links)
+        heading_count += len(doc.headings)
+
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    table = struct.pack(f'<I{len(offsets)}I', len(encoded), *offsets) + b''.join(encoded)
+
+    bodies = [table, bytes(docs), bytes(links), bytes(headings)]
+    offset = HEADER.size + SECTION.size * len(bodies)
+    section_table = bytearray()
+    for name, body in zip(SECTION_NAMES, bodies):
+        section_table += SECTION.pack(name, offset, len(body))
+        offset += len(body)
+
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(bodies), workspace_id))
+            f.write(section_table)
+            for body in bodies:
+                f.write(body)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    os.replace(temp_path, path)
+
+
+def refresh_snapshot(
+    workspace: str,
+    path: str = DEFAULT_SNAPSHOT,
+    scanner: Optional['AsyncScanner'] = None
+) -> Tuple[WorkspaceSnapshot, int, int]:
+    """
+    Bring the snapshot of `workspace` up to date: documents whose mtime and
+    size match are copied from the existing snapshot, the rest are parsed
+    (concurrently through `scanner` when given, see async_scan.py).
+    The file is only rewritten when something changed.
+    Returns: (open snapshot, parsed, removed)
+    """
+    files = scan_snapshot_files(workspace, scanner)
+    previous = WorkspaceSnapshot.open(path, workspace)
+    stale = set(files)
+    if previous:
+        stale = {rel_path for rel_path, (abs_path, stat) in files.items() if not previous.unchanged(rel_path, stat)}
+    removed = sum(1 for rel_path in previous.paths() if rel_path not in files) if previous else 0
+    if previous and not stale and not removed:
+        return previous, 0, 0
+
+    def load(item):
+        rel_path, (abs_path, stat) = item
+        return parse_snapshot_document(abs_path, rel_path, stat)
+
+    run = scanner.map if scanner else map
+    parsed = dict(zip(sorted(stale), run(load, ((p, files[p]) for p in sorted(stale)))))
+    documents = [
+        parsed[rel_path] if rel_path in stale else previous.document(previous.lookup(rel_path))
+        for rel_path in files
+    ]
+    write_snapshot(path, workspace, documents)
+    if previous:
+        previous.close()
+    return WorkspaceSnapshot.open(path, workspace), len(stale), removed
+
+
+def add_snapshot_arguments(parser):
+    """Register --snapshot / --no-snapshot on a tool's argument parser"""
+    parser.add_argument('--snapshot', default=DEFAULT_SNAPSHOT, metavar='PATH',
+                        help=f"Binary workspace snapshot (default: {os.path.relpath(DEFAULT_SNAPSHOT)})")
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help="Ignore the workspace snapshot and parse every document")
+
+
+def snapshot_from_args(args, workspace: str) -> Optional[WorkspaceSnapshot]:
+    """Open the snapshot selected on the command line (None if disabled, missing or stale)"""
+    if args.no_snapshot:
+        return None
+    return WorkspaceSnapshot.open(args.snapshot, workspace)
+
+
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Inspect a binary workspace snapshot")
+    parser.add_argument('--snapshot', default=DEFAULT_SNAPSHOT, metavar='PATH')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help="Documents, links, headings and strings in the snapshot")
+    doc_parser = sub.add_parser('doc', help="Everything stored for one document")
+    doc_parser.add_argument('path', help="Workspace-relative path, e.g. Topic/index.md")
+    backlinks_parser = sub.add_parser('backlinks', help="Documents linking to a file name")
+    backlinks_parser.add_argument('name', help="Target file name, e.g. TOPIC_004.md")
+    args = parser.parse_args()
+
+    snapshot = WorkspaceSnapshot.open(args.snapshot, None)
+    if snapshot is None:
+        print(f"⚠️ No workspace snapshot (version {SNAPSHOT_VERSION}) at {args.snapshot}")
+        return 1
+
+    with snapshot:
+        if args.command == 'stats':
+            size = os.path.getsize(args.snapshot)
+            print(f"\n📦 {args.snapshot} ({size / 1024:.1f} KB)")
+            print(f"   Workspace: {snapshot.workspace}")
+            print(f"   Documents: {len(snapshot)}")
+            for name in SECTION_NAMES:
+                print(f"   • {name.decode()}: {snapshot._sections[name][1] / 1024:.1f} KB")
+        elif args.command == 'doc':
+            i = snapshot.lookup(args.path)
+            if i < 0:
+                print(f"⚠️ Not in snapshot: {args.path}")
+                return 1
+            doc = snapshot.document(i)
+            print(f"\n📄 {doc.path} ({doc.size} bytes)")
+            print(f"   Title: {(doc.title or '').strip() or '-'}")
+            print(f"   Summary: {doc.summary or '-'}")
+            print(f"\n   Headings ({len(doc.headings)}):")
+            for level, text, line in doc.headings:
+                print(f"   {'  ' * (level - 1)}• {text} (line {line})")
+            print(f"\n   Links ({len(doc.links)}):")
+            for text, target in doc.links:
+                print(f"   • [{text}] → {target}")
+        else:
+            sources = [
+                snapshot.string(snapshot._doc(i)[0]) for i in range(len(snapshot))
+                if any(os.path.basename(target) == args.name for _, target in snapshot.links(i))
+            ]
+            print(f"\n🔗 {len(sources)} document(s) link to {args.name}")
+            for source in sources:
+                print(f"   • {source}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""
+Shared test setup: scripts/ on sys.path and a small synthetic workspace.
+
+The analyzers resolve their workspace at import time (AGENT_WORKSPACE), so
+the workspace is generated here, before any test module imports them.
+Tests that modify files work on a copy (`workspace` fixture).
+"""
+
+import os
+import sys
+import shutil
+import atexit
+import tempfile
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+sys.path.insert(0, SCRIPTS_DIR)
+
+from synthetic_workspace_generator import GeneratorConfig, generate_workspace  # noqa: E402
+
+SESSION_DIR = tempfile.mkdtemp(prefix="agent_tests_")
+atexit.register(shutil.rmtree, SESSION_DIR, True)
+
+BASE_WORKSPACE = os.path.join(SESSION_DIR, "Agent-0")
+generate_workspace(BASE_WORKSPACE, GeneratorConfig())
+os.environ['AGENT_WORKSPACE'] = BASE_WORKSPACE
+
+
+@pytest.fixture
+def workspace(tmp_path) -> str:
+    """Private copy of the synthetic workspace"""
+    path = str(tmp_path / "Agent-0")
+    shutil.copytree(BASE_WORKSPACE, path)
+    return path
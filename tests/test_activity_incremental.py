@@ -0,0 +1,69 @@
+"""Activity log: incremental runs from the persisted state must equal --rebuild"""
+
+import os
+import shutil
+from dataclasses import asdict
+
+import pytest
+
+import activity_analyzer as aa
+from workspace_fs import open_workspace
+
+REPO_ACTIVITY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Agent-0", "Log", "aktivitas.md")
+
+NEW_DAY = """
+## 2026-01-05
+
+| Waktu | Aktivitas | ID       | Keterangan          |
+| :---- | :-------- | :------- | :------------------ |
+| 09:00 | Buat Plan | PLAN_901 | Plan baru           |
+| 09:30 | Implement | PLAN_901 | Selesai             |
+| 10:00 | Buat Plan | PLAN_902 | Masih terbuka       |
+"""
+
+
+@pytest.fixture
+def activity_log(workspace, monkeypatch):
+    path = os.path.join(workspace, "Log", "aktivitas.md")
+    shutil.copyfile(REPO_ACTIVITY, path)
+    monkeypatch.setattr(aa, "WORKSPACE_DIR", workspace)
+    monkeypatch.setattr(aa, "WORKSPACE_FS", open_workspace(workspace))
+    monkeypatch.setattr(aa, "ACTIVITY_FILE", path)
+    return path
+
+
+def assert_matches_rebuild(report, tmp_path):
+    rebuilt = aa.analyze_activity(state_path=str(tmp_path / "rebuilt.json"), rebuild=True)
+    assert rebuilt.incremental["mode"] == "full"
+    for name, value in asdict(rebuilt).items():
+        if name not in ("timestamp", "incremental", "timings"):
+            assert asdict(report)[name] == value, name
+
+
+def test_append_and_edit_match_rebuild(activity_log, tmp_path):
+    state = str(tmp_path / "state.json")
+    assert aa.analyze_activity(state_path=state).incremental["mode"] == "full"
+
+    with open(activity_log, 'a', encoding='utf-8') as f:
+        f.write(NEW_DAY)
+    report = aa.analyze_activity(state_path=state)
+    assert report.incremental["mode"] == "append"
+    assert report.incremental["rows_processed"] == 3
+    assert_matches_rebuild(report, tmp_path)
+
+    # An edit above the stored offset must not take the append path
+    with open(activity_log, 'r', encoding='utf-8') as f:
+        content = f.read()
+    with open(activity_log, 'w', encoding='utf-8') as f:
+        f.write(content.replace("| Implement  | PLAN_001  |", "| Diskusi    | PLAN_001  |", 1))
+    report = aa.analyze_activity(state_path=state)
+    assert report.incremental["mode"] == "sections"
+    assert_matches_rebuild(report, tmp_path)
+
+
+def test_unchanged_log_parses_nothing(activity_log, tmp_path):
+    state = str(tmp_path / "state.json")
+    aa.analyze_activity(state_path=state)
+    report = aa.analyze_activity(state_path=state)
+    assert report.incremental["mode"] == "append"
+    assert report.incremental["bytes_parsed"] == 0
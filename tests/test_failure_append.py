@@ -0,0 +1,104 @@
+"""append_failure(): ID allocation and the write-through failure index"""
+
+import os
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import failure_analyzer as fa
+
+REPO_FAILURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Agent-0", "Log", "failures.md")
+
+
+@pytest.fixture
+def failure_log(workspace, tmp_path, monkeypatch):
+    """Point the analyzer at the workspace copy; returns (failures.md, index path)"""
+    path = os.path.join(workspace, "Log", "failures.md")
+    monkeypatch.setattr(fa, "WORKSPACE_DIR", workspace)
+    monkeypatch.setattr(fa, "FAILURES_FILE", path)
+    return path, str(tmp_path / "failure_index.json")
+
+
+def heading_ids(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        return re.findall(r'^### (F-\d+)\b', f.read(), re.MULTILINE)
+
+
+def test_ids_skip_headings_the_parser_ignores(failure_log):
+    path, index_path = failure_log
+    # F-012..F-015 use "Code Generation"; a multi-word tool on the last entry too
+    with open(REPO_FAILURES, 'r', encoding='utf-8') as f:
+        content = f.read().replace("### F-016 | Config |", "### F-016 | Config Store |")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    result = fa.append_failure("run_command", "npm test", "Timeout after 60s", "CI", index_path=index_path)
+
+    assert result.entry.id == "F-017"
+    ids = heading_ids(path)
+    assert len(ids) == len(set(ids))
+
+
+def test_appends_match_rebuild(failure_log):
+    path, index_path = failure_log
+    before = len(heading_ids(path))
+
+    results = [
+        fa.append_failure("run_command", f"cmd {i}", "Process stuck on watch", "ctx", index_path=index_path)
+        for i in range(3)
+    ]
+
+    assert [r.index_rebuilt for r in results] == [True, False, False]
+    assert results[-1].repeats == [results[0].entry.id, results[1].entry.id]
+    ids = heading_ids(path)
+    assert len(ids) == before + 3 and len(ids) == len(set(ids))
+
+    with open(path, 'rb') as f:
+        rebuilt = fa.build_failure_index(f.read())
+    with open(index_path, 'r', encoding='utf-8') as f:
+        persisted = json.load(f)
+    for key in rebuilt:
+        assert persisted[key] == rebuilt[key], key
+
+    entries = fa.parse_failure_entries(open(path, 'rb').read())
+    assert fa.group_failures(entries) == persisted["groups"]
+
+
+def test_hand_edit_rebuilds_index(failure_log):
+    path, index_path = failure_log
+    fa.append_failure("run_command", "a", "Timeout", "ctx", index_path=index_path)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write("\n")
+
+    result = fa.append_failure("run_command", "b", "Timeout", "ctx", index_path=index_path)
+    assert result.index_rebuilt
+
+
+def test_threshold_alert(failure_log):
+    path, index_path = failure_log
+    results = [
+        fa.append_failure("brand_new_tool", "x", "Permission denied", "ctx", index_path=index_path)
+        for _ in range(fa.PATTERN_THRESHOLD)
+    ]
+    assert [r.crossed_threshold for r in results] == [False] * (fa.PATTERN_THRESHOLD - 1) + [True]
+    assert results[-1].candidate["total_occurrences"] == fa.PATTERN_THRESHOLD
+
+
+def test_concurrent_appends_get_unique_ids(failure_log):
+    path, index_path = failure_log
+    before = len(heading_ids(path))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(
+            lambda i: fa.append_failure("write_to_file", f"f{i}", "File not found", "ctx", index_path=index_path),
+            range(16)
+        ))
+    ids = heading_ids(path)
+    assert len(ids) == before + 16 and len(ids) == len(set(ids))
+
+
+def test_rejects_fields_the_parser_cannot_read(failure_log):
+    _, index_path = failure_log
+    with pytest.raises(ValueError):
+        fa.append_failure("two words", "x", "err", "ctx", index_path=index_path)
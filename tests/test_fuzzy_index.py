@@ -0,0 +1,33 @@
+"""Trigram index: the q-gram filters must not lose any match a full scan finds"""
+
+import random
+
+from fuzzy_index import build_index, levenshtein
+
+
+def mutate(key: str, rnd: random.Random) -> str:
+    """Apply up to three random insertions, deletions or substitutions"""
+    chars = list(key)
+    for _ in range(rnd.randint(0, 3)):
+        position = rnd.randrange(len(chars) + 1)
+        operation = rnd.random()
+        if operation < 0.33 and position < len(chars):
+            del chars[position]
+        elif operation < 0.66:
+            chars.insert(position, rnd.choice("ab_1"))
+        elif position < len(chars):
+            chars[position] = rnd.choice("xz_9")
+    return "".join(chars)
+
+
+def test_search_matches_full_scan():
+    rnd = random.Random(7)
+    words = ["plan", "topic", "audit", "service", "banner", "module", "spinner", "default"]
+    keys = {f"{rnd.choice(words)}_{rnd.randint(0, 300):03d}_{rnd.choice(words)}" for _ in range(400)}
+    index = build_index({key: [f"{key}.md"] for key in keys})
+
+    for query in [mutate(rnd.choice(sorted(keys)), rnd) for _ in range(200)] + ["ab", "plan"]:
+        for radius in (1, 2, 3):
+            expected = sorted((levenshtein(query, key), key) for key in keys
+                              if levenshtein(query, key, radius) <= radius)
+            assert [(d, key) for d, key, _ in index.search(query, radius)] == expected
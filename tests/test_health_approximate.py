@@ -0,0 +1,40 @@
+"""--approximate: the orphan interval must cover the exact count for most seeds"""
+
+import pytest
+
+import document_health_analyzer as analyzer
+import health_approximate as ha
+from synthetic_workspace_generator import GeneratorConfig, generate_workspace
+from workspace_fs import open_workspace
+
+SEEDS = range(20)
+MIN_COVERAGE = 0.8                 # of the nominal 95%
+
+
+@pytest.fixture
+def sampled_workspace(tmp_path, monkeypatch):
+    """Enough documents that --approximate stops before parsing all of them"""
+    path = str(tmp_path / "sampled" / "Agent-0")
+    generate_workspace(path, GeneratorConfig(topics=400, plans=800, finds=200, research=100))
+    monkeypatch.setattr(analyzer, "WORKSPACE_DIR", path)
+    monkeypatch.setattr(analyzer, "WORKSPACE_FS", open_workspace(path))
+    return path
+
+
+def test_orphan_interval_coverage(sampled_workspace):
+    all_files = analyzer.get_all_md_files(sampled_workspace)
+    findings, _ = analyzer.run_rules(all_files, analyzer.build_rules(['orphan_files']))
+    exact = len(findings['orphan_files'])
+
+    covered = 0
+    errors = []
+    for seed in SEEDS:
+        report = ha.analyze_approximate_health(seed=seed)
+        assert report.estimates['sampled'] < len(all_files)
+        orphans = report.estimates['orphan_files']
+        covered += orphans['low'] <= exact <= orphans['high']
+        errors.append(orphans['estimate'] - exact)
+
+    assert covered >= MIN_COVERAGE * len(SEEDS)
+    # No systematic over- or underestimate
+    assert abs(sum(errors) / len(errors)) <= 0.1 * exact
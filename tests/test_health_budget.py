@@ -0,0 +1,124 @@
+"""--budget-ms: runs resumed from the checkpoint must end where one full run does"""
+
+import os
+
+import pytest
+
+import document_health_analyzer as analyzer
+import health_budget as hb
+from synthetic_workspace_generator import GeneratorConfig, generate_workspace
+from workspace_fs import open_workspace
+
+BUDGET_MS = 50
+TOLERANCE_MS = 15
+
+
+def use_workspace(monkeypatch, workspace: str) -> str:
+    monkeypatch.setattr(analyzer, "WORKSPACE_DIR", workspace)
+    monkeypatch.setattr(analyzer, "WORKSPACE_FS", open_workspace(workspace))
+    return workspace
+
+
+@pytest.fixture
+def health_workspace(workspace, monkeypatch):
+    return use_workspace(monkeypatch, workspace)
+
+
+@pytest.fixture
+def larger_workspace(tmp_path, monkeypatch):
+    """Enough documents that one run cannot cover them within BUDGET_MS"""
+    path = str(tmp_path / "larger" / "Agent-0")
+    generate_workspace(path, GeneratorConfig(topics=200, plans=400, finds=100, research=50))
+    return use_workspace(monkeypatch, path)
+
+
+def findings(report):
+    return {
+        "broken_links": sorted((item['source_file'], item['broken_link']) for item in report.broken_links),
+        "orphan_files": report.orphan_files,
+        "missing_from_index": sorted((item['folder'], item['file']) for item in report.missing_from_index),
+        "cross_references": report.cross_references,
+        "health_score": report.health_score,
+    }
+
+
+def linked_document(workspace: str) -> str:
+    """A document that a regular (non-index) document links to"""
+    all_files = analyzer.get_all_md_files(workspace)
+    names = {os.path.basename(p): p for p in all_files}
+    for rel_path in sorted(all_files):
+        if 'index' in os.path.basename(rel_path).lower():
+            continue
+        for _, target in analyzer.extract_links(all_files[rel_path]):
+            resolved = names.get(os.path.basename(target))
+            if resolved and resolved != rel_path and 'index' not in resolved:
+                return resolved
+    raise AssertionError("no linked document in the synthetic workspace")
+
+
+def external_target(workspace: str) -> str:
+    """A link target outside the scanned folders (found through the file system)"""
+    all_files = analyzer.get_all_md_files(workspace)
+    ctx = analyzer.rule_context(all_files)
+    for rel_path in sorted(all_files):
+        folder = rel_path.split('/')[0]
+        for _, target in analyzer.extract_links(all_files[rel_path]):
+            if analyzer.link_status(folder, target, ctx) == 'external':
+                return os.path.normpath(os.path.join(workspace, analyzer.normalize_path(folder, target)))
+    raise AssertionError("no external link in the synthetic workspace")
+
+
+def test_resumed_runs_match_full_run(health_workspace, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.db")
+    deleted = linked_document(health_workspace)
+
+    runs = 0
+    report = None
+    while report is None or report.partial:
+        # A tiny budget still processes one document per run
+        report = hb.analyze_budgeted_health(0.001, checkpoint_path=checkpoint)
+        runs += 1
+        if runs == 3:
+            # Links stored for covered documents must be re-resolved
+            os.remove(os.path.join(health_workspace, deleted))
+        assert runs < 1000
+    assert runs > 3
+    assert report.coverage["covered"] == report.coverage["documents"]
+
+    full = hb.analyze_budgeted_health(1e9, checkpoint_path=str(tmp_path / "fresh.db"))
+    assert not full.partial
+    assert findings(report) == findings(full)
+    assert any(target.endswith(os.path.basename(deleted)) for _, target in findings(report)["broken_links"])
+
+    exact = analyzer.analyze_document_health()
+    assert findings(report) == findings(exact)
+
+
+def test_deleted_external_target_is_rechecked(health_workspace, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.db")
+    first = hb.analyze_budgeted_health(1e9, checkpoint_path=checkpoint)
+    assert not first.partial
+
+    os.remove(external_target(health_workspace))
+    report = hb.analyze_budgeted_health(1e9, checkpoint_path=checkpoint)
+    # Only documents probing the changed directory are processed again
+    assert 0 < report.coverage["processed"] < report.coverage["documents"]
+    assert len(report.broken_links) > len(first.broken_links)
+    assert findings(report) == findings(analyzer.analyze_document_health())
+
+
+def test_runs_keep_to_the_budget(larger_workspace, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.db")
+    runs = 0
+    report = None
+    while report is None or report.partial:
+        report = hb.analyze_budgeted_health(BUDGET_MS, checkpoint_path=checkpoint)
+        runs += 1
+        assert report.coverage["processed"] > 0
+        assert report.coverage["elapsed_ms"] <= BUDGET_MS + TOLERANCE_MS
+    assert runs > 2
+
+    # Fully covered: the stored results are merged without processing anything
+    report = hb.analyze_budgeted_health(BUDGET_MS, checkpoint_path=checkpoint)
+    assert report.coverage["processed"] == 0
+    assert report.coverage["elapsed_ms"] <= BUDGET_MS
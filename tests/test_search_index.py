@@ -0,0 +1,46 @@
+"""BM25 search index: incremental update must equal a rebuild"""
+
+import os
+
+import search_index as si
+
+
+def edit_workspace(workspace: str):
+    """Modify, delete and add documents (every change alters the file size)"""
+    plans = sorted(p for p in os.listdir(os.path.join(workspace, "Plan")) if p != "index.md")
+    with open(os.path.join(workspace, "Plan", plans[0]), 'a', encoding='utf-8') as f:
+        f.write("\nKata unik zebracorn ditambahkan.\n")
+    os.remove(os.path.join(workspace, "Plan", plans[1]))
+    os.makedirs(os.path.join(workspace, "Knowledge", "baru"), exist_ok=True)
+    with open(os.path.join(workspace, "Knowledge", "baru", "catatan.md"), 'w', encoding='utf-8') as f:
+        f.write("# Catatan Zebracorn\n\nzebracorn zebracorn muncul di sini.\n")
+
+
+def test_incremental_update_matches_rebuild(workspace, tmp_path):
+    incremental = str(tmp_path / "incremental.idx")
+    rebuilt = str(tmp_path / "rebuilt.idx")
+
+    first = si.update_index(workspace, incremental)
+    assert first["added"] == first["documents"]
+    edit_workspace(workspace)
+
+    result = si.update_index(workspace, incremental)
+    assert (result["added"], result["updated"], result["removed"]) == (1, 1, 1)
+    si.update_index(workspace, rebuilt)
+
+    with open(incremental, 'rb') as a, open(rebuilt, 'rb') as b:
+        assert a.read() == b.read()
+
+    hits = si.load_index(incremental).search("zebracorn", limit=5)
+    assert hits[0].path == "Knowledge/baru/catatan.md"
+    assert len(hits) == 2
+
+
+def test_unchanged_workspace_is_not_rewritten(workspace, tmp_path):
+    path = str(tmp_path / "search.idx")
+    si.update_index(workspace, path)
+    mtime = os.stat(path).st_mtime_ns
+
+    result = si.update_index(workspace, path)
+    assert result["unchanged"] == result["documents"]
+    assert os.stat(path).st_mtime_ns == mtime
@@ -0,0 +1,72 @@
+"""Binary workspace snapshot: write/open round-trip and incremental refresh"""
+
+import os
+
+import workspace_snapshot as ws
+
+
+def fresh_documents(workspace: str):
+    """Every document parsed from disk, keyed by path"""
+    return {
+        rel_path: ws.parse_snapshot_document(abs_path, rel_path, stat)
+        for rel_path, (abs_path, stat) in ws.scan_snapshot_files(workspace).items()
+    }
+
+
+def snapshot_documents(snapshot: ws.WorkspaceSnapshot):
+    return {path: snapshot.document(snapshot.lookup(path)) for path in snapshot.paths()}
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    documents = [
+        ws.SnapshotDocument("Topic/b.md", 2, 20, "Judul ✓", "ringkasan", "index",
+                            [("teks", "../Plan/a.md"), ("", "b.md")], [(1, "Judul ✓", 0), (2, "Bagian", 4)]),
+        ws.SnapshotDocument("Plan/a.md", 1, 10),
+        ws.SnapshotDocument("Plan/c.md", 3, 0, title=""),
+    ]
+    ws.write_snapshot(path, "/ws", documents)
+
+    with ws.WorkspaceSnapshot.open(path, "/ws") as snapshot:
+        assert len(snapshot) == 3
+        assert list(snapshot.paths()) == ["Plan/a.md", "Plan/c.md", "Topic/b.md"]
+        for doc in documents:
+            assert snapshot.document(snapshot.lookup(doc.path)) == doc
+        assert snapshot.lookup("Plan/missing.md") < 0
+
+
+def test_rejects_other_workspace_and_corrupt_files(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    ws.write_snapshot(path, "/ws", [ws.SnapshotDocument("Plan/a.md", 1, 10)])
+    assert ws.WorkspaceSnapshot.open(path, "/other") is None
+    assert ws.WorkspaceSnapshot.open(str(tmp_path / "missing.bin"), None) is None
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    assert ws.WorkspaceSnapshot.open(path, "/ws") is None
+
+
+def test_refresh_matches_full_parse(workspace, tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    snapshot, parsed, removed = ws.refresh_snapshot(workspace, path)
+    assert (parsed, removed) == (len(snapshot), 0)
+    assert snapshot_documents(snapshot) == fresh_documents(workspace)
+    snapshot.close()
+
+    plans = sorted(p for p in os.listdir(os.path.join(workspace, "Plan")) if p != "index.md")
+    with open(os.path.join(workspace, "Plan", plans[0]), 'a', encoding='utf-8') as f:
+        f.write("\nLihat [baru](../Topic/baru.md)\n")
+    os.remove(os.path.join(workspace, "Plan", plans[1]))
+    with open(os.path.join(workspace, "Topic", "baru.md"), 'w', encoding='utf-8') as f:
+        f.write("# Baru\n\nDokumen baru.\n")
+
+    snapshot, parsed, removed = ws.refresh_snapshot(workspace, path)
+    assert (parsed, removed) == (2, 1)
+    assert snapshot_documents(snapshot) == fresh_documents(workspace)
+    snapshot.close()
+
+    snapshot, parsed, removed = ws.refresh_snapshot(workspace, path)
+    assert (parsed, removed) == (0, 0)
+    snapshot.close()